@@ -107,6 +107,46 @@ class FillTitleBlock_Class:
         return result
 
 
+# Import data from the spreadsheet to the selected pages
+class FillTitleBlock_Selected_Class:
+    def GetResources(self):
+        return {
+            "Pixmap": "FillTitleBlock.svg",  # the name of a svg file available in the resources
+            "MenuText": QT_TRANSLATE_NOOP(
+                "FillTitleBlock_Selected", "Populate titleblock of selected pages"
+            ),
+            "ToolTip": QT_TRANSLATE_NOOP(
+                "FillTitleBlock_Selected",
+                "Imports data from the spreadsheet to titleblock of the selected pages",
+            ),
+        }
+
+    def Activated(self):
+        import FillTitleBlock_TB
+        import TechDraw_Functions_TB
+
+        pages = TechDraw_Functions_TB.GetSelectedPages()
+        FillTitleBlock_TB.FillTitleBlock(pages=pages)
+
+        return
+
+    def IsActive(self):
+        """Here you can define if the command must be active or not (greyed) if certain conditions
+        are met or not. This function is optional."""
+        import TechDraw_Functions_TB
+
+        # Set the default state
+        result = False
+        # Get for the active document.
+        ActiveDoc = App.activeDocument()
+        if ActiveDoc is not None:
+            # Check if any pages are selected. If so the result is True and the command is activated.
+            if len(TechDraw_Functions_TB.GetSelectedPages()) > 0:
+                result = True
+
+        return result
+
+
 # endregion
 
 
@@ -128,10 +168,13 @@ class ImportExcel_Class:
     def Activated(self):
         import FillSpreadsheet_TB
         import FillTitleBlock_TB
+        import FillTransaction_TB
 
-        FillSpreadsheet_TB.Start("ImportExcel")
-        if AUTOFILL_TITLEBLOCK is True:
-            FillTitleBlock_TB.FillTitleBlock()
+        # Import the data and fill the titleblocks with a single recompute and save at the end
+        with FillTransaction_TB.FillTransaction(App.ActiveDocument, recompute=True):
+            FillSpreadsheet_TB.Start("ImportExcel")
+            if AUTOFILL_TITLEBLOCK is True:
+                FillTitleBlock_TB.FillTitleBlock()
         return
 
     def IsActive(self):
@@ -167,10 +210,13 @@ class ImportFreeCAD_Class:
     def Activated(self):
         import FillSpreadsheet_TB
         import FillTitleBlock_TB
+        import FillTransaction_TB
 
-        FillSpreadsheet_TB.Start("ImportFreeCAD")
-        if AUTOFILL_TITLEBLOCK is True:
-            FillTitleBlock_TB.FillTitleBlock()
+        # Import the data and fill the titleblocks with a single recompute and save at the end
+        with FillTransaction_TB.FillTransaction(App.ActiveDocument, recompute=True):
+            FillSpreadsheet_TB.Start("ImportFreeCAD")
+            if AUTOFILL_TITLEBLOCK is True:
+                FillTitleBlock_TB.FillTitleBlock()
         return
 
     def IsActive(self):
@@ -963,6 +1009,7 @@ class SortFolder_ZA_class:
 # region - Add the commands to the Gui
 Gui.addCommand("FillSpreadsheet", FillSpreadsheet_Class())
 Gui.addCommand("FillTitleBlock", FillTitleBlock_Class())
+Gui.addCommand("FillTitleBlock_Selected", FillTitleBlock_Selected_Class())
 Gui.addCommand("ImportExcel", ImportExcel_Class())
 Gui.addCommand("ExportSpreadSheet_Excel", ExportSpreadsheet_Excel_class())
 Gui.addCommand("ExportSettings_Excel", ExportSettings_Excel_class())
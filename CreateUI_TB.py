@@ -28,6 +28,7 @@
 # https://github.com/FreeCAD/FreeCAD/blob/main/src/Mod/AddonManager/install_to_toolbar.py
 
 import FreeCAD as App
+import ExternalSource_TB as ExternalSource
 from Settings_TB import USE_EXTERNAL_SOURCE
 from Settings_TB import EXTERNAL_SOURCE_PATH
 from Settings_TB import USE_SIMPLE_LIST
@@ -46,11 +47,12 @@ def DefineToolbars():
     ToolbarListMain = []
     ToolbarListExtra = []
     if USE_EXTERNAL_SOURCE is True:
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is False:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) != "FreeCAD":
             ToolbarListMain = [
                 "Separator",
                 "ImportExcel",
                 "FillTitleBlock",
+                "FillTitleBlock_Selected",
                 "ExpandToolbar",
             ]
             ToolbarListExtra = [
@@ -64,11 +66,12 @@ def DefineToolbars():
                 "ExportSettings_Excel",
                 "ImportSettings_Excel",
             ]
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is True:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) == "FreeCAD":
             ToolbarListMain = [
                 "Separator",
                 "ImportFreeCAD",
                 "FillTitleBlock",
+                "FillTitleBlock_Selected",
                 "ExpandToolbar",
             ]
             ToolbarListExtra = [
@@ -87,6 +90,7 @@ def DefineToolbars():
             "Separator",
             "FillSpreadsheet",
             "FillTitleBlock",
+            "FillTitleBlock_Selected",
             "ExpandToolbar",
         ]  # a list of command names created in the line above
         ToolbarListExtra = [
@@ -110,7 +114,7 @@ def DefineToolbars():
             )
         if (
             USE_EXTERNAL_SOURCE_SIMPLE_LIST is True
-            and EXTERNAL_FILE_SIMPLE_LIST.lower().endswith(".fcstd") is False
+            and ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST) != "FreeCAD"
         ):
             ToolbarListExtra.extend(
                 [
@@ -121,7 +125,7 @@ def DefineToolbars():
             )
         if (
             USE_EXTERNAL_SOURCE_SIMPLE_LIST is True
-            and EXTERNAL_FILE_SIMPLE_LIST.lower().endswith(".fcstd") is True
+            and ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST) == "FreeCAD"
         ):
             ToolbarListExtra.extend(
                 [
@@ -143,7 +147,7 @@ def DefineToolbars():
             )
         if (
             USE_EXTERNAL_SOURCE_ADVANCED_LIST is True
-            and EXTERNAL_FILE_ADVANCED_LIST.lower().endswith(".fcstd") is False
+            and ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST) != "FreeCAD"
         ):
             ToolbarListExtra.extend(
                 [
@@ -157,7 +161,7 @@ def DefineToolbars():
             )
         if (
             USE_EXTERNAL_SOURCE_ADVANCED_LIST is True
-            and EXTERNAL_FILE_ADVANCED_LIST.lower().endswith(".fcstd") is True
+            and ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST) == "FreeCAD"
         ):
             ToolbarListExtra.extend(
                 [
@@ -178,6 +182,7 @@ def DefineToolbars():
 def DefineMenus():
     StandardList = [
         "FillTitleBlock",
+        "FillTitleBlock_Selected",
         "FillSpreadsheet",
     ]
     ExcelList = [
@@ -275,10 +280,10 @@ def CreateTechDrawToolbar() -> object:
 
     # add the commands
     if USE_EXTERNAL_SOURCE is True:
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is False:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) != "FreeCAD":
             TechDrawToolbar.SetString("FillTitleBlock", "FreeCAD")
             TechDrawToolbar.SetString("ImportExcel", "FreeCAD")
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is True:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) == "FreeCAD":
             TechDrawToolbar.SetString("FillTitleBlock", "FreeCAD")
             TechDrawToolbar.SetString("ImportFreeCAD", "FreeCAD")
     if USE_EXTERNAL_SOURCE is False:
@@ -319,10 +324,10 @@ def ReplaceButtons() -> None:
 
     # add the commands
     if USE_EXTERNAL_SOURCE is True:
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is False:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) != "FreeCAD":
             TechDrawToolbar.SetString("ImportExcel", "FreeCAD")
             TechDrawToolbar.SetString("FillTitleBlock", "FreeCAD")
-        if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd") is True:
+        if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) == "FreeCAD":
             TechDrawToolbar.SetString("ImportFreeCAD", "FreeCAD")
             TechDrawToolbar.SetString("FillTitleBlock", "FreeCAD")
     if USE_EXTERNAL_SOURCE is False:
@@ -26,6 +26,10 @@
 # region imports
 import FreeCAD as App
 import Standard_Functions_TB as Standard_Functions
+import FillTransaction_TB as FillTransaction
+import TechDraw_Functions_TB as TechDraw_Functions
+import Spreadsheet_Functions_TB as Spreadsheet_Functions
+import ExternalSource_TB as ExternalSource
 
 # Get the settings
 from Settings_TB import ENABLE_DEBUG
@@ -52,7 +56,86 @@ translate = App.Qt.translate
 # endregion
 
 
-def MapSimpleDrawingList(sheet):
+def MarkDrawingListProperty(sheet, PropertyName: str):
+    """Mark a property in the titleblock spreadsheet as retrieved from the drawing list.
+    The rows are found with the cached property row index of the spreadsheet.
+
+    Args:
+        sheet (object): The titleblock spreadsheet.\n
+        PropertyName (str): The name of the property.\n
+    """
+    RowIndex = Spreadsheet_Functions.GetPropertyRowIndex(sheet)
+    for RowNum in RowIndex.get(PropertyName, []):
+        sheet.set(f"B{RowNum}", "-")
+        sheet.set(f"E{RowNum}", "Property value retrieved from drawing list")
+    return
+
+
+def JoinSimpleDrawingList(pages, Rows, ReturnNames: list) -> int:
+    """Map the rows of a simple drawing list to the pages.
+    The pages are indexed once on the value of the editable text PROPERTY_NAME_SIMPLE_LIST,
+    or on the page label when USE_PAGE_NAMES_SIMPLE_LIST is enabled.
+    Each row is matched to its pages with a single lookup.
+    All the values for a page are collected and the editable texts of each page are written once.
+
+    Args:
+        pages (list): The pages to fill.\n
+        Rows (list): The rows of the drawing list without the header.
+        The first value is the value to search for, the others are the values for the return names.\n
+        ReturnNames (list): The names of the editable texts to fill.\n
+
+    Returns:
+        int: The number of pages with changed editable texts.
+    """
+    # Build the index: value to search for -> the pages with that value and their editable texts.
+    # The editable texts are read only once per page.
+    Index = {}
+    for page in pages:
+        texts = page.Template.EditableTexts
+        if USE_PAGE_NAMES_SIMPLE_LIST is True:
+            Key = page.Label
+        else:
+            Key = texts.get(PROPERTY_NAME_SIMPLE_LIST)
+        if Key is not None:
+            Index.setdefault(Key, []).append((page, texts))
+
+    # Go through the drawing list and collect the values for each page.
+    UpdatedPages = {}
+    for Row in Rows:
+        # Get the property name in the drawing list. If it starts with "'", remove it
+        PropertyValue = Row[0]
+        if PropertyValue is None:
+            continue
+        if PropertyValue[:1] == "'":
+            PropertyValue = PropertyValue[1:]
+
+        # Find the pages for this row
+        Matches = Index.get(PropertyValue)
+        if Matches is None:
+            continue
+
+        for j in range(len(ReturnNames)):
+            # If the cell is empty, skip it.
+            if j + 1 >= len(Row) or Row[j + 1] is None:
+                continue
+            # Get the property value in the drawing list. If it starts with "'", remove it
+            ReturnValue = Row[j + 1]
+            if ReturnValue[:1] == "'":
+                ReturnValue = ReturnValue[1:]
+            # Fill in the editable text that needs to be updated.
+            for page, texts in Matches:
+                texts[ReturnNames[j]] = ReturnValue
+                UpdatedPages[page.Name] = (page, texts)
+
+    # Write the editable texts of each updated page once.
+    NoChangedPages = 0
+    for page, texts in UpdatedPages.values():
+        if TechDraw_Functions.WriteEditableTexts(page, texts) > 0:
+            NoChangedPages = NoChangedPages + 1
+    return NoChangedPages
+
+
+def MapSimpleDrawingList(sheet, SelectedPages=None):
     # Check if it is allowed to use an external source and if so, continue
     if USE_SIMPLE_LIST is True and USE_EXTERNAL_SOURCE_SIMPLE_LIST is False:
         try:
@@ -106,8 +189,6 @@ def MapSimpleDrawingList(sheet):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # Define placeholder for the property value in the drawing list.
-            PropertyValue_DrawingList = ""
             # Create a list with return values
             ReturnNames_DrawingList = []
             for i in range(1000):
@@ -123,19 +204,8 @@ def MapSimpleDrawingList(sheet):
                         ReturnName = ReturnName[1:]
                     ReturnNames_DrawingList.append(ReturnName)
 
-                    for j in range(1, 1000):
-                        # check if you reached the end of the data.
-                        TitleBlockPropName = sheet.getContents(f"A{str(j)}")
-                        if TitleBlockPropName[:1] == "'":
-                            TitleBlockPropName = TitleBlockPropName[1:]
-                        if TitleBlockPropName == "" or TitleBlockPropName is None:
-                            break
-
-                        if TitleBlockPropName == ReturnName:
-                            sheet.set(f"B{j}", "-")
-                            sheet.set(
-                                f"E{j}", "Property value retrieved from drawing list"
-                            )
+                    # Mark the property in the titleblock spreadsheet
+                    MarkDrawingListProperty(sheet, ReturnName)
 
                 # If the cell is empty, you are on the end. Break the loop.
                 if str(DrawingList.getContents(f"{Column}{StartRow}")) == "":
@@ -143,83 +213,24 @@ def MapSimpleDrawingList(sheet):
 
             # Get the pages in the document
             pages = doc.findObjects("TechDraw::DrawPage")
+            # If only a selection of pages must be filled, use these pages
+            if SelectedPages is not None:
+                pages = SelectedPages
+
+            # Read the drawing list in one go.
+            Rows = ExternalSource.ReadRows(
+                DrawingList,
+                StartColumn + str(StartRow),
+                NoColumns=len(ReturnNames_DrawingList) + 1,
+            )
 
-            # Go through the drawing list and collect the property value based on the property name searched for.
-            for i in range(1000):
-                # Define the start row. This is the Header row + 1 + i as counter
-                RowNumber = int(StartRow) + i + 1
-
-                # If the property name in the drawing list is empty, it is the end of the list.
-                # Exit the function
-                if str(DrawingList.getContents(f"{StartColumn}{RowNumber}")) == "":
-                    break
-
-                # Get the property name in the drawing list. If it starts with "'", remove it
-                PropertyValue_DrawingList = str(
-                    DrawingList.getContents(f"{StartColumn}{RowNumber}")
-                )
-                if PropertyValue_DrawingList[:1] == "'":
-                    PropertyValue_DrawingList = PropertyValue_DrawingList[1:]
-
-                # Go through the columns starting from the column right from the column with the property value
-                for j in range(len(ReturnNames_DrawingList)):
-                    # Get the column letter
-                    Column = Standard_Functions.GetLetterFromNumber(
-                        j + Standard_Functions.GetNumberFromLetter(StartColumn) + 1
-                    )
-
-                    # If the cell is not empty and j is lower then NoColumns, continue.
-                    if str(DrawingList.getContents(f"{Column}{RowNumber}")) != "":
-                        # Get the property value in the excel list. If it starts with "'", remove it
-                        ReturnValue_DrawingList = str(
-                            DrawingList.getContents(f"{Column}{RowNumber}")
-                        )
-                        if ReturnValue_DrawingList[:1] == "'":
-                            ReturnValue_DrawingList = ReturnValue_DrawingList[1:]
-
-                        # If page names are not to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is False:
-                            # Go through all the pages
-                            for page in pages:
-                                # Get the editable texts
-                                texts = page.Template.EditableTexts
-                                # If the value editable text in the titleblock to search for
-                                # matches the property value in the drawing list,
-                                # fill in the editable text that needs to be updated.
-                                if (
-                                    texts[PROPERTY_NAME_SIMPLE_LIST]
-                                    == PropertyValue_DrawingList
-                                ):
-                                    # Get the property name in the titleblock spreadsheet and fill it with the property value from the drawing list
-                                    texts[ReturnNames_DrawingList[j]] = (
-                                        ReturnValue_DrawingList
-                                    )
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
-
-                        # If page names are to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is True:
-                            # Go through the pages
-                            for page in pages:
-                                # If the Property name in the drawing list matches the page label:
-                                # Fill in the desired editable text with the property value from the drawing list
-                                if PropertyValue_DrawingList == page.Label:
-                                    # Get the editable texts
-                                    texts = page.Template.EditableTexts
-                                    texts[ReturnNames_DrawingList[j]] = (
-                                        ReturnValue_DrawingList
-                                    )
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
+            # Map the values in the drawing list to the pages.
+            JoinSimpleDrawingList(pages, Rows[1:], ReturnNames_DrawingList)
 
             # recompute the document
-            doc.recompute(None, True, True)
+            FillTransaction.Recompute(doc)
             # Save the workbook
-            doc.save()
+            FillTransaction.Save(doc)
             # Activate the document which was active when this command started.
             try:
                 App.setActiveDocument(LastActiveDoc)
@@ -227,7 +238,7 @@ def MapSimpleDrawingList(sheet):
                 pass
 
             # Recomute the document
-            App.ActiveDocument.recompute(None, True, True)
+            FillTransaction.Recompute(App.ActiveDocument)
 
         except Exception as e:
             Text = translate(
@@ -244,8 +255,7 @@ def MapSimpleDrawingList(sheet):
         return
 
 
-def MapSimpleDrawingList_Excel(sheet):
-    from openpyxl import load_workbook
+def MapSimpleDrawingList_Excel(sheet, SelectedPages=None):
 
     # Check if it is allowed to use an external source and if so, continue
     if USE_SIMPLE_LIST is True and USE_EXTERNAL_SOURCE_SIMPLE_LIST is True:
@@ -263,19 +273,15 @@ def MapSimpleDrawingList_Excel(sheet):
             wb = ""
             # If the drawinglist is an FreeCAD document instead of an Excel workbook,
             # Let the user select the correct workbook. Otherwise just load the workbook.
-            if EXTERNAL_FILE_SIMPLE_LIST.lower().endswith(".fcstd"):
-                Filter = [
-                    ("Excel", "*.xlsx"),
-                ]
+            if ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST) == "FreeCAD":
+                Filter = ExternalSource.GetFileFilter("Excel")
                 FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
                 if FileName != "":
-                    wb = load_workbook(FileName, read_only=True, data_only=True)
+                    wb = ExternalSource.OpenSource(FileName)
                 if FileName == "":
                     return
             else:
-                wb = load_workbook(
-                    str(EXTERNAL_FILE_SIMPLE_LIST), read_only=True, data_only=True
-                )
+                wb = ExternalSource.OpenSource(str(EXTERNAL_FILE_SIMPLE_LIST))
             # If the sheetname not set, let the user set the correct name.
             if SHEETNAME_SIMPLE_LIST == "":
                 # Set the sheetname with a inputbox
@@ -418,110 +424,26 @@ def MapSimpleDrawingList_Excel(sheet):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # Define placeholder for the property value in the excel list.
-            PropertyValueExcel = ""
-            # Define a placeholder for the qty of columns with return values
-            NoColumns = 0
-            # Create a list with return values
-            ReturnNamesExcel = []
-            for i in range(1000):
-                # Get the colum letter. For example: i = 0, StartColumn = A->1 + 1 results in column B
-                Column = Standard_Functions.GetLetterFromNumber(
-                    i + Standard_Functions.GetNumberFromLetter(StartColumn) + 1
-                )
-                NoColumns = NoColumns + i
+            # Read the drawing list in one go. The number of columns is set by the header row.
+            Rows = ExternalSource.ReadRows(ws, StartColumn + str(StartRow))
 
-                # If the cell is not empty, add the contents to the list
-                if ws[f"{Column}{StartRow}"].value is not None:
-                    ReturnNamesExcel.append(str(ws[f"{Column}{StartRow}"].value))
-
-                    for j in range(1, 1000):
-                        # check if you reached the end of the data.
-                        test = sheet.getContents(f"A{str(j)}")
-                        if test == "" or test is None:
-                            break
-
-                        if sheet.getContents(f"A{str(j)}") == str(
-                            ws[f"{Column}{StartRow}"].value
-                        ):
-                            sheet.set(f"B{j}", "-")
-                            sheet.set(
-                                f"E{j}", "Property value retrieved from drawing list"
-                            )
-
-                # If the cell is empty, you are on the end. Break the loop.
-                if ws[f"{Column}{StartRow}"].value is None:
-                    break
+            # Create a list with return values. These are the headers right from the first column
+            ReturnNamesExcel = list(Rows[0][1:])
+            for ReturnName in ReturnNamesExcel:
+                # Mark the property in the titleblock spreadsheet
+                MarkDrawingListProperty(sheet, ReturnName)
 
             # Get the pages in the document
             pages = App.ActiveDocument.findObjects("TechDraw::DrawPage")
+            # If only a selection of pages must be filled, use these pages
+            if SelectedPages is not None:
+                pages = SelectedPages
 
-            # Go through the excel list and collect the property value based on the property name searched for.
-            for i in range(1000):
-                # Define the start row. This is the Header row + 1 + i as counter
-                RowNumber = int(StartRow) + i + 1
-
-                # If the property name in the drawing list is empty, it is the end of the list.
-                # Exit the function
-                if ws[f"{StartColumn}{RowNumber}"].value is None:
-                    break
-
-                # Get the property name in the excel list. If it starts with "'", remove it
-                PropertyValueExcel = str(ws[f"{StartColumn}{RowNumber}"].value)
-                if PropertyValueExcel[:1] == "'":
-                    PropertyValueExcel = PropertyValueExcel[1:]
-
-                # Go through the columns starting from the column right from the column with the property value
-                for j in range(len(ReturnNamesExcel)):
-                    # Get the column letter
-                    Column = Standard_Functions.GetLetterFromNumber(
-                        j + Standard_Functions.GetNumberFromLetter(StartColumn) + 1
-                    )
-
-                    # If the cell is not empty and j is lower then NoColumns, continue.
-                    if ws[f"{Column}{RowNumber}"].value is not None:
-                        # Get the property value in the excel list. If it starts with "'", remove it
-                        ReturnValueExcel = str(ws[f"{Column}{RowNumber}"].value)
-                        if ReturnValueExcel[:1] == "'":
-                            ReturnValueExcel = ReturnValueExcel[1:]
-
-                        # If page names are not to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is False:
-                            # Go through all the pages
-                            for page in pages:
-                                # Get the editable texts
-                                texts = page.Template.EditableTexts
-                                # If the value editable text in the titleblock to search for
-                                # matches the property value in the drawing list,
-                                # fill in the editable text that needs to be updated.
-                                if (
-                                    texts[PROPERTY_NAME_SIMPLE_LIST]
-                                    == PropertyValueExcel
-                                ):
-                                    # Get the property name in the titleblock spreadsheet and fill it with the property value from the drawing list
-                                    texts[ReturnNamesExcel[j]] = ReturnValueExcel
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
-
-                        # If page names are to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is True:
-                            # Go through the pages
-                            for page in pages:
-                                # If the Property name in the drawing list matches the page label:
-                                # Fill in the desired editable text with the property value from the drawing list
-                                if PropertyValueExcel == page.Label:
-                                    # Get the editable texts
-                                    texts = page.Template.EditableTexts
-                                    texts[ReturnNamesExcel[j]] = ReturnValueExcel
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
+            # Map the values in the excel list to the pages.
+            JoinSimpleDrawingList(pages, Rows[1:], ReturnNamesExcel)
 
             # Recomute the document
-            App.ActiveDocument.recompute(None, True, True)
+            FillTransaction.Recompute(App.ActiveDocument)
 
         except Exception as e:
             Text = translate(
@@ -546,7 +468,7 @@ def MapSimpleDrawingList_Excel(sheet):
     return
 
 
-def MapSimpleDrawingList_FreeCAD(sheet):
+def MapSimpleDrawingList_FreeCAD(sheet, SelectedPages=None):
     # Check if it is allowed to use an external source and if so, continue
     if USE_SIMPLE_LIST is True and USE_EXTERNAL_SOURCE_SIMPLE_LIST is True:
         # if debug mode is enabled, show the external file including path.
@@ -568,20 +490,18 @@ def MapSimpleDrawingList_FreeCAD(sheet):
 
         # try to open the source. if not show an messagebox and if debug mode is enabled, show the exeption as well
         try:
-            if EXTERNAL_FILE_SIMPLE_LIST.lower().endswith(".xlsx"):
-                Filter = [
-                    ("FreeCAD", "*.FCStd"),
-                ]
+            if ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST) == "Excel":
+                Filter = ExternalSource.GetFileFilter("FreeCAD")
                 FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
                 if FileName != "":
-                    ff = App.openDocument(FileName, True)
+                    ff = ExternalSource.OpenDocument(FileName)
                 if FileName == "":
                     return
             else:
-                ff = App.openDocument(EXTERNAL_FILE_SIMPLE_LIST, True)
+                ff = ExternalSource.OpenDocument(EXTERNAL_FILE_SIMPLE_LIST)
             if EXTERNAL_FILE_SIMPLE_LIST == "":
                 # Set the sheetname with a inputbox
-                Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                Spreadsheet_List = ff.sheetnames
                 Text = translate(
                     "TitleBlock Workbench",
                     "Please enter the name of the spreadsheet",
@@ -599,20 +519,20 @@ def MapSimpleDrawingList_FreeCAD(sheet):
                 if not Input_SheetName.strip():
                     return
 
-                DrawingList = ff.getObject(Input_SheetName)
+                DrawingList = ff[Input_SheetName]
             if SHEETNAME_SIMPLE_LIST != "":
                 # Get the list of worksheets
-                Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                Spreadsheet_List = ff.sheetnames
                 # Assume that the worksheet doesn't exits
                 SpreadsheetExits = False
                 # Go through the names of the worksheets
                 for Spreadsheet in Spreadsheet_List:
                     # If a name matches the sheetname in preferences, set WorksheetsExits to True
-                    if Spreadsheet.Label == SHEETNAME_SIMPLE_LIST:
-                        SpreadsheetExits is True
+                    if Spreadsheet == SHEETNAME_SIMPLE_LIST:
+                        SpreadsheetExits = True
                 # If WorksheetsExits is true, define the worksheet
                 if SpreadsheetExits is True:
-                    DrawingList = ff.getObject(Input_SheetName)
+                    DrawingList = ff[Input_SheetName]
                 # If WorksheetsExits is false, ask the user to enter the correct name.
                 if SpreadsheetExits is False:
                     # Set the sheetname with a inputbox
@@ -633,7 +553,7 @@ def MapSimpleDrawingList_FreeCAD(sheet):
                     if not Input_SheetName.strip():
                         return
                     # Define the worksheets
-                    DrawingList = ff.getObject(Input_SheetName)
+                    DrawingList = ff[Input_SheetName]
                     # Save the sheetname to the preferences
                     preferences.SetString("SheetName_SimpleList", Input_SheetName)
         except Exception as e:
@@ -652,7 +572,7 @@ def MapSimpleDrawingList_FreeCAD(sheet):
             if STARTCELL_SIMPLE_LIST == "":
                 # Set EXTERNAL_SOURCE_SHEET_NAME to the chosen sheetname
                 preferences.SetString("SheetName", Input_SheetName)
-                DrawingList = ff.getObject(Input_SheetName)
+                DrawingList = ff[Input_SheetName]
                 # Set the startcell with an inputbox
                 Text = translate(
                     "TitleBlock Workbench",
@@ -716,146 +636,37 @@ def MapSimpleDrawingList_FreeCAD(sheet):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # Define placeholder for the property value in the drawing list.
-            PropertyValue_DrawingList = ""
-            # Define a placeholder for the qty of columns with return values
-            NoColumns = 0
-            # Create a list with return values
-            ReturnNames_DrawingList = []
-            for i in range(1000):
-                # Get the colum letter. For example: i = 0, StartColumn = A->1 + 1 results in column B
-                Column = Standard_Functions.GetLetterFromNumber(
-                    i
-                    + Standard_Functions.GetNumberFromLetter(StartColumn_DrawingList)
-                    + 1
-                )
-                NoColumns = NoColumns + i
-
-                # If the cell is not empty, add the contents to the list
-                if (
-                    str(DrawingList.getContents(f"{Column}{StartRow_DrawingList}"))
-                    != ""
-                ):
-                    ReturnName = str(
-                        DrawingList.getContents(f"{Column}{StartRow_DrawingList}")
-                    )
-                    if ReturnName[:1] == "'":
-                        ReturnName = ReturnName[1:]
-                    ReturnNames_DrawingList.append(ReturnName)
+            # Read the drawing list in one go. The number of columns is set by the header row.
+            Rows = ExternalSource.ReadRows(
+                DrawingList, StartColumn_DrawingList + str(StartRow_DrawingList)
+            )
 
-                    for j in range(1, 1000):
-                        # check if you reached the end of the data.
-                        TitleBlockPropName = sheet.getContents(f"A{str(j)}")
-                        if TitleBlockPropName[:1] == "'":
-                            TitleBlockPropName = TitleBlockPropName[1:]
-                        if TitleBlockPropName == "" or TitleBlockPropName is None:
-                            break
-
-                        if TitleBlockPropName == ReturnName:
-                            sheet.set(f"B{j}", "-")
-                            sheet.set(
-                                f"E{j}", "Property value retrieved from drawing list"
-                            )
+            # Create a list with return values. These are the headers right from the first column
+            ReturnNames_DrawingList = []
+            for ReturnName in Rows[0][1:]:
+                if ReturnName[:1] == "'":
+                    ReturnName = ReturnName[1:]
+                ReturnNames_DrawingList.append(ReturnName)
 
-                # If the cell is empty, you are on the end. Break the loop.
-                if (
-                    str(DrawingList.getContents(f"{Column}{StartRow_DrawingList}"))
-                    == ""
-                ):
-                    break
+                # Mark the property in the titleblock spreadsheet
+                MarkDrawingListProperty(sheet, ReturnName)
 
             # Get the pages in the document
             pages = doc.findObjects("TechDraw::DrawPage")
+            # If only a selection of pages must be filled, use these pages
+            if SelectedPages is not None:
+                pages = SelectedPages
 
-            # Go through the drawing list and collect the property value based on the property name searched for.
-            for i in range(1000):
-                # Define the start row. This is the Header row + 1 + i as counter
-                RowNumber = int(StartRow_DrawingList) + i + 1
-
-                # If the property name in the drawing list is empty, it is the end of the list.
-                # Exit the function
-                if (
-                    str(
-                        DrawingList.getContents(f"{StartColumn_DrawingList}{RowNumber}")
-                    )
-                    == ""
-                ):
-                    break
-
-                # Get the property name in the excel list. If it starts with "'", remove it
-                PropertyValue_DrawingList = str(
-                    DrawingList.getContents(f"{StartColumn_DrawingList}{RowNumber}")
-                )
-                if PropertyValue_DrawingList[:1] == "'":
-                    PropertyValue_DrawingList = PropertyValue_DrawingList[1:]
-
-                # Go through the columns starting from the column right from the column with the property value
-                for j in range(len(ReturnNames_DrawingList)):
-                    # Get the column letter
-                    Column = Standard_Functions.GetLetterFromNumber(
-                        j
-                        + Standard_Functions.GetNumberFromLetter(
-                            StartColumn_DrawingList
-                        )
-                        + 1
-                    )
-
-                    # If the cell is not empty and j is lower then NoColumns, continue.
-                    if str(DrawingList.getContents(f"{Column}{RowNumber}")) != "":
-                        # Get the property value in the excel list. If it starts with "'", remove it
-                        ReturnValue_DrawingList = str(
-                            DrawingList.getContents(f"{Column}{RowNumber}")
-                        )
-                        if ReturnValue_DrawingList[:1] == "'":
-                            ReturnValue_DrawingList = ReturnValue_DrawingList[1:]
-
-                        # If page names are not to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is False:
-                            # Go through all the pages
-                            for page in pages:
-                                # Get the editable texts
-                                texts = page.Template.EditableTexts
-                                # If the value editable text in the titleblock to search for
-                                # matches the property value in the drawing list,
-                                # fill in the editable text that needs to be updated.
-                                if (
-                                    texts[PROPERTY_NAME_SIMPLE_LIST]
-                                    == PropertyValue_DrawingList
-                                ):
-                                    # Get the property name in the titleblock spreadsheet and fill it with the property value from the drawing list
-                                    texts[ReturnNames_DrawingList[j]] = (
-                                        ReturnValue_DrawingList
-                                    )
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
-
-                        # If page names are to be mapped, go here
-                        if USE_PAGE_NAMES_SIMPLE_LIST is True:
-                            # Go through the pages
-                            for page in pages:
-                                # If the Property name in the drawing list matches the page label:
-                                # Fill in the desired editable text with the property value from the drawing list
-                                if PropertyValue_DrawingList == page.Label:
-                                    # Get the editable texts
-                                    texts = page.Template.EditableTexts
-                                    # Get the property name in the titleblock spreadsheet and fill it with the property value from the drawing list
-                                    texts[ReturnNames_DrawingList[j]] = (
-                                        ReturnValue_DrawingList
-                                    )
-
-                                    # Write all the updated text to the page.
-                                    page.Template.EditableTexts = texts
-                                    page.recompute()
+            # Map the values in the drawing list to the pages.
+            JoinSimpleDrawingList(pages, Rows[1:], ReturnNames_DrawingList)
 
             # ----------------------------------------------------------------------------------------------
             # recompute the document
-            doc.recompute(None, True, True)
+            FillTransaction.Recompute(doc)
             # Save the workbook
-            doc.save()
+            FillTransaction.Save(doc)
             # Close the FreeCAD file
-            App.closeDocument(ff.Name)
+            ff.close()
             # Activate the document which was active when this command started.
             try:
                 App.setActiveDocument(LastActiveDoc)
@@ -882,7 +693,7 @@ def MapSimpleDrawingList_FreeCAD(sheet):
     return
 
 
-def MapAdvancedDrawingList(doc, sheet):
+def MapAdvancedDrawingList(doc, sheet, SelectedPages=None):
     # Check if it is allowed to use an external source and if so, continue
     if USE_ADVANCED_LIST is True and USE_EXTERNAL_SOURCE_ADVANCED_LIST is False:
         try:
@@ -1083,6 +894,12 @@ def MapAdvancedDrawingList(doc, sheet):
                         pages = []
                         for k in range(len(Group.Group)):
                             if Group.Group[k].TypeId == "TechDraw::DrawPage":
+                                # If only a selection of pages must be filled, skip the other pages
+                                if (
+                                    SelectedPages is not None
+                                    and Group.Group[k] not in SelectedPages
+                                ):
+                                    continue
                                 pages.append(Group.Group[k])
 
                         # Go through the range of the group
@@ -1122,22 +939,8 @@ def MapAdvancedDrawingList(doc, sheet):
                                         CellValue = CellValue[1:]
                                     ReturnNamesExt.append(CellValue)
 
-                                    for j in range(1, 1000):
-                                        # check if you reached the end of the data.
-                                        test = sheet.getContents(f"A{str(j)}")
-                                        if test == "" or test is None:
-                                            break
-
-                                        if sheet.getContents(f"A{str(j)}") == str(
-                                            DrawingList.getContents(
-                                                f"{Column}{StartRow_DrawingList}"
-                                            )
-                                        ):
-                                            sheet.set(f"B{j}", "-")
-                                            sheet.set(
-                                                f"E{j}",
-                                                "Property value retrieved from drawing list",
-                                            )
+                                    # Mark the property in the titleblock spreadsheet
+                                    MarkDrawingListProperty(sheet, CellValue)
 
                                 # If the cell is empty, you are on the end. Break the loop.
                                 if (
@@ -1207,8 +1010,9 @@ def MapAdvancedDrawingList(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
                                     # If page names are to be mapped, go here
                                     if USE_PAGE_NAMES_ADVANCED_LIST is True:
@@ -1224,14 +1028,15 @@ def MapAdvancedDrawingList(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
             # ----------------------------------------------------------------------------------------------
             # recompute the document
-            doc.recompute(None, True, True)
+            FillTransaction.Recompute(doc)
             # Save the workbook
-            doc.save()
+            FillTransaction.Save(doc)
             # Activate the document which was active when this command started.
             try:
                 App.setActiveDocument(LastActiveDoc)
@@ -1258,8 +1063,7 @@ def MapAdvancedDrawingList(doc, sheet):
     return
 
 
-def MapAdvancedDrawingList_Excel(doc, sheet):
-    from openpyxl import load_workbook
+def MapAdvancedDrawingList_Excel(doc, sheet, SelectedPages=None):
 
     # Check if it is allowed to use an external source and if so, continue
     if USE_ADVANCED_LIST is True and USE_EXTERNAL_SOURCE_ADVANCED_LIST is True:
@@ -1277,19 +1081,15 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
             wb = ""
             # If the drawinglist is an FreeCAD document instead of an Excel workbook,
             # Let the user select the correct workbook. Otherwise just load the workbook.
-            if EXTERNAL_FILE_ADVANCED_LIST.lower().endswith(".fcstd"):
-                Filter = [
-                    ("Excel", "*.xlsx"),
-                ]
+            if ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST) == "FreeCAD":
+                Filter = ExternalSource.GetFileFilter("Excel")
                 FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
                 if FileName != "":
-                    wb = load_workbook(FileName, read_only=True, data_only=True)
+                    wb = ExternalSource.OpenSource(FileName)
                 if FileName == "":
                     return
             else:
-                wb = load_workbook(
-                    str(EXTERNAL_FILE_ADVANCED_LIST), read_only=True, data_only=True
-                )
+                wb = ExternalSource.OpenSource(str(EXTERNAL_FILE_ADVANCED_LIST))
             # If the sheetname not set, let the user set the correct name.
             if SHEETNAME_ADVANCED_LIST == "":
                 # Set the sheetname with a inputbox
@@ -1462,56 +1262,41 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # Get the cell adresses for the cell with the group names
-            # Define a dict for the adresses
+            # Read the drawing list in one go. The number of columns is set by the header row.
+            Rows = ExternalSource.ReadRows(
+                ws, StartColumn_DrawingList + str(StartRow_DrawingList)
+            )
+
+            # Create a list with return values. These are the headers right from the first column
+            ReturnNamesExcel = list(Rows[0][1:])
+            for ReturnName in ReturnNamesExcel:
+                # Mark the property in the titleblock spreadsheet
+                MarkDrawingListProperty(sheet, ReturnName)
+
+            # Get the rows with the group names
+            # Define a list for the group names and their row in the drawing list
             ExtSourceGroupAdress = []
             # Go through the group list
-            i = 0
-            j = 0
             for i in range(len(GroupList)):
                 # Go through the first column in the drawing list.
-                for j in range(1, 1000):
-                    # Get the cell value
-                    CellValue = str(
-                        ws[f"{StartColumn_DrawingList}{StartRow_DrawingList + j}"].value
-                    )
-
+                for j in range(1, len(Rows)):
                     # If the cell value is equal to the group label, this is the cell with a group name.
-                    # Add it to the adress dict.
-                    if GroupList[i].Label == CellValue:
-                        ExtSourceGroupAdress.append(
-                            [
-                                GroupList[i].Label,
-                                f"{StartColumn_DrawingList}{StartRow_DrawingList+j}",
-                            ]
-                        )
-
-                    # If the cell value is empty, you are at the end of the drawing list.
-                    if (
-                        ws[f"{StartColumn_DrawingList}{StartRow_DrawingList + j}"].value
-                        is None
-                    ):
-                        break
+                    # Add it to the adress list.
+                    if GroupList[i].Label == Rows[j][0]:
+                        ExtSourceGroupAdress.append([GroupList[i].Label, j])
             # Add an endrow, so you can determine the last range in the next function
-            ExtSourceGroupAdress.append(
-                ["EndRow", f"{StartColumn_DrawingList}{StartRow_DrawingList+j}"]
-            )
+            ExtSourceGroupAdress.append(["EndRow", len(Rows)])
 
             # Create ranges for the different groups, where the function must search.
             NewList = []
             for i in range(len(ExtSourceGroupAdress) - 1):
-                # Get the start cell. This is one row below the group cell
-                StartCell_Range = ExtSourceGroupAdress[i][1]
-                StartCell_Range = (
-                    f"{Standard_Functions.RemoveNumbersFromString(StartCell_Range)}"
-                    + f"{str(int(Standard_Functions.RemoveLettersFromString(StartCell_Range)) + 1)}"
-                )
-                # Get the end cell.
-                EndCell_Range = ExtSourceGroupAdress[i + 1][1]
-
-                # Add the end cell to the corresponding list item.
+                # The range starts one row below the group name and ends at the next group.
                 NewList.append(
-                    [ExtSourceGroupAdress[i][0], StartCell_Range, EndCell_Range]
+                    [
+                        ExtSourceGroupAdress[i][0],
+                        ExtSourceGroupAdress[i][1] + 1,
+                        ExtSourceGroupAdress[i + 1][1],
+                    ]
                 )
             ExtSourceGroupAdress = NewList
 
@@ -1520,83 +1305,28 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
                 # Go through the list with adresses fro each group
                 for j in range(len(ExtSourceGroupAdress)):
                     if Group.Label == ExtSourceGroupAdress[j][0]:
-                        # Define the start, end and column
-                        StartRow_Range = int(
-                            Standard_Functions.RemoveLettersFromString(
-                                ExtSourceGroupAdress[j][1]
-                            )
-                        )
-                        EndRow_Range = int(
-                            Standard_Functions.RemoveLettersFromString(
-                                ExtSourceGroupAdress[j][2]
-                            )
-                        )
-                        StartRow_DrawingList = int(
-                            Standard_Functions.RemoveLettersFromString(StartCell)
-                        )
-                        StartColumn_DrawingList = (
-                            Standard_Functions.RemoveNumbersFromString(StartCell)
-                        )
+                        # Define the start and end of the range
+                        StartRow_Range = ExtSourceGroupAdress[j][1]
+                        EndRow_Range = ExtSourceGroupAdress[j][2]
 
                         # Get the pages in the group
                         pages = []
                         for k in range(len(Group.Group)):
                             if Group.Group[k].TypeId == "TechDraw::DrawPage":
+                                # If only a selection of pages must be filled, skip the other pages
+                                if (
+                                    SelectedPages is not None
+                                    and Group.Group[k] not in SelectedPages
+                                ):
+                                    continue
                                 pages.append(Group.Group[k])
 
                         # Go through the range of the group
                         for k in range(StartRow_Range, EndRow_Range):
-                            # Define the rownumber. This is the Header row + 1 + i as counter
-                            RowNumber = k
-                            # Define placeholder for the property value in the drawing list.
-                            PropertyValueExcel = ""
-                            # Define a placeholder for the qty of columns with return values
-                            NoColumns = 0
-                            # Create a list with return values
-                            ReturnNamesExcel = []
-                            for i in range(1000):
-                                # Get the colum letter. For example: i = 0, StartColumn = A->1 + 1 results in column B
-                                Column = Standard_Functions.GetLetterFromNumber(
-                                    i
-                                    + Standard_Functions.GetNumberFromLetter(
-                                        StartColumn_DrawingList
-                                    )
-                                    + 1
-                                )
-                                NoColumns = NoColumns + i
-
-                                # If the cell is not empty, add the contents to the list
-                                if (
-                                    ws[f"{Column}{StartRow_DrawingList}"].value
-                                    is not None
-                                ):
-                                    ReturnNamesExcel.append(
-                                        str(ws[f"{Column}{StartRow_DrawingList}"].value)
-                                    )
-
-                                    for j in range(1, 1000):
-                                        # check if you reached the end of the data.
-                                        test = sheet.getContents(f"A{str(j)}")
-                                        if test == "" or test is None:
-                                            break
-
-                                        if sheet.getContents(f"A{str(j)}") == str(
-                                            ws[f"{Column}{StartRow_DrawingList}"].value
-                                        ):
-                                            sheet.set(f"B{j}", "-")
-                                            sheet.set(
-                                                f"E{j}",
-                                                "Property value retrieved from drawing list",
-                                            )
-
-                                # If the cell is empty, you are on the end. Break the loop.
-                                if ws[f"{Column}{StartRow_DrawingList}"].value is None:
-                                    break
+                            Row = Rows[k]
 
                             # Get the property name in the drawing list. If it starts with "'", remove it
-                            PropertyValueExcel = str(
-                                ws[f"{StartColumn_DrawingList}{RowNumber}"].value
-                            )
+                            PropertyValueExcel = Row[0]
                             if PropertyValueExcel[:1] == "'":
                                 PropertyValueExcel = PropertyValueExcel[1:]
                             # If a prefix is used for sorting the groups in the tree, remove it from the Property
@@ -1609,21 +1339,10 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
 
                             # Go through the columns starting from the column right from the column with the property value
                             for j in range(len(ReturnNamesExcel)):
-                                # Get the column letter
-                                Column = Standard_Functions.GetLetterFromNumber(
-                                    j
-                                    + Standard_Functions.GetNumberFromLetter(
-                                        StartColumn_DrawingList
-                                    )
-                                    + 1
-                                )
-
-                                # If the cell is not empty and j is lower then NoColumns, continue.
-                                if ws[f"{Column}{RowNumber}"].value is not None:
+                                # If the cell is not empty, continue.
+                                if Row[j + 1] is not None:
                                     # Get the property value in the excel list. If it starts with "'", remove it
-                                    ReturnValueExcel = str(
-                                        ws[f"{Column}{RowNumber}"].value
-                                    )
+                                    ReturnValueExcel = Row[j + 1]
                                     if ReturnValueExcel[:1] == "'":
                                         ReturnValueExcel = ReturnValueExcel[1:]
 
@@ -1647,8 +1366,9 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
                                     # If page names are to be mapped, go here
                                     if USE_PAGE_NAMES_ADVANCED_LIST is True:
@@ -1664,12 +1384,13 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
             # ----------------------------------------------------------------------------------------------
             # Recomute the document
-            App.ActiveDocument.recompute(None, True, True)
+            FillTransaction.Recompute(App.ActiveDocument)
 
         except Exception as e:
             Text = translate(
@@ -1694,7 +1415,7 @@ def MapAdvancedDrawingList_Excel(doc, sheet):
     return
 
 
-def MapAdvancedDrawingList_FreeCAD(doc, sheet):
+def MapAdvancedDrawingList_FreeCAD(doc, sheet, SelectedPages=None):
     # Check if it is allowed to use an external source and if so, continue
     if USE_ADVANCED_LIST is True and USE_EXTERNAL_SOURCE_ADVANCED_LIST is True:
         # if debug mode is enabled, show the external file including path.
@@ -1716,20 +1437,18 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
 
         # try to open the source. if not show an messagebox and if debug mode is enabled, show the exeption as well
         try:
-            if EXTERNAL_FILE_ADVANCED_LIST.lower().endswith(".xlsx"):
-                Filter = [
-                    ("FreeCAD", "*.FCStd"),
-                ]
+            if ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST) == "Excel":
+                Filter = ExternalSource.GetFileFilter("FreeCAD")
                 FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
                 if FileName != "":
-                    ff = App.openDocument(FileName, True)
+                    ff = ExternalSource.OpenDocument(FileName)
                 if FileName == "":
                     return
             else:
-                ff = App.openDocument(EXTERNAL_FILE_ADVANCED_LIST, True)
+                ff = ExternalSource.OpenDocument(EXTERNAL_FILE_ADVANCED_LIST)
             if EXTERNAL_FILE_ADVANCED_LIST == "":
                 # Set the sheetname with a inputbox
-                Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                Spreadsheet_List = ff.sheetnames
                 Text = translate(
                     "TitleBlock Workbench",
                     "Please enter the name of the spreadsheet",
@@ -1747,20 +1466,20 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                 if not Input_SheetName.strip():
                     return
 
-                DrawingList = ff.getObject(Input_SheetName)
+                DrawingList = ff[Input_SheetName]
             if SHEETNAME_ADVANCED_LIST != "":
                 # Get the list of worksheets
-                Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                Spreadsheet_List = ff.sheetnames
                 # Assume that the worksheet doesn't exits
                 SpreadsheetExits = False
                 # Go through the names of the worksheets
                 for Spreadsheet in Spreadsheet_List:
                     # If a name matches the sheetname in preferences, set WorksheetsExits to True
-                    if Spreadsheet.Label == SHEETNAME_ADVANCED_LIST:
-                        SpreadsheetExits is True
+                    if Spreadsheet == SHEETNAME_ADVANCED_LIST:
+                        SpreadsheetExits = True
                 # If WorksheetsExits is true, define the worksheet
                 if SpreadsheetExits is True:
-                    DrawingList = ff.getObject(Input_SheetName)
+                    DrawingList = ff[Input_SheetName]
                 # If WorksheetsExits is false, ask the user to enter the correct name.
                 if SpreadsheetExits is False:
                     # Set the sheetname with a inputbox
@@ -1781,7 +1500,7 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                     if not Input_SheetName.strip():
                         return
                     # Define the worksheets
-                    DrawingList = ff.getObject(Input_SheetName)
+                    DrawingList = ff[Input_SheetName]
                     # Save the sheetname to preferences
                     preferences.SetString("SheetName_AdvancedList", Input_SheetName)
         except Exception as e:
@@ -1824,7 +1543,7 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
             if SHEETNAME_ADVANCED_LIST == "":
                 # Set EXTERNAL_SOURCE_SHEET_NAME to the chosen sheetname
                 preferences.SetString("SheetName", Input_SheetName)
-                DrawingList = ff.getObject(Input_SheetName)
+                DrawingList = ff[Input_SheetName]
                 # Set the startcell with an inputbox
                 Text = translate(
                     "TitleBlock Workbench",
@@ -1890,62 +1609,50 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # Get the cell adresses for the cell with the group names
-            # Define a dict for the adresses
+            # Read the drawing list in one go. The number of columns is set by the header row.
+            Rows = ExternalSource.ReadRows(
+                DrawingList, StartColumn_DrawingList + str(StartRow_DrawingList)
+            )
+
+            # Create a list with return values. These are the headers right from the first column
+            ReturnNamesExt = []
+            for CellValue in Rows[0][1:]:
+                if CellValue[:1] == "'":
+                    CellValue = CellValue[1:]
+                ReturnNamesExt.append(CellValue)
+
+                # Mark the property in the titleblock spreadsheet
+                MarkDrawingListProperty(sheet, CellValue)
+
+            # Get the rows with the group names
+            # Define a list for the group names and their row in the drawing list
             ExtSourceGroupAdress = []
             # Go through the group list
-            i = 0
-            j = 0
             for i in range(len(GroupList)):
                 # Go through the first column in the drawing list.
-                for j in range(1, 1000):
+                for j in range(1, len(Rows)):
                     # Get the cell value
-                    CellValue = str(
-                        DrawingList.getContents(
-                            f"{StartColumn_DrawingList}{StartRow_DrawingList + j}"
-                        )
-                    )
+                    CellValue = Rows[j][0]
                     if CellValue[:1] == "'":
                         CellValue = CellValue[1:]
 
                     # If the cell value is equal to the group label, this is the cell with a group name.
-                    # Add it to the adress dict.
+                    # Add it to the adress list.
                     if GroupList[i].Label == CellValue:
-                        ExtSourceGroupAdress.append(
-                            [
-                                GroupList[i].Label,
-                                f"{StartColumn_DrawingList}{StartRow_DrawingList+j}",
-                            ]
-                        )
-
-                    # If the cell value is empty, you are at the end of the drawing list.
-                    if (
-                        DrawingList.getContents(
-                            f"{StartColumn_DrawingList}{StartRow_DrawingList + j}"
-                        )
-                        == ""
-                    ):
-                        break
+                        ExtSourceGroupAdress.append([GroupList[i].Label, j])
             # Add an endrow, so you can determine the last range in the next function
-            ExtSourceGroupAdress.append(
-                ["EndRow", f"{StartColumn_DrawingList}{StartRow_DrawingList+j}"]
-            )
+            ExtSourceGroupAdress.append(["EndRow", len(Rows)])
 
             # Create ranges for the different groups, where the function must search.
             NewList = []
             for i in range(len(ExtSourceGroupAdress) - 1):
-                # Get the start cell. This is one row below the group cell
-                StartCell_Range = ExtSourceGroupAdress[i][1]
-                StartCell_Range = (
-                    f"{Standard_Functions.RemoveNumbersFromString(StartCell_Range)}"
-                    + f"{str(int(Standard_Functions.RemoveLettersFromString(StartCell_Range)) + 1)}"
-                )
-                # Get the end cell.
-                EndCell_Range = ExtSourceGroupAdress[i + 1][1]
-
-                # Add the end cell to the corresponding list item.
+                # The range starts one row below the group name and ends at the next group.
                 NewList.append(
-                    [ExtSourceGroupAdress[i][0], StartCell_Range, EndCell_Range]
+                    [
+                        ExtSourceGroupAdress[i][0],
+                        ExtSourceGroupAdress[i][1] + 1,
+                        ExtSourceGroupAdress[i + 1][1],
+                    ]
                 )
             ExtSourceGroupAdress = NewList
 
@@ -1954,99 +1661,28 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                 # Go through the list with adresses fro each group
                 for j in range(len(ExtSourceGroupAdress)):
                     if Group.Label == ExtSourceGroupAdress[j][0]:
-                        # Define the start, end and column
-                        StartRow_Range = int(
-                            Standard_Functions.RemoveLettersFromString(
-                                ExtSourceGroupAdress[j][1]
-                            )
-                        )
-                        EndRow_Range = int(
-                            Standard_Functions.RemoveLettersFromString(
-                                ExtSourceGroupAdress[j][2]
-                            )
-                        )
-                        StartRow_DrawingList = int(
-                            Standard_Functions.RemoveLettersFromString(StartCell)
-                        )
-                        StartColumn_DrawingList = (
-                            Standard_Functions.RemoveNumbersFromString(StartCell)
-                        )
+                        # Define the start and end of the range
+                        StartRow_Range = ExtSourceGroupAdress[j][1]
+                        EndRow_Range = ExtSourceGroupAdress[j][2]
 
                         # Get the pages in the group
                         pages = []
                         for k in range(len(Group.Group)):
                             if Group.Group[k].TypeId == "TechDraw::DrawPage":
+                                # If only a selection of pages must be filled, skip the other pages
+                                if (
+                                    SelectedPages is not None
+                                    and Group.Group[k] not in SelectedPages
+                                ):
+                                    continue
                                 pages.append(Group.Group[k])
 
                         # Go through the range of the group
                         for k in range(StartRow_Range, EndRow_Range):
-                            # Define the rownumber. This is the Header row + 1 + i as counter
-                            RowNumber = k
-                            # Define placeholder for the property value in the drawing list.
-                            PropertyValueExt = ""
-                            # Define a placeholder for the qty of columns with return values
-                            NoColumns = 0
-                            # Create a list with return values
-                            ReturnNamesExt = []
-                            for i in range(1000):
-                                # Get the colum letter. For example: i = 0, StartColumn = A->1 + 1 results in column B
-                                Column = Standard_Functions.GetLetterFromNumber(
-                                    i
-                                    + Standard_Functions.GetNumberFromLetter(
-                                        StartColumn_DrawingList
-                                    )
-                                    + 1
-                                )
-                                NoColumns = NoColumns + i
-
-                                # If the cell is not empty, add the contents to the list
-                                if (
-                                    DrawingList.getContents(
-                                        f"{Column}{StartRow_DrawingList}"
-                                    )
-                                    != ""
-                                ):
-                                    CellValue = str(
-                                        DrawingList.getContents(
-                                            f"{Column}{StartRow_DrawingList}"
-                                        )
-                                    )
-                                    if CellValue[:1] == "'":
-                                        CellValue = CellValue[1:]
-                                    ReturnNamesExt.append(CellValue)
-
-                                    for j in range(1, 1000):
-                                        # check if you reached the end of the data.
-                                        test = sheet.getContents(f"A{str(j)}")
-                                        if test == "" or test is None:
-                                            break
-
-                                        if sheet.getContents(f"A{str(j)}") == str(
-                                            DrawingList.getContents(
-                                                f"{Column}{StartRow_DrawingList}"
-                                            )
-                                        ):
-                                            sheet.set(f"B{j}", "-")
-                                            sheet.set(
-                                                f"E{j}",
-                                                "Property value retrieved from drawing list",
-                                            )
-
-                                # If the cell is empty, you are on the end. Break the loop.
-                                if (
-                                    DrawingList.getContents(
-                                        f"{Column}{StartRow_DrawingList}"
-                                    )
-                                    == ""
-                                ):
-                                    break
+                            Row = Rows[k]
 
                             # Get the property name in the drawing list. If it starts with "'", remove it
-                            PropertyValueExt = str(
-                                DrawingList.getContents(
-                                    f"{StartColumn_DrawingList}{RowNumber}"
-                                )
-                            )
+                            PropertyValueExt = Row[0]
                             if PropertyValueExt[:1] == "'":
                                 PropertyValueExt = PropertyValueExt[1:]
                             # If a prefix is used for sorting the groups in the tree, remove it from the Property
@@ -2059,24 +1695,10 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
 
                             # Go through the columns starting from the column right from the column with the property value
                             for j in range(len(ReturnNamesExt)):
-                                # Get the column letter
-                                Column = Standard_Functions.GetLetterFromNumber(
-                                    j
-                                    + Standard_Functions.GetNumberFromLetter(
-                                        StartColumn_DrawingList
-                                    )
-                                    + 1
-                                )
-
-                                # If the cell is not empty and j is lower then NoColumns, continue.
-                                if (
-                                    DrawingList.getContents(f"{Column}{RowNumber}")
-                                    != ""
-                                ):
-                                    # Get the property value in the excel list. If it starts with "'", remove it
-                                    ReturnValueExt = str(
-                                        DrawingList.getContents(f"{Column}{RowNumber}")
-                                    )
+                                # If the cell is not empty, continue.
+                                if Row[j + 1] is not None:
+                                    # Get the property value in the drawing list. If it starts with "'", remove it
+                                    ReturnValueExt = Row[j + 1]
                                     if ReturnValueExt[:1] == "'":
                                         ReturnValueExt = ReturnValueExt[1:]
 
@@ -2100,8 +1722,9 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
                                     # If page names are to be mapped, go here
                                     if USE_PAGE_NAMES_ADVANCED_LIST is True:
@@ -2117,16 +1740,17 @@ def MapAdvancedDrawingList_FreeCAD(doc, sheet):
                                                 )
 
                                                 # Write all the updated text to the page.
-                                                page.Template.EditableTexts = texts
-                                                page.recompute()
+                                                TechDraw_Functions.WriteEditableTexts(
+                                                    page, texts
+                                                )
 
             # ----------------------------------------------------------------------------------------------
             # recompute the document
-            doc.recompute(None, True, True)
+            FillTransaction.Recompute(doc)
             # Save the workbook
-            doc.save()
+            FillTransaction.Save(doc)
             # Close the FreeCAD file
-            App.closeDocument(ff.Name)
+            ff.close()
             # Activate the document which was active when this command started.
             try:
                 App.setActiveDocument(LastActiveDoc)
@@ -26,8 +26,13 @@
 import FreeCAD as App
 import FreeCADGui as Gui
 import Standard_Functions_TB as Standard_Functions
+import ExternalSource_TB as ExternalSource
 import FillSpreadsheet_TB
 import FillTitleBlock_TB
+import FillTransaction_TB
+import Fingerprint_TB
+import TechDraw_Functions_TB
+import Spreadsheet_Functions_TB
 from Settings_TB import EXTERNAL_SOURCE_PATH
 from Settings_TB import USE_EXTERNAL_SOURCE
 from Settings_TB import ENABLE_DEBUG
@@ -35,44 +40,183 @@ from Settings_TB import ENABLE_RECOMPUTE_FILL_SPREADSHEET
 from Settings_TB import ENABLE_RECOMPUTE_FILL_TITLEBLOCK
 
 
+# The workbenches in which the observer updates the titleblocks
+AllowedWorkbenches = [
+    "TitleBlockWB",
+    "TechDrawWorkbench",
+    "SpreadsheetWorkbench",
+]
+
+
 # Class for a observer that observers recompute events
 class myObserver(object):
+    def __init__(self):
+        from PySide.QtCore import QTimer
+        from Settings_TB import RECOMPUTE_DELAY
+
+        # The names of the documents that wait to be updated
+        self.PendingDocuments = []
+        # Per document: the number of recomputes by the user and the number that is filled last.
+        self.Generation = {}
+        self.FilledGeneration = {}
+        # The names of the documents that are being updated
+        self.InProgress = set()
+        # Per document: the number of recomputes that were caused by the workbench itself
+        self.SuppressedCycles = {}
+        # Per document: the fingerprint of the inputs after the last successful fill
+        self.Fingerprints = {}
+        # A single shot timer. Every recompute restarts the timer, so a burst of recomputes
+        # results in one update after the quiet period.
+        self.Timer = QTimer()
+        self.Timer.setSingleShot(True)
+        self.Timer.setInterval(RECOMPUTE_DELAY)
+        self.Timer.timeout.connect(self.ProcessPendingDocuments)
+
     # Observer for document recompute event ("CTRL+R")
     def slotRecomputedDocument(self, doc):
+        if (
+            ENABLE_RECOMPUTE_FILL_SPREADSHEET is False
+            and ENABLE_RECOMPUTE_FILL_TITLEBLOCK is False
+        ):
+            return
+
+        # Ignore the recomputes that are caused by the workbench's own writes.
+        if doc.Name in self.InProgress or FillTransaction_TB.IsBusy(doc) is True:
+            self.SuppressedCycles[doc.Name] = self.SuppressedCycles.get(doc.Name, 0) + 1
+            if ENABLE_DEBUG is True:
+                Standard_Functions.Print(
+                    f"Recompute of {doc.Label} caused by the workbench is ignored. "
+                    + f"Suppressed cycles: {self.SuppressedCycles[doc.Name]}",
+                    "Log",
+                )
+            return
+
         ActiveWorkbench = Gui.activeWorkbench()
-        AllowedWorkbenches = [
-            "TitleBlockWB",
-            "TechDrawWorkbench",
-            "SpreadsheetWorkbench",
-        ]
-        for AllowedWorkBench in AllowedWorkbenches:
-            if ActiveWorkbench.name() == AllowedWorkBench:
-                if ENABLE_RECOMPUTE_FILL_SPREADSHEET is True:
-                    if USE_EXTERNAL_SOURCE is True:
-                        if EXTERNAL_SOURCE_PATH.lower().endswith(".xlsx") is True:
-                            FillSpreadsheet_TB.Start("ImportExcel", doc, False)
-                        if EXTERNAL_SOURCE_PATH.lower().endswith(".xlsx") is False:
-                            FillSpreadsheet_TB.Start("ImportFreeCAD", doc, False)
-                    if USE_EXTERNAL_SOURCE is False:
-                        FillSpreadsheet_TB.Start("FillSpreadsheet", doc, False)
-                    if ENABLE_DEBUG is True:
-                        Standard_Functions.Print(
-                            "The titleblock spreadsheet has been updated!"
-                        )
-
-                if ENABLE_RECOMPUTE_FILL_TITLEBLOCK is True:
-                    FillTitleBlock_TB.FillTitleBlock(doc=doc, recompute=False)
-                    if ENABLE_DEBUG is True:
-                        Standard_Functions.Print(
-                            "The titleblock in all the pages has been updated!"
-                        )
+        if ActiveWorkbench is None or ActiveWorkbench.name() not in AllowedWorkbenches:
+            return
+
+        # Increase the generation of the document
+        self.Generation[doc.Name] = self.Generation.get(doc.Name, 0) + 1
+
+        # Add the document to the queue and (re)start the timer
+        if doc.Name not in self.PendingDocuments:
+            self.PendingDocuments.append(doc.Name)
+        self.Timer.start()
+
+        if ENABLE_DEBUG is True:
+            Standard_Functions.Print("%s has been recomputed\n" % doc.Label, "Log")
+        return
+
+    def ProcessPendingDocuments(self):
+        # Take the queue and empty it. Recomputes during the update are queued again.
+        DocumentNames = self.PendingDocuments
+        self.PendingDocuments = []
+
+        for DocumentName in DocumentNames:
+            # The document can be closed in the mean time
+            if DocumentName not in App.listDocuments():
+                continue
+
+            # If the document is still being updated (for example while a dialog is shown),
+            # put it back in the queue.
+            if DocumentName in self.InProgress:
+                if DocumentName not in self.PendingDocuments:
+                    self.PendingDocuments.append(DocumentName)
+                self.Timer.start()
+                continue
+
+            # Skip the document if this generation is already filled
+            Generation = self.Generation.get(DocumentName, 0)
+            if self.FilledGeneration.get(DocumentName) == Generation:
+                continue
 
+            doc = App.getDocument(DocumentName)
+
+            # Skip the fill if none of the inputs has changed since the last fill
+            Fingerprint = Fingerprint_TB.GetInputFingerprint(doc)
+            if Fingerprint is not None and Fingerprint == self.Fingerprints.get(
+                DocumentName
+            ):
+                self.FilledGeneration[DocumentName] = Generation
                 if ENABLE_DEBUG is True:
                     Standard_Functions.Print(
-                        "%s has been recomputed\n" % doc.Label, "Log"
+                        f"The inputs of {DocumentName} are not changed. The update is skipped.",
+                        "Log",
                     )
+                continue
+
+            self.InProgress.add(DocumentName)
+            try:
+                UpdateDocument(doc)
+                # Store the fingerprint after the fill, because the fill changes the inputs as well.
+                self.Fingerprints[DocumentName] = Fingerprint_TB.GetInputFingerprint(
+                    doc
+                )
+            finally:
+                self.InProgress.discard(DocumentName)
+                self.FilledGeneration[DocumentName] = Generation
+
+            if ENABLE_DEBUG is True:
+                Standard_Functions.Print(
+                    f"{DocumentName} is updated for generation {Generation}. "
+                    + f"Suppressed cycles: {self.SuppressedCycles.get(DocumentName, 0)}",
+                    "Log",
+                )
+        return
+
+    # Observers for created and deleted objects. If a page is added or removed, the page index is outdated.
+    def slotCreatedObject(self, obj):
+        if obj.TypeId == "TechDraw::DrawPage":
+            TechDraw_Functions_TB.InvalidatePageIndex(obj.Document)
+        return
+
+    def slotDeletedObject(self, obj):
+        if obj.TypeId == "TechDraw::DrawPage":
+            TechDraw_Functions_TB.InvalidatePageIndex(obj.Document)
         return
 
+    # Observer for changed objects. If a spreadsheet is changed by the user, its property row index is outdated.
+    # The workbench invalidates the index itself when it writes to a spreadsheet.
+    def slotChangedObject(self, obj, prop):
+        if obj.TypeId == "Spreadsheet::Sheet":
+            if FillTransaction_TB.IsBusy(obj.Document) is False:
+                Spreadsheet_Functions_TB.InvalidatePropertyRowIndex(obj)
+        return
+
+    def slotDeletedDocument(self, doc):
+        TechDraw_Functions_TB.InvalidatePageIndex(doc)
+        Spreadsheet_Functions_TB.InvalidatePropertyRowIndex()
+        self.Generation.pop(doc.Name, None)
+        self.FilledGeneration.pop(doc.Name, None)
+        self.SuppressedCycles.pop(doc.Name, None)
+        self.Fingerprints.pop(doc.Name, None)
+        return
+
+
+def UpdateDocument(doc):
+    # Update the spreadsheet and the titleblocks in one transaction.
+    # The document is not recomputed again, only the changed pages and the spreadsheet.
+    with FillTransaction_TB.FillTransaction(doc, recompute=False):
+        if ENABLE_RECOMPUTE_FILL_SPREADSHEET is True:
+            if USE_EXTERNAL_SOURCE is True:
+                SourceType = ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH)
+                if SourceType == "Excel":
+                    FillSpreadsheet_TB.Start("ImportExcel", doc, False)
+                if SourceType == "FreeCAD":
+                    FillSpreadsheet_TB.Start("ImportFreeCAD", doc, False)
+            if USE_EXTERNAL_SOURCE is False:
+                FillSpreadsheet_TB.Start("FillSpreadsheet", doc, False)
+            if ENABLE_DEBUG is True:
+                Standard_Functions.Print("The titleblock spreadsheet has been updated!")
+
+        if ENABLE_RECOMPUTE_FILL_TITLEBLOCK is True:
+            FillTitleBlock_TB.FillTitleBlock(doc=doc, recompute=False)
+            if ENABLE_DEBUG is True:
+                Standard_Functions.Print(
+                    "The titleblock in all the pages has been updated!"
+                )
+    return
+
 
 # Add the observers
 
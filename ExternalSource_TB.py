@@ -0,0 +1,1209 @@
+# ***************************************************************************
+# *   Copyright (c) 2023 Paul Ebbers paul.ebbers@gmail.com                  *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+
+# Functions to read the data from an external source, like an Excel workbook or a FreeCAD file.
+# The data is read in a single pass and returned as rows with the cell values,
+# so the callers don't have to look up each cell separately.
+# The row data of the worksheets is cached in memory, so a source is only read again when it is changed on disk.
+# The row data is also stored in a cache file in the FreeCAD user data directory.
+# This way a source doesn't need to be read again in a new FreeCAD session, as long as its contents are unchanged.
+
+import os
+import marshal
+import hashlib
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import Spreadsheet_Functions_TB as Spreadsheet_Functions
+
+# The maximum number of worksheets to keep in the cache
+MAX_CACHED_SHEETS = 8
+
+# The version of the cache files. Increase this when the format changes.
+CACHE_FILE_VERSION = 3
+
+# The cached row data. The key is (path, modification time, size, [reader,] block).
+# A block is (sheet name, first row, last row, first column, last column).
+# The sheet names of a source are stored with None as block.
+_WorkbookCache = OrderedDict()
+
+# The external FreeCAD documents that are kept open (hidden), so they don't need to be opened for each fill.
+# The key is the path of the file. The value is [document, modification time, time of last use].
+_DocumentPool = {}
+
+# The timer to close the documents that are not used for a while
+_PoolTimer = None
+
+# Counters for the cache, to see how effective it is
+CacheStatistics = {"Hits": 0, "DiskHits": 0, "Misses": 0}
+
+
+def GetCacheDirectory() -> str:
+    """Returns the directory for the cache files"""
+    import FreeCAD as App
+
+    return os.path.join(App.getUserAppDataDir(), "TitleBlockWorkbench", "Cache")
+
+
+class CachedSource(ABC):
+    """Base class for an external source that reads its worksheets from the cache.
+    Supports source.sheetnames, source["SheetName"] and source.close(), like an openpyxl workbook.
+    A worksheet is returned as a CachedSheet. Only the blocks of rows and columns that are read from it are cached.
+    The cell values are returned as strings.
+    Subclasses implement _ReadSheetNames and _ReadSheet, and can implement _ReadBlock to read a block directly.
+    """
+
+    def __init__(self, FileName):
+        self.FileName = os.path.abspath(str(FileName))
+        # Raises an OSError if the file doesn't exist, like openpyxl would do.
+        Stat = os.stat(self.FileName)
+        self.Stamp = (self.FileName, Stat.st_mtime_ns, Stat.st_size)
+        # The contents of the cache file. Only read when something is not in memory.
+        self.DiskCache = None
+        # The complete worksheets that are read by _ReadBlock, so a worksheet is read only once per source.
+        self.SheetRows = {}
+
+    @abstractmethod
+    def _ReadSheetNames(self) -> list:
+        """Returns the names of the worksheets in the source"""
+
+    @abstractmethod
+    def _ReadSheet(self, SheetName: str) -> list:
+        """Returns the rows of a worksheet in the source"""
+
+    def _GetContentHash(self) -> str:
+        Hash = hashlib.sha1()
+        with open(self.FileName, "rb") as File:
+            for Chunk in iter(lambda: File.read(1024 * 1024), b""):
+                Hash.update(Chunk)
+        return Hash.hexdigest()
+
+    def _GetCacheFile(self) -> str:
+        Name = hashlib.sha1(self.FileName.encode("utf-8")).hexdigest()
+        # Sources that can be read in different ways, get a cache file for each way.
+        if len(self.Stamp) > 3:
+            Name = Name + "_" + "_".join(str(Item) for Item in self.Stamp[3:])
+        return os.path.join(GetCacheDirectory(), Name + ".cache")
+
+    def _LoadDiskCache(self) -> dict:
+        if self.DiskCache is not None:
+            return self.DiskCache
+
+        # The hash of the contents is only calculated when it is needed.
+        self.DiskCache = {"Hash": None, "Items": {}}
+        try:
+            with open(self._GetCacheFile(), "rb") as File:
+                Data = marshal.load(File)
+        except Exception:
+            # No cache file or an unreadable one. Start with an empty cache.
+            return self.DiskCache
+        if isinstance(Data, dict) is False or Data.get("Version") != CACHE_FILE_VERSION:
+            return self.DiskCache
+
+        # If the modification time and size of the source are unchanged, the cache file belongs to it.
+        if Data.get("Stamp") == self.Stamp[1:3]:
+            self.DiskCache = {"Hash": Data.get("Hash"), "Items": Data["Items"]}
+            return self.DiskCache
+
+        # Otherwise only use the cache file if it belongs to the current contents of the source.
+        # (e.g. the file is copied or saved again without changes)
+        self.DiskCache["Hash"] = self._GetContentHash()
+        if Data.get("Hash") == self.DiskCache["Hash"]:
+            self.DiskCache["Items"] = Data["Items"]
+        return self.DiskCache
+
+    def _SaveDiskCache(self):
+        if self.DiskCache["Hash"] is None:
+            self.DiskCache["Hash"] = self._GetContentHash()
+        Data = {
+            "Version": CACHE_FILE_VERSION,
+            "Path": self.FileName,
+            "Stamp": self.Stamp[1:3],
+            "Hash": self.DiskCache["Hash"],
+            "Items": self.DiskCache["Items"],
+        }
+        try:
+            Directory = GetCacheDirectory()
+            os.makedirs(Directory, exist_ok=True)
+            # Write to a temporary file first, so an interrupted write doesn't leave a broken cache file
+            Handle, TempName = tempfile.mkstemp(dir=Directory, suffix=".tmp")
+            with os.fdopen(Handle, "wb") as File:
+                marshal.dump(Data, File)
+            os.replace(TempName, self._GetCacheFile())
+        except Exception:
+            # The cache is only an optimization. Continue without it.
+            pass
+        return
+
+    def _Get(self, Block, Reader):
+        Key = self.Stamp + (Block,)
+        if Key in _WorkbookCache:
+            _WorkbookCache.move_to_end(Key)
+            CacheStatistics["Hits"] = CacheStatistics["Hits"] + 1
+            return _WorkbookCache[Key]
+
+        # Try the cache file. If the item is not there, read it from the source.
+        DiskCache = self._LoadDiskCache()
+        if Block in DiskCache["Items"]:
+            CacheStatistics["DiskHits"] = CacheStatistics["DiskHits"] + 1
+            Value = DiskCache["Items"][Block]
+        else:
+            CacheStatistics["Misses"] = CacheStatistics["Misses"] + 1
+            _Log(
+                f"Reading {self.FileName} ({Block}) from disk. "
+                + f"Cache hits: {CacheStatistics['Hits']}, from cache file: {CacheStatistics['DiskHits']}, "
+                + f"misses: {CacheStatistics['Misses']}"
+            )
+            Value = Reader()
+            # Some sources can't be cached. For example a FreeCAD spreadsheet in an older version of FreeCAD.
+            if isinstance(Value, (list, tuple)) is False:
+                return Value
+            DiskCache["Items"][Block] = Value
+            self._SaveDiskCache()
+
+        _WorkbookCache[Key] = Value
+        # Remove the least recently used items
+        while len(_WorkbookCache) > MAX_CACHED_SHEETS:
+            _WorkbookCache.popitem(last=False)
+        return Value
+
+    @property
+    def sheetnames(self) -> list:
+        return list(self._Get(None, lambda: tuple(self._ReadSheetNames())))
+
+    def __getitem__(self, SheetName: str):
+        return CachedSheet(self, str(SheetName))
+
+    def ReadBlock(
+        self,
+        SheetName: str,
+        MinRow: int,
+        MaxRow: int,
+        MinColumn: int,
+        MaxColumn: int = None,
+    ):
+        """Returns a block of rows of a worksheet, from the cache if possible.
+
+        Args:
+            SheetName (str): The name of the worksheet.\n
+            MinRow (int): The first row.\n
+            MaxRow (int): The last row.\n
+            MinColumn (int): The first column.\n
+            MaxColumn (int, optional): The last column. If None, the columns are read until the end of the row.
+            Defaults to None.\n
+
+        Returns:
+            list: A list of tuples with the cell values.
+        """
+        Block = (str(SheetName), MinRow, MaxRow, MinColumn, MaxColumn)
+        return self._Get(Block, lambda: self._ReadBlock(*Block))
+
+    def _ReadBlock(
+        self, SheetName: str, MinRow: int, MaxRow: int, MinColumn: int, MaxColumn: int
+    ):
+        # Read the complete worksheet once and take the block from it
+        if SheetName not in self.SheetRows:
+            self.SheetRows[SheetName] = self._ReadSheet(SheetName)
+        Rows = _IterRows(
+            self.SheetRows[SheetName], MinRow, MaxRow, MinColumn, MaxColumn
+        )
+        # A worksheet that can't be cached (a FreeCAD spreadsheet) is read lazily.
+        if isinstance(self.SheetRows[SheetName], list) is False:
+            return Rows
+        return list(Rows)
+
+    def close(self):
+        self.SheetRows = {}
+        return
+
+
+class CachedSheet:
+    """A worksheet of a CachedSource. Supports ws.iter_rows(), like an openpyxl worksheet.
+    The rows are only read when they are requested, so only the requested block is read and cached.
+    """
+
+    def __init__(self, Source: CachedSource, SheetName: str):
+        self.Source = Source
+        self.title = SheetName
+
+    def iter_rows(
+        self,
+        min_row: int = 1,
+        max_row: int = None,
+        min_col: int = 1,
+        max_col: int = None,
+        values_only: bool = True,
+    ):
+        # The rows are always returned as values
+        return iter(
+            self.Source.ReadBlock(self.title, min_row, max_row, min_col, max_col)
+        )
+
+
+class CachedWorkbook(CachedSource):
+    """An Excel workbook that reads its worksheets from the cache.
+    The workbook is only read when something is not in the cache.
+    The workbook is read with openpyxl, or with the direct reader when DIRECT_EXCEL_READER is enabled.
+    """
+
+    def __init__(self, FileName, Direct: bool = None):
+        super().__init__(FileName)
+        # The reader engine to use.
+        if Direct is None:
+            from Settings_TB import DIRECT_EXCEL_READER
+
+            Direct = DIRECT_EXCEL_READER
+        self.Direct = Direct
+        # Keep the results of the direct reader apart from the results of openpyxl.
+        if Direct is True:
+            self.Stamp = self.Stamp + ("Direct",)
+        # The openpyxl workbook.
+        self.Workbook = None
+
+    def _Load(self):
+        from openpyxl import load_workbook
+
+        if self.Workbook is None:
+            self.Workbook = load_workbook(self.FileName, read_only=True, data_only=True)
+        return self.Workbook
+
+    def _ReadSheetNames(self) -> list:
+        if self.Direct is True:
+            return list(GetXlsxSheets(self.FileName))
+        return self._Load().sheetnames
+
+    def _ReadSheet(self, SheetName: str) -> list:
+        if self.Direct is True:
+            return list(IterXlsxRows(self.FileName, SheetName))
+
+        Rows = []
+        for Row in self._Load()[SheetName].iter_rows(values_only=True):
+            Rows.append(tuple(None if Value is None else str(Value) for Value in Row))
+        return Rows
+
+    def _ReadBlock(
+        self, SheetName: str, MinRow: int, MaxRow: int, MinColumn: int, MaxColumn: int
+    ):
+        # Read only the requested block
+        if self.Direct is True:
+            return list(
+                IterXlsxRows(
+                    self.FileName, SheetName, MinRow, MinColumn, MaxColumn, MaxRow
+                )
+            )
+
+        Rows = []
+        for Row in self._Load()[SheetName].iter_rows(
+            min_row=MinRow,
+            max_row=MaxRow,
+            min_col=MinColumn,
+            max_col=MaxColumn,
+            values_only=True,
+        ):
+            Rows.append(tuple(None if Value is None else str(Value) for Value in Row))
+        return Rows
+
+    def close(self):
+        super().close()
+        if self.Workbook is not None:
+            self.Workbook.close()
+            self.Workbook = None
+        return
+
+
+class CachedDocument(CachedSource):
+    """A FreeCAD file that reads its spreadsheets from the cache.
+    The sheet names are the labels of the spreadsheets. The contents of the cells are returned,
+    like sheet.getContents() does, so strings can start with "'". Expressions are evaluated.
+    When something is not in the cache, the spreadsheets are read from the Document.xml in the file.
+    The document is only taken from the document pool when a spreadsheet has expressions,
+    or when the file cannot be read directly.
+    """
+
+    def __init__(self, FileName):
+        super().__init__(FileName)
+        # The FreeCAD document. It is taken from the document pool.
+        self.Document = None
+        # The spreadsheets, read from the Document.xml
+        self.Sheets = None
+
+    def _Load(self):
+        if self.Document is None:
+            self.Document = GetPooledDocument(self.FileName)
+        return self.Document
+
+    def _LoadXml(self) -> dict:
+        if self.Sheets is None:
+            try:
+                self.Sheets = ReadFCStdSheets(self.FileName)
+            except Exception as e:
+                # Not a readable FreeCAD file. Use the document instead.
+                self.Sheets = {}
+                _Log(f"Cannot read the spreadsheets of {self.FileName} directly: {e}")
+        return self.Sheets
+
+    def _ReadSheetNames(self) -> list:
+        Sheets = self._LoadXml()
+        if len(Sheets) > 0:
+            return [Sheet["Label"] for Sheet in Sheets.values()]
+        return [sheet.Label for sheet in self._Load().findObjects("Spreadsheet::Sheet")]
+
+    def _ReadSheet(self, SheetName: str) -> list:
+        # Get the spreadsheet by its label. If there is none, try its name.
+        Sheets = self._LoadXml()
+        Sheet = None
+        for Name, Item in Sheets.items():
+            if Item["Label"] == SheetName:
+                Sheet = Item
+                break
+        if Sheet is None:
+            Sheet = Sheets.get(SheetName)
+
+        # Expressions need the document to be evaluated. Without expressions, use the cells from the file.
+        if Sheet is not None:
+            for Contents in Sheet["Cells"].values():
+                if Contents.startswith("="):
+                    _Log(
+                        f"Spreadsheet {SheetName} of {self.FileName} has expressions. The document is opened."
+                    )
+                    break
+            else:
+                return _BuildRows(Sheet["Cells"])
+
+        doc = self._Load()
+        Sheets = [
+            sheet
+            for sheet in doc.findObjects("Spreadsheet::Sheet")
+            if sheet.Label == SheetName
+        ]
+        sheet = Sheets[0] if len(Sheets) > 0 else doc.getObject(SheetName)
+        if sheet is None:
+            raise KeyError(f"Spreadsheet {SheetName} does not exist.")
+        return ReadSheet(sheet)
+
+    def close(self):
+        super().close()
+        # The document stays open in the document pool, so it can be used again.
+        self.Document = None
+        return
+
+
+class CachedCsv(CachedSource):
+    """A CSV file that is read as a workbook with one worksheet.
+    The name of the worksheet is the name of the file, without the extension.
+    The delimiter (",", ";" or tab) is detected from the start of the file.
+    """
+
+    def _ReadSheetNames(self) -> list:
+        return [os.path.splitext(os.path.basename(self.FileName))[0]]
+
+    def _ReadSheet(self, SheetName: str) -> list:
+        import csv
+
+        if SheetName not in self._ReadSheetNames():
+            raise KeyError(f"Worksheet {SheetName} does not exist.")
+
+        # "utf-8-sig" removes the byte order mark that Excel adds to CSV files
+        with open(self.FileName, newline="", encoding="utf-8-sig") as File:
+            try:
+                Dialect = csv.Sniffer().sniff(File.read(64 * 1024), ",;\t|")
+            except csv.Error:
+                Dialect = csv.excel
+            File.seek(0)
+
+            Rows = []
+            for Row in csv.reader(File, Dialect):
+                Rows.append(tuple(Value if Value != "" else None for Value in Row))
+        return Rows
+
+
+class CachedJsonLines(CachedSource):
+    """A JSON Lines file that is read as a workbook with one worksheet.
+    Each line is an object. The keys of the objects are the header row, in the order they are found.
+    """
+
+    def _ReadSheetNames(self) -> list:
+        return [os.path.splitext(os.path.basename(self.FileName))[0]]
+
+    def _ReadSheet(self, SheetName: str) -> list:
+        import json
+
+        if SheetName not in self._ReadSheetNames():
+            raise KeyError(f"Worksheet {SheetName} does not exist.")
+
+        Header = {}
+        Records = []
+        with open(self.FileName, encoding="utf-8-sig") as File:
+            for Line in File:
+                Line = Line.strip()
+                if Line == "":
+                    continue
+                Record = json.loads(Line)
+                for Key in Record:
+                    Header.setdefault(Key, len(Header))
+                Records.append(Record)
+
+        Rows = [tuple(Header)]
+        for Record in Records:
+            Row = [None] * len(Header)
+            for Key, Value in Record.items():
+                if Value is None:
+                    continue
+                # Lists and objects are written as JSON text
+                if isinstance(Value, (list, dict)):
+                    Value = json.dumps(Value)
+                Row[Header[Key]] = str(Value)
+            Rows.append(tuple(Row))
+        return Rows
+
+
+class CachedSqlite(CachedSource):
+    """A SQLite database that is read as a workbook.
+    Each table or view is a worksheet. The column names are the header row.
+    """
+
+    def _Connect(self):
+        import sqlite3
+        import pathlib
+
+        # Open the database read-only, so the source is never changed
+        return sqlite3.connect(
+            pathlib.Path(self.FileName).as_uri() + "?mode=ro", uri=True
+        )
+
+    def _ReadSheetNames(self) -> list:
+        Connection = self._Connect()
+        try:
+            return [
+                Row[0]
+                for Row in Connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                    + "AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+                )
+            ]
+        finally:
+            Connection.close()
+
+    def _ReadSheet(self, SheetName: str) -> list:
+        if SheetName not in self._ReadSheetNames():
+            raise KeyError(f"Worksheet {SheetName} does not exist.")
+
+        Connection = self._Connect()
+        try:
+            Name = SheetName.replace('"', '""')
+            Cursor = Connection.execute(f'SELECT * FROM "{Name}"')
+            Rows = [tuple(Column[0] for Column in Cursor.description)]
+            for Row in Cursor:
+                Rows.append(
+                    tuple(None if Value is None else str(Value) for Value in Row)
+                )
+        finally:
+            Connection.close()
+        return Rows
+
+
+# The backends for the external sources. The key is the file extension in lower case.
+# "Type" is the set of commands that uses the source:
+# "Excel" for the table based sources and "FreeCAD" for FreeCAD documents.
+SourceBackends = {}
+
+
+def RegisterBackend(
+    Extensions: list, Backend, SourceType: str = "Excel", Description: str = ""
+):
+    """Register a backend for one or more file extensions.
+
+    Args:
+        Extensions (list): The file extensions, like [".csv"]. The case is only used for the file dialogs.\n
+        Backend (class): A subclass of CachedSource.\n
+        SourceType (str, optional): "Excel" or "FreeCAD". Defaults to "Excel".\n
+        Description (str, optional): The name of the file type for the file dialogs. Defaults to "".\n
+    """
+    for Extension in Extensions:
+        SourceBackends[Extension.lower()] = {
+            "Backend": Backend,
+            "Type": SourceType,
+            "Description": Description,
+            "Extension": Extension,
+        }
+    return
+
+
+RegisterBackend([".xlsx", ".xlsm"], CachedWorkbook, "Excel", "Excel")
+RegisterBackend([".csv"], CachedCsv, "Excel", "CSV")
+RegisterBackend([".jsonl"], CachedJsonLines, "Excel", "JSON Lines")
+RegisterBackend([".sqlite", ".sqlite3", ".db"], CachedSqlite, "Excel", "SQLite")
+RegisterBackend([".FCStd"], CachedDocument, "FreeCAD", "FreeCAD")
+
+
+def GetSourceType(FileName: str) -> str:
+    """Returns the type of an external source: "Excel" or "FreeCAD".
+    Files with an unknown extension are treated as Excel workbooks.
+    """
+    Extension = os.path.splitext(str(FileName))[1].lower()
+    if Extension in SourceBackends:
+        return SourceBackends[Extension]["Type"]
+    return "Excel"
+
+
+def GetFileFilter(SourceType: str = "Excel") -> list:
+    """Returns the filter for the file dialogs, with the extensions of all backends of a type.
+
+    Args:
+        SourceType (str, optional): "Excel" or "FreeCAD". Defaults to "Excel".\n
+
+    Returns:
+        list: A list of tuples, like [("Excel", "*.xlsx *.xlsm"), ("CSV", "*.csv")].
+    """
+    Filter = {}
+    for Item in SourceBackends.values():
+        if Item["Type"] == SourceType:
+            Filter.setdefault(Item["Description"], []).append("*" + Item["Extension"])
+    return [
+        (Description, " ".join(Patterns)) for Description, Patterns in Filter.items()
+    ]
+
+
+def OpenSource(FileName) -> CachedSource:
+    """Open an external source with the backend for its file extension.
+    The worksheets are read from the cache, if the file is not changed.
+
+    Args:
+        FileName (str): The path of the source.\n
+
+    Returns:
+        CachedSource: The source. Supports source.sheetnames, source["SheetName"] and source.close().
+    """
+    Extension = os.path.splitext(str(FileName))[1].lower()
+    if Extension not in SourceBackends:
+        raise ValueError(f"{FileName} is not a supported external source.")
+    return SourceBackends[Extension]["Backend"](FileName)
+
+
+def OpenWorkbook(FileName) -> CachedWorkbook:
+    """Open an Excel workbook. The worksheets are read from the cache, if the file is not changed.
+
+    Args:
+        FileName (str): The path of the workbook.\n
+
+    Returns:
+        CachedWorkbook: The workbook.
+    """
+    return CachedWorkbook(FileName)
+
+
+def OpenDocument(FileName) -> CachedDocument:
+    """Open a FreeCAD file as external source. The spreadsheets are read from the cache, if the file is not changed.
+
+    Args:
+        FileName (str): The path of the FreeCAD file.\n
+
+    Returns:
+        CachedDocument: The FreeCAD file.
+    """
+    return CachedDocument(FileName)
+
+
+def _IsOpen(doc) -> bool:
+    import FreeCAD as App
+
+    try:
+        return App.listDocuments().get(doc.Name) is doc
+    except Exception:
+        # The document is already deleted
+        return False
+
+
+def GetPooledDocument(FileName):
+    """Get an external FreeCAD document from the document pool.
+    The document is opened hidden and kept open, so it can be used again by the next fill.
+    If the file is changed on disk, the document is opened again.
+    Documents that are not used for EXTERNAL_DOCUMENT_TIMEOUT seconds are closed.
+
+    Args:
+        FileName (str): The path of the FreeCAD file.\n
+
+    Returns:
+        object: The FreeCAD document.
+    """
+    import FreeCAD as App
+
+    FileName = os.path.abspath(str(FileName))
+    Stamp = os.stat(FileName).st_mtime_ns
+
+    Entry = _DocumentPool.get(FileName)
+    if Entry is not None:
+        if _IsOpen(Entry[0]) is True and Entry[1] == Stamp:
+            Entry[2] = time.monotonic()
+            _StartPoolTimer()
+            return Entry[0]
+        # The file is changed or the document is closed. Remove it from the pool.
+        _CloseDocument(FileName)
+
+    # If the document is already opened by the user, use it. It is not added to the pool,
+    # because it is not closed by this workbench.
+    for doc in App.listDocuments().values():
+        if os.path.abspath(doc.FileName) == FileName:
+            return doc
+
+    doc = App.openDocument(FileName, True)
+    _DocumentPool[FileName] = [doc, Stamp, time.monotonic()]
+    _StartPoolTimer()
+    return doc
+
+
+def _CloseDocument(FileName: str):
+    import FreeCAD as App
+
+    Entry = _DocumentPool.pop(FileName, None)
+    if Entry is not None and _IsOpen(Entry[0]) is True:
+        App.closeDocument(Entry[0].Name)
+    return
+
+
+def ReleaseIdleDocuments(Timeout: int = None):
+    """Close the documents in the document pool that are not used for a while.
+
+    Args:
+        Timeout (int, optional): The time in seconds a document may be unused.
+        Defaults to EXTERNAL_DOCUMENT_TIMEOUT. Use 0 to close all the documents.\n
+    """
+    if Timeout is None:
+        from Settings_TB import EXTERNAL_DOCUMENT_TIMEOUT
+
+        Timeout = EXTERNAL_DOCUMENT_TIMEOUT
+
+    Now = time.monotonic()
+    for FileName in list(_DocumentPool):
+        if Now - _DocumentPool[FileName][2] >= Timeout:
+            _CloseDocument(FileName)
+
+    # If there are documents left, check again later
+    if len(_DocumentPool) > 0:
+        _StartPoolTimer()
+    return
+
+
+def _StartPoolTimer():
+    global _PoolTimer
+    from Settings_TB import EXTERNAL_DOCUMENT_TIMEOUT
+
+    # Without Qt, for example in console mode, the documents are kept until they are released.
+    try:
+        from PySide.QtCore import QTimer
+    except ImportError:
+        return
+
+    if _PoolTimer is None:
+        _PoolTimer = QTimer()
+        _PoolTimer.setSingleShot(True)
+        _PoolTimer.timeout.connect(ReleaseIdleDocuments)
+    _PoolTimer.start(max(EXTERNAL_DOCUMENT_TIMEOUT, 1) * 1000)
+    return
+
+
+def ClearCache(RemoveFiles: bool = False):
+    """Remove all the worksheets from the cache and reset the counters.
+
+    Args:
+        RemoveFiles (bool, optional): Remove the cache files as well. Defaults to False.\n
+    """
+    _WorkbookCache.clear()
+    for Counter in CacheStatistics:
+        CacheStatistics[Counter] = 0
+
+    if RemoveFiles is True:
+        Directory = GetCacheDirectory()
+        if os.path.isdir(Directory):
+            for Name in os.listdir(Directory):
+                if Name.endswith(".cache"):
+                    os.remove(os.path.join(Directory, Name))
+    return
+
+
+def ReadSheet(sheet) -> list:
+    """Read all the cells of a FreeCAD spreadsheet as rows, starting at A1.
+    Empty cells are returned as None. Expressions are evaluated.
+    Returns the spreadsheet itself, if this is not supported by this version of FreeCAD.
+    ReadRows can read from both.
+
+    Args:
+        sheet (object): FreeCAD spreadsheet.\n
+
+    Returns:
+        list: A list of tuples with the contents of the cells.
+    """
+    if hasattr(sheet, "getNonEmptyCells") is False:
+        return sheet
+
+    Cells = {}
+    for Address in sheet.getNonEmptyCells():
+        Contents = sheet.getContents(Address)
+        if Contents.startswith("="):
+            try:
+                Contents = str(sheet.get(Address))
+            except Exception:
+                # The expression has an error. Use the expression itself.
+                pass
+        Cells[Address] = Contents
+    return _BuildRows(Cells)
+
+
+def ReadFCStdSheets(FileName: str) -> dict:
+    """Read the spreadsheets from the Document.xml of a FreeCAD file, without opening the document.
+    The Document.xml is parsed incrementally. Only the labels and cells of the spreadsheets are kept.
+
+    Args:
+        FileName (str): The path of the FreeCAD file.\n
+
+    Returns:
+        dict: The spreadsheets by name, as {"Label": label, "Cells": {address: contents}}.
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+
+    # The names of the spreadsheets. These are listed before the data of the objects.
+    SheetNames = set()
+    Sheets = {}
+    # The spreadsheet and the property that is being read
+    Current = None
+    CurrentProperty = None
+    with zipfile.ZipFile(FileName) as Archive:
+        with Archive.open("Document.xml") as File:
+            for Event, Element in ET.iterparse(File, events=("start", "end")):
+                Tag = Element.tag
+                if Event == "start":
+                    if Tag == "Object":
+                        Name = Element.get("name")
+                        if Element.get("type") == "Spreadsheet::Sheet":
+                            SheetNames.add(Name)
+                        # In the object data, the type is not given. Use the list of spreadsheets.
+                        elif Element.get("type") is None and Name in SheetNames:
+                            Current = Sheets.setdefault(
+                                Name, {"Label": Name, "Cells": {}}
+                            )
+                    elif Tag == "Property" and Current is not None:
+                        CurrentProperty = Element.get("name")
+                    elif Current is not None:
+                        if Tag == "String" and CurrentProperty == "Label":
+                            Current["Label"] = Element.get("value", Current["Label"])
+                        elif Tag == "Cell" and CurrentProperty == "cells":
+                            Contents = Element.get("content", "")
+                            if Contents != "":
+                                Current["Cells"][Element.get("address")] = Contents
+                    continue
+
+                # End of an element
+                if Tag == "Object":
+                    Current = None
+                elif Tag == "Property":
+                    CurrentProperty = None
+                # Free the memory of the parsed elements
+                Element.clear()
+    return Sheets
+
+
+# The namespaces used in the xlsx files
+_XLSX_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_RELATIONSHIP = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+)
+_XLSX_PACKAGE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def GetXlsxSheets(FileName: str) -> dict:
+    """Get the worksheets of an xlsx file, without openpyxl.
+
+    Args:
+        FileName (str): The path of the workbook.\n
+
+    Returns:
+        dict: The path of the worksheet in the ZIP file by sheet name, in the order of the workbook.
+    """
+    import zipfile
+
+    with zipfile.ZipFile(FileName) as Archive:
+        return _ReadXlsxWorkbook(Archive)[0]
+
+
+def _ReadXlsxWorkbook(Archive) -> tuple:
+    # Get the worksheets and the epoch for the dates from an opened xlsx file
+    import posixpath
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.datetime import WINDOWS_EPOCH, MAC_EPOCH
+
+    Workbook = ET.fromstring(Archive.read("xl/workbook.xml"))
+    Relations = ET.fromstring(Archive.read("xl/_rels/workbook.xml.rels"))
+
+    # Get the targets of the relations. These are relative to the xl folder, or absolute.
+    Targets = {}
+    for Relation in Relations.iter(_XLSX_PACKAGE + "Relationship"):
+        Target = Relation.get("Target")
+        if Target.startswith("/"):
+            Target = Target[1:]
+        else:
+            Target = posixpath.normpath(posixpath.join("xl", Target))
+        Targets[Relation.get("Id")] = Target
+
+    Sheets = {}
+    for Sheet in Workbook.iter(_XLSX_MAIN + "sheet"):
+        Sheets[Sheet.get("name")] = Targets[Sheet.get(_XLSX_RELATIONSHIP)]
+
+    # Workbooks from Excel for Mac can count the dates from 1904
+    Epoch = WINDOWS_EPOCH
+    Properties = Workbook.find(_XLSX_MAIN + "workbookPr")
+    if Properties is not None and Properties.get("date1904", "").lower() in (
+        "1",
+        "true",
+    ):
+        Epoch = MAC_EPOCH
+    return Sheets, Epoch
+
+
+def _ReadXlsxStyles(Archive) -> tuple:
+    # Get the cell styles with a date format and the cell styles with a time interval format.
+    # The formats are checked with the functions of openpyxl, so dates are recognized in the same way.
+    import xml.etree.ElementTree as ET
+    from openpyxl.styles.numbers import (
+        builtin_format_code,
+        is_date_format,
+        is_timedelta_format,
+    )
+
+    DateStyles = set()
+    TimedeltaStyles = set()
+    if "xl/styles.xml" not in Archive.namelist():
+        return DateStyles, TimedeltaStyles
+    Styles = ET.fromstring(Archive.read("xl/styles.xml"))
+
+    # The custom number formats by their id
+    CustomFormats = {}
+    NumberFormats = Styles.find(_XLSX_MAIN + "numFmts")
+    if NumberFormats is not None:
+        for NumberFormat in NumberFormats.iter(_XLSX_MAIN + "numFmt"):
+            CustomFormats[int(NumberFormat.get("numFmtId"))] = NumberFormat.get(
+                "formatCode"
+            )
+
+    # The style of a cell is the index of its format in cellXfs
+    CellFormats = Styles.find(_XLSX_MAIN + "cellXfs")
+    if CellFormats is not None:
+        for Index, CellFormat in enumerate(CellFormats.findall(_XLSX_MAIN + "xf")):
+            FormatId = int(CellFormat.get("numFmtId", 0))
+            if FormatId in CustomFormats:
+                Format = CustomFormats[FormatId]
+            else:
+                Format = builtin_format_code(FormatId)
+            if is_date_format(Format):
+                DateStyles.add(Index)
+            if is_timedelta_format(Format):
+                TimedeltaStyles.add(Index)
+    return DateStyles, TimedeltaStyles
+
+
+def _GetXlsxText(Element) -> str:
+    # Get the text of a shared or inline string. Phonetic runs (rPh) are skipped.
+    Text = ""
+    for Child in Element:
+        if Child.tag == _XLSX_MAIN + "t":
+            Text = Text + (Child.text or "")
+        elif Child.tag == _XLSX_MAIN + "r":
+            for Run in Child.iter(_XLSX_MAIN + "t"):
+                Text = Text + (Run.text or "")
+    return Text
+
+
+def _GetXlsxValue(
+    Type: str,
+    Value: str,
+    SharedStrings: list,
+    Epoch=None,
+    Timedelta: bool = False,
+):
+    # Convert the value of a cell to a string, like str() of the value from openpyxl.
+    # If an epoch is given, the cell has a date format and its number is converted to a date.
+    if Type == "s":
+        return SharedStrings[int(Value)]
+    if Type == "b":
+        return str(Value == "1")
+    if Type in ("str", "e"):
+        return Value
+    # Formulas that are never calculated have an empty value
+    if Value == "":
+        return None
+    # Dates can also be stored as ISO 8601 text
+    if Type == "d":
+        from openpyxl.utils.datetime import from_ISO8601
+
+        return str(from_ISO8601(Value))
+
+    # Numbers are stored as text. Convert them like openpyxl does, so 3 stays 3 and 1.50 becomes 1.5
+    if "." in Value or "E" in Value or "e" in Value:
+        Number = float(Value)
+    else:
+        Number = int(Value)
+    if Epoch is None:
+        return str(Number)
+
+    from openpyxl.utils.datetime import from_excel
+
+    try:
+        return str(from_excel(Number, Epoch, timedelta=Timedelta))
+    except (OverflowError, ValueError):
+        # The number is outside the limits for dates. openpyxl treats it as an error.
+        return "#VALUE!"
+
+
+def IterXlsxRows(
+    FileName: str,
+    SheetName: str,
+    MinRow: int = 1,
+    MinColumn: int = 1,
+    MaxColumn: int = None,
+    MaxRow: int = None,
+):
+    """Read the rows of a worksheet in an xlsx file, without openpyxl.
+    The shared strings and the worksheet are parsed directly from the ZIP file with iterparse.
+    The values are returned as strings, like ReadRows does. Empty cells are returned as None.
+    Numbers with a date format are returned as dates, like openpyxl does.
+
+    Args:
+        FileName (str): The path of the workbook.\n
+        SheetName (str): The name of the worksheet.\n
+        MinRow (int, optional): The first row to return. Defaults to 1.\n
+        MinColumn (int, optional): The first column to return. Defaults to 1.\n
+        MaxColumn (int, optional): The last column to return. Defaults to None for all columns.\n
+        MaxRow (int, optional): The last row to return. The rest of the worksheet is not parsed.
+        Defaults to None for all rows.\n
+
+    Yields:
+        tuple: The values of a row, from MinColumn to MaxColumn.
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+
+    with zipfile.ZipFile(FileName) as Archive:
+        Sheets, Epoch = _ReadXlsxWorkbook(Archive)
+        if SheetName not in Sheets:
+            raise KeyError(f"Worksheet {SheetName} does not exist.")
+        DateStyles, TimedeltaStyles = _ReadXlsxStyles(Archive)
+
+        # Read the shared strings. Not every workbook has them.
+        SharedStrings = []
+        if "xl/sharedStrings.xml" in Archive.namelist():
+            with Archive.open("xl/sharedStrings.xml") as File:
+                for Event, Element in ET.iterparse(File):
+                    if Element.tag == _XLSX_MAIN + "si":
+                        SharedStrings.append(_GetXlsxText(Element))
+                        Element.clear()
+
+        with Archive.open(Sheets[SheetName]) as File:
+            RowNumber = 0
+            for Event, Element in ET.iterparse(File):
+                if Element.tag != _XLSX_MAIN + "row":
+                    continue
+
+                # Rows without cells can be left out of the file. Return them as empty rows.
+                Number = int(Element.get("r", RowNumber + 1))
+                if MaxRow is not None:
+                    Number = min(Number, MaxRow + 1)
+                while RowNumber + 1 < Number:
+                    RowNumber = RowNumber + 1
+                    if RowNumber >= MinRow:
+                        yield ()
+                RowNumber = Number
+                # Stop after the last requested row
+                if MaxRow is not None and RowNumber > MaxRow:
+                    return
+
+                if RowNumber >= MinRow:
+                    Values = []
+                    ColumnNumber = 0
+                    for Cell in Element.iter(_XLSX_MAIN + "c"):
+                        Address = Cell.get("r")
+                        if Address is None:
+                            ColumnNumber = ColumnNumber + 1
+                        else:
+                            ColumnNumber = Spreadsheet_Functions.SplitCellAddress(
+                                Address
+                            )[0]
+                        if ColumnNumber < MinColumn:
+                            continue
+                        if MaxColumn is not None and ColumnNumber > MaxColumn:
+                            break
+
+                        Type = Cell.get("t", "n")
+                        if Type == "inlineStr":
+                            InlineString = Cell.find(_XLSX_MAIN + "is")
+                            Value = (
+                                None
+                                if InlineString is None
+                                else _GetXlsxText(InlineString)
+                            )
+                        else:
+                            Value = Cell.findtext(_XLSX_MAIN + "v")
+                            if Value is not None:
+                                Style = int(Cell.get("s") or 0)
+                                Value = _GetXlsxValue(
+                                    Type,
+                                    Value,
+                                    SharedStrings,
+                                    Epoch if Style in DateStyles else None,
+                                    Style in TimedeltaStyles,
+                                )
+
+                        # Cells without a value can be left out of the file. Add them as empty cells.
+                        Index = ColumnNumber - MinColumn
+                        if len(Values) < Index:
+                            Values.extend([None] * (Index - len(Values)))
+                        Values.append(Value)
+                    yield tuple(Values)
+                # Free the memory of the parsed row
+                Element.clear()
+    return
+
+
+def _BuildRows(Cells: dict) -> list:
+    # Create rows from a dict with the contents by cell address, starting at A1
+    Grid = {}
+    NoRows = 0
+    NoColumns = 0
+    for Address, Contents in Cells.items():
+        Column, Row = Spreadsheet_Functions.SplitCellAddress(Address)
+        Grid[(Row, Column)] = Contents
+        NoRows = max(NoRows, Row)
+        NoColumns = max(NoColumns, Column)
+
+    Rows = []
+    for Row in range(1, NoRows + 1):
+        Rows.append(
+            tuple(Grid.get((Row, Column)) or None for Column in range(1, NoColumns + 1))
+        )
+    return Rows
+
+
+def _Log(Text: str):
+    from Settings_TB import ENABLE_DEBUG
+
+    if ENABLE_DEBUG is True:
+        import FreeCAD as App
+        import Standard_Functions_TB as Standard_Functions
+
+        Standard_Functions.Print(App.Qt.translate("TitleBlock Workbench", Text), "Log")
+    return
+
+
+def _IterRows(ws, MinRow: int, MaxRow: int, MinColumn: int, MaxColumn: int = None):
+    # A cached worksheet is a list of rows
+    if isinstance(ws, list):
+        for Row in ws[MinRow - 1 : MaxRow]:
+            if MaxColumn is None:
+                yield Row[MinColumn - 1 :]
+            else:
+                yield Row[MinColumn - 1 : MaxColumn]
+        return
+
+    # A FreeCAD spreadsheet that could not be cached. Read it cell by cell.
+    # The rows are read one at a time, so the reading stops when ReadRows stops.
+    if hasattr(ws, "getContents"):
+        import Standard_Functions_TB as Standard_Functions
+
+        for Row in range(MinRow, MaxRow + 1):
+            Values = []
+            Column = MinColumn
+            while MaxColumn is None or Column <= MaxColumn:
+                Value = ws.getContents(
+                    Standard_Functions.GetLetterFromNumber(Column) + str(Row)
+                )
+                # Without a last column, stop at the first empty cell
+                if MaxColumn is None and Value == "":
+                    break
+                Values.append(Value or None)
+                Column = Column + 1
+            yield tuple(Values)
+        return
+
+    # Otherwise it is an openpyxl worksheet or a CachedSheet
+    for Row in ws.iter_rows(
+        min_row=MinRow,
+        max_row=MaxRow,
+        min_col=MinColumn,
+        max_col=MaxColumn,
+        values_only=True,
+    ):
+        yield Row
+
+
+def ReadRows(
+    ws,
+    StartCell: str = "A1",
+    NoColumns: int = 0,
+    MaxRows: int = 1000,
+    StopAtEmpty: bool = True,
+) -> list:
+    """Read the rows of an Excel worksheet in a single pass, starting at the start cell.
+    The values are returned as strings. Empty cells are returned as None.
+
+    Args:
+        ws (object): The openpyxl worksheet or a worksheet from a CachedWorkbook.\n
+        StartCell (str, optional): The top left cell of the table. Defaults to "A1".\n
+        NoColumns (int, optional): The number of columns to read. If 0, the columns are read
+        until the first empty cell in the header row. Defaults to 0.\n
+        MaxRows (int, optional): The maximum number of rows to read below the header. Defaults to 1000.\n
+        StopAtEmpty (bool, optional): Stop at the first row below the header with an empty first cell.
+        Defaults to True.\n
+
+    Returns:
+        list: A list of tuples with the cell values. The first tuple is the header row.
+    """
+    StartColumn, StartRow = Spreadsheet_Functions.SplitCellAddress(StartCell)
+
+    # If the number of columns is not given, get it from the header row
+    if NoColumns == 0:
+        NoColumns = 1
+        for HeaderRow in _IterRows(ws, StartRow, StartRow, StartColumn + 1):
+            for Value in HeaderRow:
+                if Value is None:
+                    break
+                NoColumns = NoColumns + 1
+
+    Rows = []
+    for Row in _IterRows(
+        ws, StartRow, StartRow + MaxRows, StartColumn, StartColumn + NoColumns - 1
+    ):
+        # Convert the values to strings and make sure every row has the same length
+        Row = tuple(None if Value is None else str(Value) for Value in Row)
+        if len(Row) < NoColumns:
+            Row = Row + (None,) * (NoColumns - len(Row))
+
+        # If the first cell is empty, you reached the end of the data.
+        if StopAtEmpty is True and len(Rows) > 0 and Row[0] is None:
+            break
+        Rows.append(Row)
+
+    # Always return a header row, even if the worksheet is empty
+    if len(Rows) == 0:
+        Rows.append((None,) * NoColumns)
+    return Rows
@@ -41,7 +41,10 @@ import os
 import FreeCAD as App
 import Standard_Functions_TB as Standard_Functions
 import TableFormat_Functions_TB
+import Spreadsheet_Functions_TB as Spreadsheet_Functions
+import ExternalSource_TB as ExternalSource
 import DrawingList_Functions_TB
+import FillTransaction_TB as FillTransaction
 
 # Get the settings
 from Settings_TB import DRAW_NO_FIELD
@@ -75,6 +78,7 @@ from Settings_TB import USE_SIMPLE_LIST
 from Settings_TB import USE_EXTERNAL_SOURCE_SIMPLE_LIST
 from Settings_TB import USE_ADVANCED_LIST
 from Settings_TB import EXTERNAL_FILE_ADVANCED_LIST
+from Settings_TB import INCREMENTAL_FILL_SPREADSHEET
 
 # endregion
 
@@ -130,10 +134,15 @@ if str(DRAW_NO_FIELD).startswith("'"):
 #   3. Mark the cell in column C if this value needs to be increased per page
 
 
-def AddExtraData(sheet, StartRow, doc=None):
+def AddExtraData(sheet, StartRow, doc=None, Writer=None):
     if doc is None:
         doc = App.ActiveDocument
 
+    # Without a writer, write the cells at the end of this function
+    Flush = Writer is None
+    if Writer is None:
+        Writer = Spreadsheet_Functions.CellWriter(sheet)
+
     # If the debug mode is active, show which property is includex.difference(y)
     if ENABLE_DEBUG is True:
         Text = ""
@@ -156,335 +165,170 @@ def AddExtraData(sheet, StartRow, doc=None):
                 "Number of pages is included: " + str(INCLUDE_NO_SHEETS),
             )
         Standard_Functions.Print(Text, "Log")
-    # get units scheme
-    SchemeNumber = App.Units.getSchema()
+    # Add the extra data below the table
+    for PropertyName, Value in GetExtraData(doc).items():
+        Writer.set("A" + str(StartRow + 1), PropertyName)
+        Writer.set("B" + str(StartRow + 1), Value)
+        StartRow = StartRow + 1
+    if Flush is True:
+        Writer.Flush()
+    return
+
 
+# Get the extra system data as a dict with property name -> value
+def GetExtraData(doc=None) -> dict:
+    if doc is None:
+        doc = App.ActiveDocument
+
+    result = {}
     # Add the length units of your FreeCAD application
     if INCLUDE_LENGTH is True:
-        sheet.set("A" + str(StartRow + 1), "Length_Units")
-        sheet.set(
-            "B" + str(StartRow + 1),
-            str(
-                App.Units.schemaTranslate(
-                    App.Units.Quantity(50, App.Units.Length), SchemeNumber
-                )
-            )
-            .split()[1]
-            .replace("'", "")
-            .replace(",", ""),
-        )
-        StartRow = StartRow + 1
+        result["Length_Units"] = GetUnitLabel("Length")
 
     # Add the angular units of your FreeCAD application
     if INCLUDE_ANGLE is True:
-        sheet.set("A" + str(StartRow + 1), "Angle_Units")
-        sheet.set(
-            "B" + str(StartRow + 1),
-            str(
-                App.Units.schemaTranslate(
-                    App.Units.Quantity(50, App.Units.Angle), SchemeNumber
-                )
-            )
-            .split()[1]
-            .replace("'", "")
-            .replace(",", ""),
-        )
-        StartRow = StartRow + 1
+        result["Angle_Units"] = GetUnitLabel("Angle")
 
     # Add the mass units of your FreeCAD application
     if INCLUDE_MASS is True:
-        sheet.set("A" + str(StartRow + 1), "Mass_Units")
-        sheet.set(
-            "B" + str(StartRow + 1),
-            str(
-                App.Units.schemaTranslate(
-                    App.Units.Quantity(50, App.Units.Mass), SchemeNumber
-                )
-            )
-            .split()[1]
-            .replace("'", "")
-            .replace(",", ""),
-        )
-        StartRow = StartRow + 1
+        result["Mass_Units"] = GetUnitLabel("Mass")
 
     # Add the total number of sheets. You can use this for your title block
     if INCLUDE_NO_SHEETS is True:
-        # Get all the pages
-        pages = App.ActiveDocument.findObjects("TechDraw::DrawPage")
-        # Create the Property and add the value
-        sheet.set("A" + str(StartRow + 1), "Number of sheets")
-        sheet.set("B" + str(StartRow + 1), str(len(pages)))
-    return
+        result["Number of sheets"] = str(len(doc.findObjects("TechDraw::DrawPage")))
+    return result
 
 
-# Map data from the system and/or document to the spreadsheet
-def MapData(sheet, doc=None):
-    if doc is None:
-        doc = App.ActiveDocument
-
-    # Get the filename
-    filename = os.path.basename(doc.FileName).split(".")[0]
-    pages = doc.findObjects("TechDraw::DrawPage")
-    # get the fist page.
-    pagename = ""
-    pages = App.ActiveDocument.findObjects("TechDraw::DrawPage")
-    if len(pages) > 0:
-        pagename = pages[0].Label
+# The cached unit labels and the unit schema they belong to
+_UnitLabelCache = {"Schema": None, "Labels": {}}
 
-    # if the debug mode is on, show what is mapped to which property
-    if ENABLE_DEBUG is True:
-        Text = ""
-        if str(MAP_LENGTH).strip():
-            Text = translate(
-                "TitleBlock Workbench", "Length unit is mapped to: " + str(MAP_LENGTH)
-            )
-        if str(MAP_ANGLE).strip():
-            Text = translate(
-                "TitleBlock Workbench", "Angle unit is mapped to: " + str(MAP_ANGLE)
-            )
-        if str(MAP_MASS).strip():
-            Text = translate(
-                "TitleBlock Workbench", "Mass unit is mapped to: " + str(MAP_MASS)
-            )
-        if str(MAP_NOSHEETS).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "the number of pages is mapped to: " + str(MAP_NOSHEETS),
-            )
-        if USE_FILENAME_DRAW_NO is True:
-            Text = translate(
-                "TitleBlock Workbench",
-                "The filename ("
-                + str(filename)
-                + ") is mapped to: "
-                + str(DRAW_NO_FIELD),
-            )
-        if USE_PAGENAME_DRAW_NO is True:
-            Text = translate(
-                "TitleBlock Workbench",
-                "The pagenames will be mapped to: " + str(DRAW_NO_FIELD_PAGE),
-            )
-        Standard_Functions.Print(Text, "Log")
 
-    # get units scheme
+# Get the unit label for the current unit schema. For example "mm" for "Length".
+# The labels are cached until the unit schema changes.
+def GetUnitLabel(UnitName: str) -> str:
+    # get units scheme. If it is changed, clear the cache
     SchemeNumber = App.Units.getSchema()
+    if _UnitLabelCache["Schema"] != SchemeNumber:
+        _UnitLabelCache["Schema"] = SchemeNumber
+        _UnitLabelCache["Labels"] = {}
+
+    Label = _UnitLabelCache["Labels"].get(UnitName)
+    if Label is None:
+        Unit = getattr(App.Units, UnitName)
+        Label = (
+            str(App.Units.schemaTranslate(App.Units.Quantity(50, Unit), SchemeNumber))
+            .split()[1]
+            .replace("'", "")
+            .replace(",", "")
+        )
+        _UnitLabelCache["Labels"][UnitName] = Label
+    return Label
 
-    # Go through the column A in the spreadsheet and find the properties.
-    for RowNum in range(1000):
-        # Start with x+1 first, to make sure that x is at least 1.
-        RowNum = RowNum + 2
-
-        # Get the property name. If it starts with ' remove it.
-        PropertyName = str(sheet.getContents("A" + str(RowNum)))
-        if PropertyName.startswith("'"):
-            PropertyName = PropertyName[1:]
-
-        # Map length units of your FreeCAD application
-        # Map only as requested
-        if str(MAP_LENGTH).strip():
-            # If the cell in column A is equal to MAP_LENGTH, add the value in column B
-            if PropertyName == MAP_LENGTH:
-                sheet.set(
-                    "B" + str(RowNum),
-                    str(
-                        App.Units.schemaTranslate(
-                            App.Units.Quantity(50, App.Units.Length), SchemeNumber
-                        )
-                    )
-                    .split()[1]
-                    .replace("'", "")
-                    .replace(",", ""),
-                )
-
-        # Map angle units of your FreeCAD application
-        # Map only as requested
-        if str(MAP_ANGLE).strip():
-            # If the cell in column A is equal to MAP_ANGLE, add the value in column B
-            if PropertyName == MAP_ANGLE:
-                sheet.set(
-                    "B" + str(RowNum),
-                    str(
-                        App.Units.schemaTranslate(
-                            App.Units.Quantity(50, App.Units.Angle), SchemeNumber
-                        )
-                    )
-                    .split()[1]
-                    .replace("'", "")
-                    .replace(",", ""),
-                )
 
-        # Map mass units of your FreeCAD application
-        # Map only as requested
-        if str(MAP_MASS).strip():
-            # If the cell in column A is equal to MAP_MASS, add the value in column B
-            if PropertyName == MAP_MASS:
-                sheet.set(
-                    "B" + str(RowNum),
-                    str(
-                        App.Units.schemaTranslate(
-                            App.Units.Quantity(50, App.Units.Mass), SchemeNumber
-                        )
-                    )
-                    .split()[1]
-                    .replace("'", "")
-                    .replace(",", ""),
-                )
+# The providers for the values of the system data and document information.
+# Each provider gets the document and returns the value for column B, or None if nothing must be mapped.
+def _GetFileName(doc):
+    return os.path.basename(doc.FileName).split(".")[0]
 
-        # Map the number of pages
-        # Map only as requested
-        if str(MAP_NOSHEETS).strip():
-            # Get all the pages
-            pages = App.ActiveDocument.findObjects("TechDraw::DrawPage")
-            # If the cell in column A is equal to MAP_NOSHEETS, add the value in column B
-            if PropertyName == MAP_NOSHEETS:
-                sheet.set("B" + str(RowNum), str(len(pages)))
-
-        # Map the filename
-        # Map only as requested
-        if USE_FILENAME_DRAW_NO is True:
-            if str(DRAW_NO_FIELD).strip():
-                # If the cell in column A is equal to DRAW_NO_FIELD, add the value in column B
-                if PropertyName == DRAW_NO_FIELD:
-                    sheet.set("B" + str(RowNum), filename)
-
-        # Map the pagename
-        # Map only as requested
-        if USE_PAGENAME_DRAW_NO is True:
-            if str(DRAW_NO_FIELD_PAGE).strip() and pagename != "":
-                # If the cell in column A is equal to DRAW_NO_FIELD, add the value in column B
-                if PropertyName == DRAW_NO_FIELD_PAGE:
-                    sheet.set("B" + str(RowNum), pagename)
-                    sheet.set(
-                        "E" + str(RowNum),
-                        "The name of each page will be mapped to its titleblock",
-                    )
 
-        # Check if the next row exits. If not this is the end of all the available values.
-        try:
-            sheet.getContents("A" + str(RowNum + 1))
-        except Exception:
-            return
+def _GetNumberOfPages(doc):
+    return str(len(doc.findObjects("TechDraw::DrawPage")))
 
 
-# Map document information
-def MapDocInfo(sheet, doc=None):
+def _GetFirstPageName(doc):
+    pages = doc.findObjects("TechDraw::DrawPage")
+    if len(pages) > 0 and pages[0].Label != "":
+        return pages[0].Label
+    return None
+
+
+# Create the table with the property name -> (value provider, remark) once.
+# Only the settings that are filled in are added. When a property name is used more than once,
+# the last one wins. The document information is added after the system data.
+PropertyProviders = {}
+if str(MAP_LENGTH).strip():
+    PropertyProviders[MAP_LENGTH] = (lambda doc: GetUnitLabel("Length"), None)
+if str(MAP_ANGLE).strip():
+    PropertyProviders[MAP_ANGLE] = (lambda doc: GetUnitLabel("Angle"), None)
+if str(MAP_MASS).strip():
+    PropertyProviders[MAP_MASS] = (lambda doc: GetUnitLabel("Mass"), None)
+if str(MAP_NOSHEETS).strip():
+    PropertyProviders[MAP_NOSHEETS] = (_GetNumberOfPages, None)
+if USE_FILENAME_DRAW_NO is True and str(DRAW_NO_FIELD).strip():
+    PropertyProviders[DRAW_NO_FIELD] = (_GetFileName, None)
+if USE_PAGENAME_DRAW_NO is True and str(DRAW_NO_FIELD_PAGE).strip():
+    PropertyProviders[DRAW_NO_FIELD_PAGE] = (
+        _GetFirstPageName,
+        "The name of each page will be mapped to its titleblock",
+    )
+if str(DOCINFO_NAME).strip():
+    PropertyProviders[DOCINFO_NAME] = (lambda doc: doc.Name, None)
+if str(DOCINFO_CREATEDBY).strip():
+    PropertyProviders[DOCINFO_CREATEDBY] = (lambda doc: doc.CreatedBy, None)
+if str(DOCINFO_CREATEDDATE).strip():
+    PropertyProviders[DOCINFO_CREATEDDATE] = (
+        lambda doc: doc.CreationDate.split("T")[0],
+        None,
+    )
+if str(DOCINFO_LASTMODIFIEDBY).strip():
+    PropertyProviders[DOCINFO_LASTMODIFIEDBY] = (lambda doc: doc.LastModifiedBy, None)
+if str(DOCINFO_LASTMODIFIEDDATE).strip():
+    PropertyProviders[DOCINFO_LASTMODIFIEDDATE] = (
+        lambda doc: doc.LastModifiedDate.split("T")[0],
+        None,
+    )
+if str(DOCINFO_COMPANY).strip():
+    PropertyProviders[DOCINFO_COMPANY] = (lambda doc: doc.Company, None)
+if str(DOCINFO_LICENSE).strip():
+    PropertyProviders[DOCINFO_LICENSE] = (lambda doc: doc.License, None)
+if str(DOCINFO_LICENSEURL).strip():
+    PropertyProviders[DOCINFO_LICENSEURL] = (lambda doc: doc.LicenseURL, None)
+if str(DOCINFO_COMMENT).strip():
+    PropertyProviders[DOCINFO_COMMENT] = (lambda doc: doc.Comment, None)
+
+
+# Map data from the system and the document information to the spreadsheet
+def MapProperties(sheet, doc=None, Writer=None):
     if doc is None:
         doc = App.ActiveDocument
 
-    # if the debug mode is on, show what is mapped to which property
-    if ENABLE_DEBUG is True:
-        Text = ""
-        if str(DOCINFO_NAME).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Document name is mapped to:  " + str(DOCINFO_NAME),
-            )
-        if str(DOCINFO_CREATEDBY).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Created by value is mapped to:  " + str(DOCINFO_CREATEDBY),
-            )
-        if str(DOCINFO_CREATEDDATE).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Created date is mapped to:  " + str(DOCINFO_CREATEDDATE),
-            )
-        if str(DOCINFO_LASTMODIFIEDBY).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Last modified by value is mapped to:  " + str(DOCINFO_LASTMODIFIEDBY),
-            )
-        if str(DOCINFO_LASTMODIFIEDDATE).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Last modified date is mapped to:  " + str(DOCINFO_LASTMODIFIEDDATE),
-            )
-        if str(DOCINFO_COMPANY).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "Company name is mapped to:  " + str(DOCINFO_COMPANY),
-            )
-        if str(DOCINFO_LICENSE).strip():
-            Text = translate(
-                "TitleBlock Workbench",
-                "License name is mapped to:  " + str(DOCINFO_LICENSE),
-            )
-        if str(DOCINFO_LICENSEURL).strip():
+    # Nothing to map
+    if len(PropertyProviders) == 0:
+        return
+
+    # Read column A once and create an index with the property name -> rows
+    # With a writer, the index includes the cells that are not written yet.
+    Flush = Writer is None
+    if Writer is None:
+        Writer = Spreadsheet_Functions.CellWriter(sheet)
+        RowIndex = Spreadsheet_Functions.GetPropertyRowIndex(sheet)
+    else:
+        RowIndex = Spreadsheet_Functions.BuildPropertyRowIndex(Writer)[0]
+
+    # Go through the mapped properties and write only the rows that match.
+    for PropertyName, (Provider, Remark) in PropertyProviders.items():
+        Rows = RowIndex.get(PropertyName)
+        if Rows is None:
+            continue
+        Value = Provider(doc)
+        if Value is None:
+            continue
+
+        # if the debug mode is on, show what is mapped to which property
+        if ENABLE_DEBUG is True:
             Text = translate(
                 "TitleBlock Workbench",
-                "License link is mapped to:  " + str(DOCINFO_LICENSEURL),
-            )
-        if str(DOCINFO_COMMENT).strip():
-            Text = translate(
-                "TitleBlock Workbench", "Comment is mapped to:  " + str(DOCINFO_COMMENT)
+                f"{Value} is mapped to: {PropertyName}",
             )
-        Standard_Functions.Print(Text, "Log")
+            Standard_Functions.Print(Text, "Log")
 
-    # Go through the column A in the spreadsheet and find the properties.
-    for RowNum in range(1000):
-        # Start with x+1 first, to make sure that x is at least 1.
-        RowNum = RowNum + 2
-
-        # Get the property name. If it starts with ' remove it.
-        PropertyName = str(sheet.getContents("A" + str(RowNum)))
-        if PropertyName.startswith("'"):
-            PropertyName = PropertyName[1:]
-
-        # DOCINFO_NAME
-        if str(DOCINFO_NAME).strip():
-            # If the cell in column A is equal to # DOCINFO_NAME, add the value in column B
-            if PropertyName == DOCINFO_NAME:
-                sheet.set("B" + str(RowNum), doc.Name)
-
-        # DOCINFO_CREATEDBY
-        if str(DOCINFO_CREATEDBY).strip():
-            # If the cell in column A is equal to # DOCINFO_CREATEDBY, add the value in column B
-            if PropertyName == DOCINFO_CREATEDBY:
-                sheet.set("B" + str(RowNum), doc.CreatedBy)
-
-        # DOCINFO_CREATEDDATE
-        if str(DOCINFO_CREATEDDATE).strip():
-            # If the cell in column A is equal to # DOCINFO_CREATEDDATE, add the value in column B
-            if PropertyName == DOCINFO_CREATEDDATE:
-                CreationDate = doc.CreationDate.split("T")[0]
-                sheet.set("B" + str(RowNum), CreationDate)
-
-        # DOCINFO_LASTMODIFIEDBY
-        if str(DOCINFO_LASTMODIFIEDBY).strip():
-            # If the cell in column A is equal to # DOCINFO_LASTMODIFIEDBY, add the value in column B
-            if PropertyName == DOCINFO_LASTMODIFIEDBY:
-                sheet.set("B" + str(RowNum), doc.LastModifiedBy)
-
-        # DOCINFO_LASTMODIFIEDDATE
-        if str(DOCINFO_LASTMODIFIEDDATE).strip():
-            # If the cell in column A is equal to # DOCINFO_LASTMODIFIEDDATE, add the value in column B
-            if PropertyName == DOCINFO_LASTMODIFIEDDATE:
-                ModificationDate = doc.LastModifiedDate.split("T")[0]
-                sheet.set("B" + str(RowNum), ModificationDate)
-
-        # DOCINFO_COMPANY
-        if str(DOCINFO_COMPANY).strip():
-            # If the cell in column A is equal to # DOCINFO_COMPANY, add the value in column B
-            if PropertyName == DOCINFO_COMPANY:
-                sheet.set("B" + str(RowNum), doc.Company)
-
-        # DOCINFO_LICENSE
-        if str(DOCINFO_LICENSE).strip():
-            # If the cell in column A is equal to # DOCINFO_LICENSE, add the value in column B
-            if PropertyName == DOCINFO_LICENSE:
-                sheet.set("B" + str(RowNum), doc.License)
-
-        # DOCINFO_LICENSEURL
-        if str(DOCINFO_LICENSEURL).strip():
-            # If the cell in column A is equal to # DOCINFO_LICENSEURL, add the value in column B
-            if PropertyName == DOCINFO_LICENSEURL:
-                sheet.set("B" + str(RowNum), doc.LicenseURL)
-
-        # DOCINFO_COMMENT
-        if str(DOCINFO_COMMENT).strip():
-            # If the cell in column A is equal to # DOCINFO_COMMENT, add the value in column B
-            if PropertyName == DOCINFO_COMMENT:
-                sheet.set("B" + str(RowNum), doc.Comment)
+        # Compare with the spreadsheet, so an unchanged value is not written again
+        for RowNum in Rows:
+            Writer.Update("B" + str(RowNum), Value)
+            if Remark is not None:
+                Writer.Update("E" + str(RowNum), Remark)
+    if Flush is True:
+        Writer.Flush()
     return
 
 
@@ -508,8 +352,17 @@ def FillSheet(doc=None, recompute: bool = True) -> bool:
         texts = page.Template.EditableTexts
         # get the spreadsheet "TitleBlock"
         sheet = doc.getObject("TitleBlock")
-        # Clear the sheet
-        sheet.clearAll()
+
+        # If the spreadsheet already has a titleblock table, only update the changes
+        if (
+            INCREMENTAL_FILL_SPREADSHEET is True
+            and sheet.getContents("A1") == "Property Name"
+        ):
+            UpdateSheet(doc=doc, sheet=sheet, texts=texts, recompute=recompute)
+            return True
+
+        # Collect all the cells. When the table is written, the spreadsheet is cleared or rewritten.
+        Writer = Spreadsheet_Functions.CellWriter(sheet, Cleared=True)
 
         # Debug mode is active, show all editable text in the page
         if ENABLE_DEBUG is True:
@@ -523,11 +376,11 @@ def FillSheet(doc=None, recompute: bool = True) -> bool:
                 Standard_Functions.Print(Text, "Log")
 
         # set the headers in the spreadsheet
-        sheet.set("A1", "Property Name")
-        sheet.set("B1", "Property Value")
-        sheet.set("C1", "Increase value")
-        sheet.set("D1", "Factor")
-        sheet.set("E1", "Remarks")
+        Writer.set("A1", "Property Name")
+        Writer.set("B1", "Property Value")
+        Writer.set("C1", "Increase value")
+        Writer.set("D1", "Factor")
+        Writer.set("E1", "Remarks")
 
         # set the start value for the start row.
         # (x=0, the spreadsheet whill be populated from the first row. the headers will be overwritten)
@@ -536,27 +389,20 @@ def FillSheet(doc=None, recompute: bool = True) -> bool:
             # Increase StartRow by one, to fill the next row
             StartRow = StartRow + 1
             # Fill the property name
-            sheet.set("A" + str(StartRow), "{0}".format(key, value))
+            Writer.set("A" + str(StartRow), "{0}".format(key, value))
             # Fill the property value
-            sheet.set("B" + str(StartRow), "{1}".format(key, value))
+            Writer.set("B" + str(StartRow), "{1}".format(key, value))
             # If there is no value yet, the increase function will be set empty by default.
             try:
                 str(sheet.getContents("C" + str(StartRow)))
             except Exception:
-                sheet.set("C" + str(StartRow), "")
-
-        # Finally recompute the document
-        if recompute is True:
-            doc.recompute(None, True, True)
-
-        # Run the def to map system data
-        MapData(sheet=sheet)
+                Writer.set("C" + str(StartRow), "")
 
-        # Run the def to map document information
-        MapDocInfo(sheet=sheet)
+        # Run the def to map system data and document information
+        MapProperties(sheet=sheet, doc=doc, Writer=Writer)
 
         # Run the def to add extra system data
-        AddExtraData(sheet, StartRow)
+        AddExtraData(sheet, StartRow, Writer=Writer)
 
         extraRows = 0
         if INCLUDE_LENGTH is True:
@@ -598,19 +444,22 @@ def FillSheet(doc=None, recompute: bool = True) -> bool:
             f"{FirstColumn}{FirstTableRow}:{FirstColumn}{int(StartRow) + extraRows}"
         )
 
-        # Format the table
-        sheet = TableFormat_Functions_TB.FormatTable(
-            sheet=sheet,
+        # Write the table and format it
+        NoCells = TableFormat_Functions_TB.WriteTable(
+            Writer=Writer,
             HeaderRange=HeaderRange,
             TableRange=TableRange,
             FirstColumnRange=FirstColumnRange,
         )
+        if ENABLE_DEBUG is True:
+            Text = translate("TitleBlock Workbench", f"{NoCells} cells are written")
+            Standard_Functions.Print(Text, "Log")
 
         # endregion
 
         # Finally recompute the document
         if recompute is True:
-            doc.recompute(None, True, True)
+            FillTransaction.Recompute(doc)
     except Exception as e:
         Text = "TitleBlock Workbench: an error occurred!!\n"
         if ENABLE_DEBUG is True:
@@ -628,9 +477,79 @@ def FillSheet(doc=None, recompute: bool = True) -> bool:
     return result
 
 
-# Import data from a (central) excel workbook
+# The remark for properties that are no longer present in the template
+REMARK_REMOVED = "Not present in the template"
+
+
+# Update the spreadsheet with the changes in the titleblock, instead of creating it again.
+# New properties are added, removed properties are marked and only changed values are written.
+# Values that are bound to an expression (starting with "=") are preserved.
+def UpdateSheet(doc, sheet, texts: dict, recompute: bool = True) -> int:
+    # Read the current table once
+    Rows = Spreadsheet_Functions.GetTitleBlockSnapshot(sheet)
+    ExistingRows = {}
+    for Row in Rows:
+        Name = Row.Name
+        if Name.startswith("'"):
+            Name = Name[1:]
+        ExistingRows.setdefault(Name, Row)
+
+    # The properties that must be in the table: the editable texts and the extra system data
+    Properties = dict(texts)
+    Properties.update(GetExtraData(doc))
+
+    Writer = Spreadsheet_Functions.CellWriter(sheet)
+    NewRows = []
+    LastRow = Rows[-1].Row if len(Rows) > 0 else 1
+    for PropertyName, Value in Properties.items():
+        Value = str(Value)
+        Row = ExistingRows.get(PropertyName)
+        # Add new properties at the end of the table
+        if Row is None:
+            LastRow = LastRow + 1
+            Writer.set("A" + str(LastRow), PropertyName)
+            Writer.set("B" + str(LastRow), Value)
+            NewRows.append(LastRow)
+            continue
+        # Update the value if it is changed and not bound to an expression
+        if Row.Value.startswith("=") is False and Row.Value != Value:
+            Writer.set("B" + str(Row.Row), Value)
+        # If the property was marked as removed before, remove the mark
+        if Row.Remarks == REMARK_REMOVED:
+            Writer.set("E" + str(Row.Row), "")
+
+    # Mark the properties that are no longer present
+    for PropertyName, Row in ExistingRows.items():
+        if PropertyName not in Properties and Row.Remarks != REMARK_REMOVED:
+            Writer.set("E" + str(Row.Row), REMARK_REMOVED)
+
+    # Map system data and document information
+    MapProperties(sheet=sheet, doc=doc, Writer=Writer)
+
+    NoCells = Writer.Flush()
+
+    # Format only the new rows
+    if len(NewRows) > 0:
+        TableFormat_Functions_TB.FormatTableRows(
+            sheet=sheet, Rows=NewRows, TableRange=f"A2:E{LastRow}"
+        )
+
+    if NoCells > 0 or len(NewRows) > 0:
+        FillTransaction.MarkDirty(sheet)
+        if recompute is True:
+            FillTransaction.Recompute(doc)
+
+    if ENABLE_DEBUG is True:
+        Text = translate(
+            "TitleBlock Workbench",
+            f"Spreadsheet updated: {NoCells} cells are written, {len(NewRows)} properties are added",
+        )
+        Standard_Functions.Print(Text, "Log")
+    return NoCells
+
+
+# Import data from a (central) excel workbook, or another table based source (CSV, JSON Lines, SQLite)
 def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
-    from openpyxl import load_workbook
 
     result = False
     # Check if it is allowed to use an external source and if so, continue
@@ -643,19 +562,15 @@ def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
         # try to open the source. if not show an messagebox and if debug mode is enabled, show the exeption as well
         try:
             wb = ""
-            if EXTERNAL_SOURCE_PATH.lower().endswith(".fcstd"):
-                Filter = [
-                    ("Excel", "*.xlsx"),
-                ]
+            if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) == "FreeCAD":
+                Filter = ExternalSource.GetFileFilter("Excel")
                 FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
                 if FileName != "":
-                    wb = load_workbook(FileName, read_only=True, data_only=True)
+                    wb = ExternalSource.OpenSource(FileName)
                 if FileName == "":
                     return
             else:
-                wb = load_workbook(
-                    str(EXTERNAL_SOURCE_PATH), read_only=True, data_only=True
-                )
+                wb = ExternalSource.OpenSource(str(EXTERNAL_SOURCE_PATH))
             if EXTERNAL_SOURCE_SHEET_NAME == "":
                 # Set the sheetname with a inputbox
                 Worksheets_List = [i for i in wb.sheetnames if i != "Settings"]
@@ -735,8 +650,8 @@ def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
                 doc = App.ActiveDocument
             # get the spreadsheet "TitleBlock"
             sheet = doc.getObject("TitleBlock")
-            # Clear the sheet
-            sheet.clearAll()
+            # Collect all the cells. When the table is written, the spreadsheet is cleared or rewritten.
+            Writer = Spreadsheet_Functions.CellWriter(sheet, Cleared=True)
 
             # Get the startcolumn and the other three columns from there
             StartCell = EXTERNAL_SOURCE_STARTCELL
@@ -785,18 +700,6 @@ def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
                     ),
                     "Log",
                 )
-            Column2 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumn) + 1), True
-            )
-            Column3 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumn) + 2), True
-            )
-            Column4 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumn) + 3), True
-            )
-            Column5 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumn) + 4), True
-            )
 
             # Get the start row
             StartRow = Standard_Functions.RemoveLettersFromString(
@@ -810,68 +713,48 @@ def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
                 )
                 Standard_Functions.Print(Text, "Log")
 
+            # Read the five columns of the table in one go, until the cell in the first column is empty.
+            Rows = ExternalSource.ReadRows(
+                ws, StartColumn + str(StartRow), NoColumns=5, MaxRows=1000
+            )
+
             # import the headers from the excelsheet into the spreadsheet
-            sheet.set("A1", str(ws[str(StartColumn) + str(StartRow)].value))
-            sheet.set("B1", str(ws[str(Column2) + str(StartRow)].value))
-            sheet.set("C1", str(ws[str(Column3) + str(StartRow)].value))
-            sheet.set("D1", str(ws[str(Column4) + str(StartRow)].value))
-            sheet.set("E1", str(ws[str(Column5) + str(StartRow)].value))
-
-            # Go through the excel until the cell in the first column is empty.
-            for i in range(1000):
-                # Define the start row. This is the Header row +1 + i as counter
-                RowNumber = int(StartRow) + i + 1
-
-                # check if you reached the end of the data.
-                if ws[str(StartColumn) + str(RowNumber)].value is None:
-                    break
-
-                # Get the number of row difference between the start row in the excelsheet
-                # and the first row in the spreadsheet.
-                # This to start at second row in the spreadsheet. (under the headers)
-                Delta = int(StartRow) - 1
+            Writer.set("A1", str(Rows[0][0] or ""))
+            Writer.set("B1", str(Rows[0][1] or ""))
+            Writer.set("C1", str(Rows[0][2] or ""))
+            Writer.set("D1", str(Rows[0][3] or ""))
+            Writer.set("E1", str(Rows[0][4] or ""))
+
+            # Go through the rows below the headers.
+            # Start at second row in the spreadsheet. (under the headers)
+            RowNumber = int(StartRow)
+            for i in range(1, len(Rows)):
+                Row = Rows[i]
+                # Define the row number in the excel sheet. This is the Header row + i as counter
+                RowNumber = int(StartRow) + i
 
                 # Fill the property name
-                sheet.set(
-                    str("A" + str(RowNumber - Delta)),
-                    str(ws[str(StartColumn) + str(RowNumber)].value),
-                )
+                Writer.set("A" + str(i + 1), Row[0] or "")
                 # Fill the property value
-                if ws[Column2 + str(RowNumber)].value is not None:
-                    sheet.set(
-                        str("B" + str(RowNumber - Delta)),
-                        str(ws[Column2 + str(RowNumber)].value),
-                    )
+                if Row[1] is not None:
+                    Writer.set("B" + str(i + 1), Row[1])
                 # Fill the value for auto increasement(yes or no)
-                if ws[Column3 + str(RowNumber)].value is not None:
-                    sheet.set(
-                        str("C" + str(RowNumber - Delta)),
-                        str(ws[Column3 + str(RowNumber)].value),
-                    )
+                if Row[2] is not None:
+                    Writer.set("C" + str(i + 1), Row[2])
                 # Fill the multipliers
-                if ws[Column4 + str(RowNumber)].value is not None:
-                    sheet.set(
-                        str("D" + str(RowNumber - Delta)),
-                        str(ws[Column4 + str(RowNumber)].value),
-                    )
+                if Row[3] is not None:
+                    Writer.set("D" + str(i + 1), Row[3])
                 # Fill the remarks
-                if ws[Column5 + str(RowNumber)].value is not None:
-                    sheet.set(
-                        str("E" + str(RowNumber - Delta)),
-                        str(ws[Column4 + str(RowNumber)].value),
-                    )
-
-            # Finally recompute the spreadsheet
-            sheet.recompute()
+                if Row[4] is not None:
+                    Writer.set("E" + str(i + 1), Row[4])
+            # The row after the last row with data
+            RowNumber = RowNumber + 1
 
-            # Run the def to add extra system data.
-            MapData(sheet=sheet)
-
-            # Run the def to add document information
-            MapDocInfo(sheet=sheet)
+            # Run the def to map system data and document information
+            MapProperties(sheet=sheet, doc=doc, Writer=Writer)
 
             # Run the def to add extra system data. This is the final value of "RowNumber" minus the "StartRow".
-            AddExtraData(sheet, RowNumber - int(StartRow))
+            AddExtraData(sheet, RowNumber - int(StartRow), Writer=Writer)
 
             # Include extra data
             extraRows = 0
@@ -914,20 +797,23 @@ def ImportDataExcel(doc=None, recompute: bool = True) -> bool:
                 f"{FirstColumn}{FirstTableRow}:{FirstColumn}{int(RowNumber) + extraRows}"
             )
 
-            # Format the table
-            sheet = TableFormat_Functions_TB.FormatTable(
-                sheet=sheet,
+            # Write the table and format it
+            NoCells = TableFormat_Functions_TB.WriteTable(
+                Writer=Writer,
                 HeaderRange=HeaderRange,
                 TableRange=TableRange,
                 FirstColumnRange=FirstColumnRange,
             )
+            if ENABLE_DEBUG is True:
+                Text = translate("TitleBlock Workbench", f"{NoCells} cells are written")
+                Standard_Functions.Print(Text, "Log")
 
             # endregion
 
             # Finally recompute the spreadsheet
-            sheet.recompute()
+            FillTransaction.MarkDirty(sheet)
             if recompute is True:
-                doc.recompute(None, True, True)
+                FillTransaction.Recompute(doc)
 
         except Exception as e:
             Text = translate(
@@ -969,8 +855,8 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
             Input_SheetName = EXTERNAL_SOURCE_SHEET_NAME
             # get the spreadsheet "TitleBlock"
             sheet = doc.getObject("TitleBlock")
-            # Clear the sheet
-            sheet.clearAll()
+            # Collect all the cells. When the table is written, the spreadsheet is cleared or rewritten.
+            Writer = Spreadsheet_Functions.CellWriter(sheet, Cleared=True)
             # Save the name of the active document to reactivate it at the end of this function.
             LastActiveDoc = doc.Name
             # Define the External sheet and document
@@ -979,22 +865,20 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
 
             # try to open the source. if not show an messagebox and if debug mode is enabled, show the exeption as well
             try:
-                if EXTERNAL_SOURCE_PATH.lower().endswith(".xlsx"):
-                    Filter = [
-                        ("FreeCAD", "*.FCStd"),
-                    ]
+                if ExternalSource.GetSourceType(EXTERNAL_SOURCE_PATH) == "Excel":
+                    Filter = ExternalSource.GetFileFilter("FreeCAD")
                     FileName = Standard_Functions.GetFileDialog(
                         files=Filter, SaveAs=False
                     )
                     if FileName != "":
-                        ff = App.openDocument(FileName, True)
+                        ff = ExternalSource.OpenDocument(FileName)
                     if FileName == "":
                         return
                 else:
-                    ff = App.openDocument(EXTERNAL_SOURCE_PATH, True)
+                    ff = ExternalSource.OpenDocument(EXTERNAL_SOURCE_PATH)
                 if EXTERNAL_SOURCE_SHEET_NAME == "":
                     # Set the sheetname with a inputbox
-                    Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                    Spreadsheet_List = ff.sheetnames
                     Text = translate(
                         "TitleBlock Workbench",
                         "Please enter the name of the spreadsheet",
@@ -1012,20 +896,20 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
                     if not Input_SheetName.strip():
                         return
 
-                    ExtSheet = ff.getObject(Input_SheetName)
+                    ExtSheet = ff[Input_SheetName]
                 if EXTERNAL_SOURCE_SHEET_NAME != "":
                     # Get the list of worksheets
-                    Spreadsheet_List = ff.findObjects("Spreadsheet::Sheet")
+                    Spreadsheet_List = ff.sheetnames
                     # Assume that the worksheet doesn't exits
                     SpreadsheetExits = False
                     # Go through the names of the worksheets
                     for Spreadsheet in Spreadsheet_List:
                         # If a name matches the sheetname in preferences, set WorksheetsExits to True
-                        if Spreadsheet.Label == EXTERNAL_SOURCE_SHEET_NAME:
-                            SpreadsheetExits is True
+                        if Spreadsheet == EXTERNAL_SOURCE_SHEET_NAME:
+                            SpreadsheetExits = True
                     # If WorksheetsExits is true, define the worksheet
                     if SpreadsheetExits is True:
-                        ExtSheet = ff.getObject(Input_SheetName)
+                        ExtSheet = ff[Input_SheetName]
                     # If WorksheetsExits is false, ask the user to enter the correct name.
                     if SpreadsheetExits is False:
                         # Set the sheetname with a inputbox
@@ -1046,7 +930,7 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
                         if not Input_SheetName.strip():
                             return
                         # Define the worksheets
-                        ExtSheet = ff.getObject(Input_SheetName)
+                        ExtSheet = ff[Input_SheetName]
                         # Set EXTERNAL_SOURCE_SHEET_NAME to the chosen sheetname
                         preferences.SetString("SheetName", Input_SheetName)
             except Exception as e:
@@ -1066,7 +950,7 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
             if EXTERNAL_SOURCE_SHEET_NAME == "":
                 # Set EXTERNAL_SOURCE_SHEET_NAME to the chosen sheetname
                 preferences.SetString("SheetName", Input_SheetName)
-                ExtSheet = ff.getObject(Input_SheetName)
+                ExtSheet = ff[Input_SheetName]
                 # Set the startcell with an inputbox
                 Text = translate(
                     "TitleBlock Workbench",
@@ -1108,18 +992,6 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
                     ),
                     "Log",
                 )
-            Column2 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumnExt) + 1), True
-            )
-            Column3 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumnExt) + 2), True
-            )
-            Column4 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumnExt) + 3), True
-            )
-            Column5 = Standard_Functions.GetLetterFromNumber(
-                int(Standard_Functions.GetNumberFromLetter(StartColumnExt) + 4), True
-            )
 
             # Get the start row
             StartRow = Standard_Functions.RemoveLettersFromString(
@@ -1133,73 +1005,48 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
                 )
                 Standard_Functions.Print(Text, "Log")
 
-            # import the headers from the excelsheet into the spreadsheet
-            sheet.set(
-                "A1", str(ExtSheet.getContents(str(StartColumnExt) + str(StartRow)))
+            # Read the five columns of the table in one go, until the cell in the first column is empty.
+            Rows = ExternalSource.ReadRows(
+                ExtSheet, StartColumnExt + str(StartRow), NoColumns=5, MaxRows=1000
             )
-            sheet.set("B1", str(ExtSheet.getContents(str(Column2) + str(StartRow))))
-            sheet.set("C1", str(ExtSheet.getContents(str(Column3) + str(StartRow))))
-            sheet.set("D1", str(ExtSheet.getContents(str(Column4) + str(StartRow))))
-            sheet.set("E1", str(ExtSheet.getContents(str(Column5) + str(StartRow))))
-
-            # Go through the excel until the cell in the first column is empty.
-            RowNumber = 1
-            for i in range(1000):
-                # Define the start row. This is the Header row +1 + i as counter
-                RowNumber = int(StartRow) + i + 1
-
-                # check if you reached the end of the data.
-                test = ExtSheet.getContents(str(StartColumnExt) + str(RowNumber))
-                if test == "" or test is None:
-                    break
-
-                # Get the number of row difference between the start row in the excelsheet
-                # and the first row in the spreadsheet.
-                # This to start at second row in the spreadsheet. (under the headers)
-                Delta = int(StartRow) - 1
+
+            # import the headers from the external spreadsheet into the spreadsheet
+            Writer.set("A1", str(Rows[0][0] or ""))
+            Writer.set("B1", str(Rows[0][1] or ""))
+            Writer.set("C1", str(Rows[0][2] or ""))
+            Writer.set("D1", str(Rows[0][3] or ""))
+            Writer.set("E1", str(Rows[0][4] or ""))
+
+            # Go through the rows below the headers.
+            # Start at second row in the spreadsheet. (under the headers)
+            RowNumber = int(StartRow)
+            for i in range(1, len(Rows)):
+                Row = Rows[i]
+                # Define the row number in the external spreadsheet. This is the Header row + i as counter
+                RowNumber = int(StartRow) + i
 
                 # Fill the property name
-                sheet.set(
-                    str("A" + str(RowNumber - Delta)),
-                    str(ExtSheet.getContents(str(StartColumnExt) + str(RowNumber))),
-                )
+                Writer.set("A" + str(i + 1), Row[0] or "")
                 # Fill the property value
-                if ExtSheet.getContents(Column2 + str(RowNumber)) is not None:
-                    sheet.set(
-                        str("B" + str(RowNumber - Delta)),
-                        str(ExtSheet.getContents(Column2 + str(RowNumber))),
-                    )
+                if Row[1] is not None:
+                    Writer.set("B" + str(i + 1), Row[1])
                 # Fill the value for auto increasement(yes or no)
-                if ExtSheet.getContents(Column3 + str(RowNumber)) is not None:
-                    sheet.set(
-                        str("C" + str(RowNumber - Delta)),
-                        str(ExtSheet.getContents(Column3 + str(RowNumber))),
-                    )
+                if Row[2] is not None:
+                    Writer.set("C" + str(i + 1), Row[2])
                 # Fill the multipliers
-                if ExtSheet.getContents(Column4 + str(RowNumber)) is not None:
-                    sheet.set(
-                        str("D" + str(RowNumber - Delta)),
-                        str(ExtSheet.getContents(Column4 + str(RowNumber))),
-                    )
+                if Row[3] is not None:
+                    Writer.set("D" + str(i + 1), Row[3])
                 # Fill the remarks
-                if ExtSheet.getContents(Column5 + str(RowNumber)) is not None:
-                    sheet.set(
-                        str("E" + str(RowNumber - Delta)),
-                        str(ExtSheet.getContents(Column4 + str(RowNumber))),
-                    )
-
-            # Finally recompute the document
-            if recompute is True:
-                doc.recompute(None, True, True)
+                if Row[4] is not None:
+                    Writer.set("E" + str(i + 1), Row[4])
+            # The row after the last row with data
+            RowNumber = RowNumber + 1
 
-            # Run the def to add extra system data.
-            MapData(sheet=sheet, doc=doc)
-
-            # Run the def to add document information
-            MapDocInfo(sheet=sheet, doc=doc)
+            # Run the def to map system data and document information
+            MapProperties(sheet=sheet, doc=doc, Writer=Writer)
 
             # Run the def to add extra system data. This is the final value of "RowNumber" minus the "StartRow".
-            AddExtraData(sheet, RowNumber - int(StartRow), doc)
+            AddExtraData(sheet, RowNumber - int(StartRow), doc, Writer=Writer)
 
             # Include extra data
             extraRows = 0
@@ -1242,23 +1089,26 @@ def ImportDataFreeCAD(doc=None, recompute: bool = True):
                 f"{FirstColumn}{FirstTableRow}:{FirstColumn}{int(RowNumber) + extraRows-1}"
             )
 
-            # Format the table
-            sheet = TableFormat_Functions_TB.FormatTable(
-                sheet=sheet,
+            # Write the table and format it
+            NoCells = TableFormat_Functions_TB.WriteTable(
+                Writer=Writer,
                 HeaderRange=HeaderRange,
                 TableRange=TableRange,
                 FirstColumnRange=FirstColumnRange,
             )
+            if ENABLE_DEBUG is True:
+                Text = translate("TitleBlock Workbench", f"{NoCells} cells are written")
+                Standard_Functions.Print(Text, "Log")
 
             # endregion
 
             # recompute the document
             if recompute is True:
-                doc.recompute(None, True, True)
+                FillTransaction.Recompute(doc)
             # Save the workbook
-            doc.save()
+            FillTransaction.Save(doc)
             # Close the FreeCAD file
-            App.closeDocument(ff.Name)
+            ff.close()
             # Activate the document which was active when this command started.
             try:
                 App.setActiveDocument(LastActiveDoc)
@@ -1289,43 +1139,47 @@ def Start(command, doc=None, recompute: bool = True) -> bool:
     result = False
     if doc is None:
         doc = App.ActiveDocument
-    try:
-        sheet = doc.getObject("TitleBlock")
-        # check if the result is not empty
-        if sheet is not None:
-            # Proceed with the macro.
-            if command == "FillSpreadsheet":
-                result = FillSheet(doc=doc, recompute=recompute)
-            if command == "ImportExcel":
-                result = ImportDataExcel(doc=doc, recompute=recompute)
-            if command == "ImportFreeCAD":
-                result = ImportDataFreeCAD(doc=doc, recompute=recompute)
-
-            # if the debug mode is on, report presense of titleblock spreadsheet
-            if ENABLE_DEBUG is True:
-                Text = translate("TitleBlock Workbench", "TitleBlock already present")
-                Standard_Functions.Print(Text, "Log")
-
-            return result
-        # if the result is empty, create a new titleblock spreadsheet
-        if sheet is None:
-            sheet = App.ActiveDocument.addObject("Spreadsheet::Sheet", "TitleBlock")
-
-            # Proceed with the macro.
-            if command == "FillSpreadsheet":
-                result = FillSheet(doc=doc, recompute=recompute)
-            if command == "ImportExcel":
-                result = ImportDataExcel(doc=doc, recompute=recompute)
-            if command == "ImportFreeCAD":
-                result = ImportDataFreeCAD(doc=doc, recompute=recompute)
+    # Run the command in one transaction. The document is recomputed and saved once at the end.
+    with FillTransaction.FillTransaction(doc, recompute=recompute):
+        try:
+            sheet = doc.getObject("TitleBlock")
+            # check if the result is not empty
+            if sheet is not None:
+                # Proceed with the macro.
+                if command == "FillSpreadsheet":
+                    result = FillSheet(doc=doc, recompute=recompute)
+                if command == "ImportExcel":
+                    result = ImportDataExcel(doc=doc, recompute=recompute)
+                if command == "ImportFreeCAD":
+                    result = ImportDataFreeCAD(doc=doc, recompute=recompute)
+
+                # if the debug mode is on, report presense of titleblock spreadsheet
+                if ENABLE_DEBUG is True:
+                    Text = translate(
+                        "TitleBlock Workbench", "TitleBlock already present"
+                    )
+                    Standard_Functions.Print(Text, "Log")
+
+                return result
+            # if the result is empty, create a new titleblock spreadsheet
+            if sheet is None:
+                sheet = App.ActiveDocument.addObject("Spreadsheet::Sheet", "TitleBlock")
+
+                # Proceed with the macro.
+                if command == "FillSpreadsheet":
+                    result = FillSheet(doc=doc, recompute=recompute)
+                if command == "ImportExcel":
+                    result = ImportDataExcel(doc=doc, recompute=recompute)
+                if command == "ImportFreeCAD":
+                    result = ImportDataFreeCAD(doc=doc, recompute=recompute)
+
+                # if the debug mode is on, report creation of titleblock spreadsheet
+                if ENABLE_DEBUG is True:
+                    Text = translate("TitleBlock Workbench", "TitleBlock created")
+                    Standard_Functions.Print(Text, "Log")
 
-            # if the debug mode is on, report creation of titleblock spreadsheet
+                return result
+        except Exception as e:
             if ENABLE_DEBUG is True:
-                Text = translate("TitleBlock Workbench", "TitleBlock created")
-                Standard_Functions.Print(Text, "Log")
-
-            return result
-    except Exception as e:
-        if ENABLE_DEBUG is True:
-            raise e
+                raise e
     return result
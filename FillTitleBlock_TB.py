@@ -32,20 +32,188 @@
 #  - Import data from excel or libre office
 #  - Etc.
 
+from typing import NamedTuple
 import FreeCAD as App
 import Standard_Functions_TB as Standard_Functions
+import Spreadsheet_Functions_TB as Spreadsheet_Functions
 import DrawingList_Functions_TB
+import ExternalSource_TB as ExternalSource
+import FillTransaction_TB as FillTransaction
+import TechDraw_Functions_TB as TechDraw_Functions
 
 # Define the translation
 translate = App.Qt.translate
 
 
-def FillTitleBlock(doc=None, recompute: bool = True) -> bool:
+# The kinds of rules in a fill plan
+RULE_CONSTANT = "constant"
+RULE_PAGE_COUNTER = "page-counter"
+RULE_PAGE_LABEL = "page-label"
+RULE_SHEET_COUNT = "sheet-count"
+RULE_SKIP = "skip"
+
+
+class FillRule(NamedTuple):
+    """A rule how to fill one editable text. Created by CompileFillPlan."""
+
+    Kind: str
+    Field: str
+    Value: str = ""
+    Start: int = 0
+    Factor: int = 1
+
+
+def CompileFillPlan(Rows) -> list:
+    """Compile the rows of the titleblock spreadsheet into a fill plan.
+    All the conditions are checked once here. The plan is applied to each page with ApplyFillPlan.
+
+    Args:
+        Rows (tuple): The rows from Spreadsheet_Functions.GetTitleBlockSnapshot.\n
+
+    Returns:
+        list: A list of FillRule.
+    """
     from Settings_TB import ENABLE_DEBUG
     from Settings_TB import MAP_NOSHEETS
     from Settings_TB import USE_PAGENAME_DRAW_NO
     from Settings_TB import DRAW_NO_FIELD_PAGE
     from Settings_TB import DRAW_NO_FIELD
+
+    # define the name of the field for the number of sheets. if it starts with ', remove it.
+    NoSheetsField = MAP_NOSHEETS
+    if NoSheetsField[:1] == "'":
+        NoSheetsField = NoSheetsField[1:]
+
+    Plan = []
+    for Row in Rows:
+        # Get the name of the editable field. if it starts with ', remove it.
+        textField = Row.Name
+        if textField[:1] == "'":
+            textField = textField[1:]
+
+        # Option??? -------------------------------------------------------------------------------
+        # # If the use of a drawing list is enabled and the property name is equal to the textfield
+        # # Skip this text
+        # if (USE_SIMPLE_LIST is True and PROPERTY_NAME_SIMPLE_LIST == textField):
+        #     Plan.append(FillRule(RULE_SKIP, textField))
+        # if (USE_ADVANCED_LIST is True and PROPERTY_NAME_ADVANCED_LIST == textField):
+        #     Plan.append(FillRule(RULE_SKIP, textField))
+        # -----------------------------------------------------------------------------------------
+
+        # If there is no value in column B, leave the editable text as it is.
+        if not Row.Value.strip():
+            Plan.append(FillRule(RULE_SKIP, textField))
+            continue
+
+        # if the value in B is not a number, just fill in
+        if Row.Value.isnumeric() is False:
+            if USE_PAGENAME_DRAW_NO is True and DRAW_NO_FIELD_PAGE == textField:
+                Plan.append(FillRule(RULE_PAGE_LABEL, textField))
+            elif USE_PAGENAME_DRAW_NO is True and DRAW_NO_FIELD == textField:
+                Plan.append(FillRule(RULE_SKIP, textField))
+            else:
+                textValue = Row.Value
+                if textValue[:1] == "'":
+                    textValue = textValue[1:]
+                Plan.append(FillRule(RULE_CONSTANT, textField, Value=textValue))
+            continue
+
+        # If the value in B is a number and there is a value in C,
+        # the number in B must be increased with a factor for every page.
+        if Row.Increase.strip():
+            # check if there is a value in column D, if not the muliplier will be 1.
+            Multiplier = 1
+            if Row.Factor.strip():
+                # Check if the value in D is a number.
+                if Row.Factor.isnumeric():
+                    # convert it to a number and use it as multiplier
+                    Multiplier = int(Row.Factor)
+
+            # The page numbers will be calculated with the formula:
+            # -> the value in column B + (Multiplier*NumCounter).
+            # With Column B is the page number for the first page.
+            #
+            # Example: 1st pagenumber is 2 and the multiplier is 10. Page 1 has number 2.
+            # this results in:
+            # Page 1 has number 2. (as mentioned)
+            # Page 2 has number 12 [2+(10*1)] where 2 is the number of first page,
+            # 10 is the value of the multiplier and 1 is the number of the NumCounter.
+            # Page 3 has 2+(10*2)=22.
+            #
+            # When the 1st page has number 1, page 2 has number 11, page 3 has number 21,
+            # page 4 has 41, etc.
+            Plan.append(
+                FillRule(
+                    RULE_PAGE_COUNTER,
+                    textField,
+                    Start=int(Row.Value),
+                    Factor=Multiplier,
+                )
+            )
+        # Check if the total number of sheets must be filled in.
+        elif NoSheetsField != "" and textField == NoSheetsField:
+            Plan.append(FillRule(RULE_SHEET_COUNT, textField))
+        # Otherwise it is just a number
+        else:
+            Plan.append(FillRule(RULE_CONSTANT, textField, Value=Row.Value))
+
+    # If Debug mode is enabled, show the fill plan
+    if ENABLE_DEBUG is True:
+        for Rule in Plan:
+            Text = translate(
+                "TitleBlock Workbench",
+                f"Fill rule for {Rule.Field}: {Rule.Kind}, "
+                + f"value: {Rule.Value}, start: {Rule.Start}, multiplier: {Rule.Factor}",
+            )
+            Standard_Functions.Print(Text, "Log")
+
+    return Plan
+
+
+def ApplyFillPlan(
+    Plan: list, texts: dict, PageIndex: int, PageLabel: str, NoOfPages: int
+) -> dict:
+    """Apply a fill plan to the editable texts of one page.
+
+    Args:
+        Plan (list): The fill plan from CompileFillPlan.\n
+        texts (dict): The editable texts of the page.\n
+        PageIndex (int): The index of the page. The first page is 0.\n
+        PageLabel (str): The label of the page.\n
+        NoOfPages (int): The total number of pages.\n
+
+    Returns:
+        dict: The updated editable texts.
+    """
+    for Rule in Plan:
+        # Only fill in the editable texts that are present in the template
+        if Rule.Field not in texts:
+            continue
+
+        Kind = Rule.Kind
+        if Kind == RULE_CONSTANT:
+            texts[Rule.Field] = Rule.Value
+        elif Kind == RULE_PAGE_COUNTER:
+            texts[Rule.Field] = str(Rule.Start + (Rule.Factor * PageIndex))
+        elif Kind == RULE_PAGE_LABEL:
+            texts[Rule.Field] = PageLabel
+        elif Kind == RULE_SHEET_COUNT:
+            texts[Rule.Field] = str(NoOfPages)
+    return texts
+
+
+def FillTitleBlock(doc=None, recompute: bool = True, pages: list = None) -> bool:
+    """Fill the titleblocks of the pages with the data from the titleblock spreadsheet.
+
+    Args:
+        doc (object, optional): FreeCAD document. Defaults to the active document.\n
+        recompute (bool, optional): Recompute the document when done. Defaults to True.\n
+        pages (list, optional): Only fill these pages. Defaults to all the pages in the document.\n
+
+    Returns:
+        bool: True when done.
+    """
+    from Settings_TB import ENABLE_DEBUG
     from Settings_TB import USE_SIMPLE_LIST
     from Settings_TB import USE_EXTERNAL_SOURCE_SIMPLE_LIST
     from Settings_TB import EXTERNAL_FILE_SIMPLE_LIST
@@ -53,230 +221,145 @@ def FillTitleBlock(doc=None, recompute: bool = True) -> bool:
     from Settings_TB import USE_EXTERNAL_SOURCE_ADVANCED_LIST
     from Settings_TB import EXTERNAL_FILE_ADVANCED_LIST
 
-    # Preset the value for the multiplier. This is used if an value has to be increased for every page.
-    NumCounter = -1
-    Multiplier = 1
     result = False
 
     if doc is None:
         doc = App.ActiveDocument
 
-    # Get the pages and go throug them one by one.
-    try:
-        pages = doc.findObjects("TechDraw::DrawPage")
-
-        # Get the spreadsheet.
-        sheet = doc.getObject("TitleBlock")
-        if sheet is None:
-            Standard_Functions.Mbox(
-                "No titleblock spreadsheet present!", "TitleBlock Workbench", 0
-            )
-            return result
-
-        for page in pages:
-            # Get the editable texts
-            texts = page.Template.EditableTexts
-            # Fill the titleblock with the data from the spreadsheet named "Title block".
-            # If the spreadsheet doesn't exist raise an error in the report view.
-            try:
-                # Increase the NumCounter
-                NumCounter = NumCounter + 1
-                RowNum = 0
-                # Go through the spreadsheet.
-                for i in range(len(texts)):
-                    # for RowNum in range(1000):
-                    # Start with x+1 first, to make sure that x is at least 1.
-                    RowNum = RowNum + 1
-
-                    # Get the name of the editable field. if it starts with ', remove it.
-                    textField = str(sheet.getContents("A" + str(RowNum)))
-                    if textField[:1] == "'":
-                        textField = textField[1:]
-
-                    # Option??? -------------------------------------------------------------------------------
-                    # # If the use of a drawing list is enabled and the property name is equal to the textfield
-                    # # Skip this text
-                    MustSkip = False
-                    # if (USE_SIMPLE_LIST is True and PROPERTY_NAME_SIMPLE_LIST == textField):
-                    #     MustSkip = True
-                    # if (USE_ADVANCED_LIST is True and PROPERTY_NAME_ADVANCED_LIST == textField):
-                    #     MustSkip = True
-                    # -----------------------------------------------------------------------------------------
-
-                    # fill in the editable text based on the text name in column A and the value in column B.
-                    # check if there is a value. If there is an value, continue.
-                    if (
-                        str(sheet.getContents("B" + str(RowNum))).strip()
-                        and MustSkip is False
-                    ):
-                        # define the string for the text value
-                        textValue = ""
-
-                        # if the value in B is not a number, just fill in
-                        if (
-                            str(sheet.getContents("B" + str(RowNum))).isnumeric()
-                            is False
-                        ):
-                            if (
-                                USE_PAGENAME_DRAW_NO is True
-                                and DRAW_NO_FIELD_PAGE == textField
-                            ):
-                                textValue = page.Label
-                            elif (
-                                USE_PAGENAME_DRAW_NO is True
-                                and DRAW_NO_FIELD == textField
-                            ):
-                                continue
-                            else:
-                                # write the editable text
-                                textValue = str(sheet.getContents("B" + str(RowNum)))
-                            if textValue[:1] == "'":
-                                textValue = textValue[1:]
-
-                            if textField[:1] == "'":
-                                textField = textField[1:]
-
-                            texts[textField] = textValue
-
-                        # If the value in B is a number continue:
-                        if (
-                            str(sheet.getContents("B" + str(RowNum))).isnumeric()
-                            is True
-                        ):
-                            # Check if the total number of sheets must be filled in.
-                            if MAP_NOSHEETS != "":
-                                # define TextCompare as Value of MAP_NOSHEETs for comparison. if it starts with ', remove it.
-                                TextCompare = MAP_NOSHEETS
-                                if TextCompare[:1] == "'":
-                                    TextCompare = TextCompare[1:]
-
-                                #  set the value to the total number of pages.
-                                if textField == TextCompare:
-                                    textValue = str(len(pages))
-
-                                # Write the editable text and set NoSheetsMapped to be true.
-                                texts[textField] = textValue
-
-                            # check if there is a value in C. if so, the number in B must be increased with a factor
-                            if str(sheet.getContents("C" + str(RowNum))).strip():
-                                # check if there is a value in column D, if not the muliplier will be 1.
-                                Multiplier = 1
-                                if str(sheet.getContents("D" + str(RowNum))).strip():
-                                    # Check if the value in D is a number.
-                                    if str(
-                                        sheet.getContents("D" + str(RowNum))
-                                    ).isnumeric():
-                                        # convert it to a number and use it as multiplier
-                                        Multiplier = int(
-                                            sheet.getContents("D" + str(RowNum))
-                                        )
-
-                                # if in debug mode. Show the value of the multiplier
-                                if ENABLE_DEBUG is True:
-                                    Text = translate(
-                                        "TitleBlock Workbench",
-                                        "The values will be multiplied with: "
-                                        + str(Multiplier),
-                                    )
-                                    Standard_Functions.Print(Text, "Log")
-
-                                # check if the value in colom B is an number
-
-                                # The page numbers will be calculated with the formula:
-                                # -> the value in column B + (Multiplier*NumCounter).
-                                # With Column B is the page number for the first page.
-                                #
-                                # Example: 1st pagenumber is 2 and the multiplier is 10. Page 1 has number 2.
-                                # this results in:
-                                # Page 1 has number 2. (as mentioned)
-                                # Page 2 has number 12 [2+(10*1)] where 2 is the number of first page,
-                                # 10 is the value of the multiplier and 1 is the number of the NumCounter.
-                                # Page 3 has 2+(10*2)=22.
-                                #
-                                # When the 1st page has number 1, page 2 has number 11, page 3 has number 21,
-                                # page 4 has 41, etc.
-                                textValue = str(
-                                    (int(sheet.getContents("B" + str(RowNum))))
-                                    + (Multiplier * NumCounter)
-                                )
-                                if textValue[:1] == "'":
-                                    textValue = textValue[1:]
-
-                                texts[textField] = textValue
-
-                                # If Debug mode is enabled, show NumCounter and Multplier
-                                if ENABLE_DEBUG is True:
-                                    Text = translate(
-                                        "TitleBlock Workbench",
-                                        "NumCounter is: "
-                                        + str((NumCounter))
-                                        + ", Multiplier is: "
-                                        + str(Multiplier)
-                                        + "Text is:"
-                                        + str(textValue),
-                                    )
-                                    Standard_Functions.Print(Text, "Log")
-
-                    # Check if the next row exits. If not this is the end of all the available values.
-                    try:
-                        sheet.getContents("A" + str(RowNum + 1))
-                    except Exception:
-                        break
-
-                # Write all the updated text to the page.
-                page.Template.EditableTexts = texts
-
-                # Recompute the page
-                if recompute is True:
-                    doc.recompute(None, True, True)
-
-            except Exception as e:
-                # raise an exeception if there is no spreadsheet.
-                Text = translate(
-                    "TitleBlock Workbench", "An error occured when writing the values!!"
-                )
+    # Fill the titleblocks in one transaction. The pages are recomputed once at the end.
+    with FillTransaction.FillTransaction(doc, recompute=recompute):
+        # Get the pages and go throug them one by one.
+        try:
+            # Store the selected pages for the drawing lists. None means all pages.
+            SelectedPages = pages
+            if pages is None:
+                pages = doc.findObjects("TechDraw::DrawPage")
+
+            # Get the index of all pages. This is used for the page numbers and the number of sheets.
+            PageIndex = TechDraw_Functions.GetPageIndex(doc)
+            # If a page is not in the index, the index is outdated. Create a new one.
+            IsOutdated = SelectedPages is None and len(pages) != len(PageIndex)
+            for page in pages:
+                if page.Name not in PageIndex:
+                    IsOutdated = True
+                    break
+            if IsOutdated is True:
+                TechDraw_Functions.InvalidatePageIndex(doc)
+                PageIndex = TechDraw_Functions.GetPageIndex(doc)
+
+            # Get the spreadsheet.
+            sheet = doc.getObject("TitleBlock")
+            if sheet is None:
                 Standard_Functions.Mbox(
-                    text=Text, title="TitleBlock Workbench", style=0
-                )
-                # if degbug mode is enabeled, print the exception
-                if ENABLE_DEBUG is True:
-                    raise e
-
-        # If the use of a drawing list is enabled, update the titleblock
-        if USE_SIMPLE_LIST is True:
-            if USE_EXTERNAL_SOURCE_SIMPLE_LIST is False:
-                DrawingList_Functions_TB.MapSimpleDrawingList(sheet=sheet)
-            if USE_EXTERNAL_SOURCE_SIMPLE_LIST is True:
-                if EXTERNAL_FILE_SIMPLE_LIST.lower().endswith("fcstd"):
-                    DrawingList_Functions_TB.MapSimpleDrawingList_FreeCAD(sheet=sheet)
-                if EXTERNAL_FILE_SIMPLE_LIST.lower().endswith("xlsx"):
-                    DrawingList_Functions_TB.MapSimpleDrawingList_Excel(sheet=sheet)
-        # If the use of an advanced drawing list is enabled, update the titleblock
-        if USE_ADVANCED_LIST is True:
-            if USE_EXTERNAL_SOURCE_ADVANCED_LIST is False:
-                DrawingList_Functions_TB.MapAdvancedDrawingList(
-                    doc=App.ActiveDocument, sheet=sheet
+                    "No titleblock spreadsheet present!", "TitleBlock Workbench", 0
                 )
-            if USE_EXTERNAL_SOURCE_ADVANCED_LIST is True:
-                if EXTERNAL_FILE_ADVANCED_LIST.lower().endswith("fcstd"):
-                    DrawingList_Functions_TB.MapAdvancedDrawingList_FreeCAD(
-                        doc=App.ActiveDocument, sheet=sheet
+                return result
+
+            # Read the spreadsheet once and compile it into a fill plan.
+            # The page loop below only applies this plan.
+            Rows = Spreadsheet_Functions.GetTitleBlockSnapshot(sheet)
+            Plan = CompileFillPlan(Rows)
+
+            # Keep track of the changes to report them in debug mode
+            ChangedFields = 0
+            ChangedPages = 0
+
+            for page in pages:
+                # Fill the titleblock with the data from the spreadsheet named "Title block".
+                try:
+                    texts = ApplyFillPlan(
+                        Plan,
+                        page.Template.EditableTexts,
+                        PageIndex[page.Name],
+                        page.Label,
+                        len(PageIndex),
                     )
-                if EXTERNAL_FILE_ADVANCED_LIST.lower().endswith("xlsx"):
-                    DrawingList_Functions_TB.MapAdvancedDrawingList_Excel(
-                        doc=App.ActiveDocument, sheet=sheet
+
+                    # Write the updated texts to the page, only if something has changed.
+                    Changed = TechDraw_Functions.WriteEditableTexts(page, texts)
+                    ChangedFields = ChangedFields + Changed
+                    if Changed > 0:
+                        ChangedPages = ChangedPages + 1
+
+                except Exception as e:
+                    # raise an exeception if there is no spreadsheet.
+                    Text = translate(
+                        "TitleBlock Workbench",
+                        "An error occured when writing the values!!",
+                    )
+                    Standard_Functions.Mbox(
+                        text=Text, title="TitleBlock Workbench", style=0
                     )
+                    # if degbug mode is enabeled, print the exception
+                    if ENABLE_DEBUG is True:
+                        raise e
 
-    except Exception as e:
-        Text = "TitleBlock Workbench: an error occurred!!\n"
-        if ENABLE_DEBUG is True:
-            Text = translate(
-                "TitleBlock Workbench",
-                "TitleBlock Workbench: an error occurred!!\n"
-                + "See the report view for details",
-            )
-            raise e
-        Standard_Functions.Mbox(text=Text, title="TitleBlock Workbench", style=0)
+            if ENABLE_DEBUG is True:
+                Text = translate(
+                    "TitleBlock Workbench",
+                    f"{ChangedFields} editable text(s) changed on {ChangedPages} of {len(pages)} page(s)",
+                )
+                Standard_Functions.Print(Text, "Log")
+
+            # If the use of a drawing list is enabled, update the titleblock
+            if USE_SIMPLE_LIST is True:
+                if USE_EXTERNAL_SOURCE_SIMPLE_LIST is False:
+                    DrawingList_Functions_TB.MapSimpleDrawingList(
+                        sheet=sheet, SelectedPages=SelectedPages
+                    )
+                if USE_EXTERNAL_SOURCE_SIMPLE_LIST is True:
+                    if (
+                        ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST)
+                        == "FreeCAD"
+                    ):
+                        DrawingList_Functions_TB.MapSimpleDrawingList_FreeCAD(
+                            sheet=sheet, SelectedPages=SelectedPages
+                        )
+                    if (
+                        ExternalSource.GetSourceType(EXTERNAL_FILE_SIMPLE_LIST)
+                        == "Excel"
+                    ):
+                        DrawingList_Functions_TB.MapSimpleDrawingList_Excel(
+                            sheet=sheet, SelectedPages=SelectedPages
+                        )
+            # If the use of an advanced drawing list is enabled, update the titleblock
+            if USE_ADVANCED_LIST is True:
+                if USE_EXTERNAL_SOURCE_ADVANCED_LIST is False:
+                    DrawingList_Functions_TB.MapAdvancedDrawingList(
+                        doc=App.ActiveDocument,
+                        sheet=sheet,
+                        SelectedPages=SelectedPages,
+                    )
+                if USE_EXTERNAL_SOURCE_ADVANCED_LIST is True:
+                    if (
+                        ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST)
+                        == "FreeCAD"
+                    ):
+                        DrawingList_Functions_TB.MapAdvancedDrawingList_FreeCAD(
+                            doc=App.ActiveDocument,
+                            sheet=sheet,
+                            SelectedPages=SelectedPages,
+                        )
+                    if (
+                        ExternalSource.GetSourceType(EXTERNAL_FILE_ADVANCED_LIST)
+                        == "Excel"
+                    ):
+                        DrawingList_Functions_TB.MapAdvancedDrawingList_Excel(
+                            doc=App.ActiveDocument,
+                            sheet=sheet,
+                            SelectedPages=SelectedPages,
+                        )
+
+        except Exception as e:
+            Text = "TitleBlock Workbench: an error occurred!!\n"
+            if ENABLE_DEBUG is True:
+                Text = translate(
+                    "TitleBlock Workbench",
+                    "TitleBlock Workbench: an error occurred!!\n"
+                    + "See the report view for details",
+                )
+                raise e
+            Standard_Functions.Mbox(text=Text, title="TitleBlock Workbench", style=0)
 
     result = True
     return result
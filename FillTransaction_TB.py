@@ -0,0 +1,214 @@
+# ***************************************************************************
+# *   Copyright (c) 2023 Paul Ebbers paul.ebbers@gmail.com                  *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+
+# A fill transaction groups all the changes that are made while filling the titleblocks.
+# Pages that are changed are collected and recomputed once when the transaction is closed.
+# Requests to recompute or save the document are suppressed until then.
+#
+# Use it like:
+#
+#   with FillTransaction_TB.FillTransaction(doc, recompute=True):
+#       ...
+#       FillTransaction_TB.MarkDirty(page)
+#       FillTransaction_TB.Recompute(doc)
+#       FillTransaction_TB.Save(doc)
+#
+# Outside a transaction, MarkDirty, Recompute and Save work directly on the page or document.
+
+import FreeCAD as App
+import Standard_Functions_TB as Standard_Functions
+
+# Define the translation
+translate = App.Qt.translate
+
+# The open transactions per document name
+_OpenTransactions = {}
+# The names of the documents for which a transaction is being committed
+_CommittingDocuments = set()
+
+
+class FillTransaction:
+    def __init__(self, doc=None, recompute: bool = True, save: bool = False):
+        """Groups the changes made while filling the titleblocks.
+
+        Args:
+            doc (object, optional): FreeCAD document. Defaults to the active document.\n
+            recompute (bool, optional): Recompute the whole document when the transaction is closed.
+            If False, only the changed pages are recomputed. Defaults to True.\n
+            save (bool, optional): Save the document when the transaction is closed. Defaults to False.\n
+        """
+        if doc is None:
+            doc = App.ActiveDocument
+        self.doc = doc
+        self.recompute = recompute
+        self.SaveRequested = save
+        self.RecomputeRequested = False
+        self.DirtyObjects = {}
+        # The transaction that was already open for this document, if any.
+        self.Outer = None
+
+    def __enter__(self):
+        # If there is already a transaction open for this document, join that one.
+        # The outer transaction decides if the document is recomputed.
+        self.Outer = _OpenTransactions.get(self.doc.Name)
+        if self.Outer is not None:
+            if self.SaveRequested is True:
+                self.Outer.SaveRequested = True
+            return self.Outer
+
+        _OpenTransactions[self.doc.Name] = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A nested transaction has nothing to commit.
+        if self.Outer is not None:
+            return False
+
+        del _OpenTransactions[self.doc.Name]
+        # Mark the document as busy while recomputing and saving,
+        # so that the observer can ignore the recomputes caused by this transaction.
+        _CommittingDocuments.add(self.doc.Name)
+        try:
+            self.Commit()
+        finally:
+            _CommittingDocuments.discard(self.doc.Name)
+        return False
+
+    def MarkDirty(self, obj):
+        self.DirtyObjects[obj.Name] = obj
+
+    def Commit(self):
+        from Settings_TB import ENABLE_DEBUG
+        from Settings_TB import SCOPED_RECOMPUTE
+
+        # Recompute the document once, or only the pages that are changed.
+        if self.recompute is True:
+            if self.RecomputeRequested is True or len(self.DirtyObjects) > 0:
+                if SCOPED_RECOMPUTE is True and self.NeedsFullRecompute() is False:
+                    self.ScopedRecompute()
+                else:
+                    self.doc.recompute(None, True, True)
+        else:
+            for obj in self.DirtyObjects.values():
+                obj.recompute()
+
+        # Save the document once
+        if self.SaveRequested is True:
+            self.doc.save()
+
+        if ENABLE_DEBUG is True:
+            Text = translate(
+                "TitleBlock Workbench",
+                f"Fill transaction closed: {len(self.DirtyObjects)} changed object(s), "
+                + f"recompute: {self.recompute}, save: {self.SaveRequested}",
+            )
+            Standard_Functions.Print(Text, "Log")
+        return
+
+    def NeedsFullRecompute(self) -> bool:
+        """Returns True if the titleblock spreadsheet has expression bindings to model objects.
+        In that case the model must be recomputed as well."""
+        sheet = self.doc.getObject("TitleBlock")
+        if sheet is not None and len(sheet.OutList) > 0:
+            return True
+        return False
+
+    def ScopedRecompute(self):
+        """Recompute only the changed pages, their templates and the titleblock spreadsheet.
+        The views and the model geometry are not recomputed."""
+        from Settings_TB import ENABLE_DEBUG
+
+        Objects = []
+        # If a recompute of the document was requested, recompute the titleblock spreadsheet as well.
+        if self.RecomputeRequested is True:
+            sheet = self.doc.getObject("TitleBlock")
+            if sheet is not None:
+                Objects.append(sheet)
+        # Add the templates before the pages. The page is redrawn with the updated template.
+        for obj in self.DirtyObjects.values():
+            if obj.TypeId == "TechDraw::DrawPage" and obj.Template is not None:
+                Objects.append(obj.Template)
+            Objects.append(obj)
+
+        for obj in Objects:
+            obj.touch()
+        if len(Objects) > 0:
+            self.doc.recompute(Objects)
+
+        if ENABLE_DEBUG is True:
+            Text = translate(
+                "TitleBlock Workbench",
+                f"Scoped recompute of {len(Objects)} object(s)",
+            )
+            Standard_Functions.Print(Text, "Log")
+        return
+
+
+def GetTransaction(doc):
+    """Returns the open fill transaction for the document or None"""
+    if doc is None:
+        return None
+    return _OpenTransactions.get(doc.Name)
+
+
+def IsBusy(doc) -> bool:
+    """Returns True if a fill transaction is open or being committed for the document"""
+    if doc is None:
+        return False
+    return doc.Name in _OpenTransactions or doc.Name in _CommittingDocuments
+
+
+def MarkDirty(obj):
+    """Mark a changed object (like a page) to be recomputed.
+    Outside a transaction, the object is recomputed directly."""
+    Transaction = GetTransaction(obj.Document)
+    if Transaction is None:
+        obj.recompute()
+        return
+    Transaction.MarkDirty(obj)
+    return
+
+
+def Recompute(doc):
+    """Recompute the document.
+    Inside a transaction, this is postponed until the transaction is closed."""
+    Transaction = GetTransaction(doc)
+    if Transaction is None:
+        # Use a transaction of its own, so that the recompute can be scoped.
+        with FillTransaction(doc, recompute=True) as Transaction:
+            Transaction.RecomputeRequested = True
+        return
+    Transaction.RecomputeRequested = True
+    return
+
+
+def Save(doc):
+    """Save the document.
+    Inside a transaction, this is postponed until the transaction is closed."""
+    Transaction = GetTransaction(doc)
+    if Transaction is None:
+        doc.save()
+        return
+    Transaction.SaveRequested = True
+    return
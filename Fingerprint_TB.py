@@ -0,0 +1,198 @@
+# ***************************************************************************
+# *   Copyright (c) 2023 Paul Ebbers paul.ebbers@gmail.com                  *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+
+# Functions to create a fingerprint of all the inputs of the titleblock fill.
+# If the fingerprint is equal to the fingerprint of the last fill, nothing has changed
+# and the fill can be skipped.
+
+import os
+import hashlib
+import FreeCAD as App
+import Spreadsheet_Functions_TB as Spreadsheet_Functions
+
+# The document information that can be mapped to the titleblock
+DocInfoProperties = [
+    "Name",
+    "FileName",
+    "CreatedBy",
+    "CreationDate",
+    "LastModifiedBy",
+    "LastModifiedDate",
+    "Company",
+    "License",
+    "LicenseURL",
+    "Comment",
+]
+
+
+def GetFileStamp(FilePath: str) -> tuple:
+    """Returns the modification time and size of a file. If the file doesn't exist, only the path is returned"""
+    try:
+        Stat = os.stat(FilePath)
+        return (FilePath, Stat.st_mtime_ns, Stat.st_size)
+    except OSError:
+        return (FilePath,)
+
+
+def GetSheetContents(sheet) -> tuple:
+    """Returns the contents of all the non empty cells of a spreadsheet.
+    Returns None if this is not supported by this version of FreeCAD."""
+    if sheet is None:
+        return ()
+    if hasattr(sheet, "getNonEmptyCells") is False:
+        return None
+    return tuple((Cell, sheet.getContents(Cell)) for Cell in sheet.getNonEmptyCells())
+
+
+def GetPageStamp(page) -> tuple:
+    """Returns the name and label of a page, the name and file of its template
+    and a short hash of the editable texts of the template."""
+    Template = page.Template
+    if Template is None:
+        return (page.Name, page.Label, None)
+    Texts = repr(sorted(Template.EditableTexts.items()))
+    return (
+        page.Name,
+        page.Label,
+        Template.Name,
+        str(getattr(Template, "Template", "")),
+        hashlib.sha1(Texts.encode("utf-8")).hexdigest(),
+    )
+
+
+def GetInputFingerprint(doc) -> str:
+    """Create a fingerprint of all the inputs for filling the spreadsheet and the titleblocks.
+
+    Args:
+        doc (object): FreeCAD document.\n
+
+    Returns:
+        str: The fingerprint. None if the inputs cannot be fingerprinted,
+        for example when the titleblock spreadsheet is bound to model objects.
+    """
+    from Settings_TB import USE_EXTERNAL_SOURCE
+    from Settings_TB import EXTERNAL_SOURCE_PATH
+    from Settings_TB import USE_SIMPLE_LIST
+    from Settings_TB import USE_EXTERNAL_SOURCE_SIMPLE_LIST
+    from Settings_TB import EXTERNAL_FILE_SIMPLE_LIST
+    from Settings_TB import SHEETNAME_SIMPLE_LIST
+    from Settings_TB import USE_ADVANCED_LIST
+    from Settings_TB import USE_EXTERNAL_SOURCE_ADVANCED_LIST
+    from Settings_TB import EXTERNAL_FILE_ADVANCED_LIST
+    from Settings_TB import SHEETNAME_ADVANCED_LIST
+    from Settings_TB import USE_FILENAME_DRAW_NO
+    from Settings_TB import DRAW_NO_FIELD
+    from Settings_TB import USE_PAGENAME_DRAW_NO
+    from Settings_TB import DRAW_NO_FIELD_PAGE
+    from Settings_TB import MAP_LENGTH
+    from Settings_TB import MAP_ANGLE
+    from Settings_TB import MAP_MASS
+    from Settings_TB import MAP_NOSHEETS
+    from Settings_TB import DOCINFO_NAME
+    from Settings_TB import DOCINFO_CREATEDBY
+    from Settings_TB import DOCINFO_CREATEDDATE
+    from Settings_TB import DOCINFO_LASTMODIFIEDBY
+    from Settings_TB import DOCINFO_LASTMODIFIEDDATE
+    from Settings_TB import DOCINFO_COMPANY
+    from Settings_TB import DOCINFO_LICENSE
+    from Settings_TB import DOCINFO_LICENSEURL
+    from Settings_TB import DOCINFO_COMMENT
+    from Settings_TB import INCLUDE_LENGTH
+    from Settings_TB import INCLUDE_ANGLE
+    from Settings_TB import INCLUDE_MASS
+    from Settings_TB import INCLUDE_NO_SHEETS
+
+    # The preferences for mapping the drawing number, the properties and the document information.
+    # After a change of these preferences, the next fill must write the new values.
+    Inputs = [
+        USE_FILENAME_DRAW_NO,
+        DRAW_NO_FIELD,
+        USE_PAGENAME_DRAW_NO,
+        DRAW_NO_FIELD_PAGE,
+        MAP_LENGTH,
+        MAP_ANGLE,
+        MAP_MASS,
+        MAP_NOSHEETS,
+        DOCINFO_NAME,
+        DOCINFO_CREATEDBY,
+        DOCINFO_CREATEDDATE,
+        DOCINFO_LASTMODIFIEDBY,
+        DOCINFO_LASTMODIFIEDDATE,
+        DOCINFO_COMPANY,
+        DOCINFO_LICENSE,
+        DOCINFO_LICENSEURL,
+        DOCINFO_COMMENT,
+        INCLUDE_LENGTH,
+        INCLUDE_ANGLE,
+        INCLUDE_MASS,
+        INCLUDE_NO_SHEETS,
+    ]
+
+    # The titleblock spreadsheet.
+    # If it has bindings to model objects, its values can change without a change in the contents.
+    sheet = doc.getObject("TitleBlock")
+    if sheet is not None:
+        if len(sheet.OutList) > 0:
+            return None
+        Inputs.append(Spreadsheet_Functions.GetTitleBlockSnapshot(sheet))
+
+    # The pages in their order with their labels, their templates and the editable texts of every page.
+    # A changed template or a text that is edited by hand on any page, must trigger a fill.
+    pages = doc.findObjects("TechDraw::DrawPage")
+    Inputs.append(tuple(GetPageStamp(page) for page in pages))
+
+    # The document information
+    Inputs.append(tuple(str(getattr(doc, Name, "")) for Name in DocInfoProperties))
+
+    # The unit schema
+    Inputs.append(App.Units.getSchema())
+
+    # The external sources
+    if USE_EXTERNAL_SOURCE is True:
+        Inputs.append(GetFileStamp(EXTERNAL_SOURCE_PATH))
+
+    # The drawing lists
+    if USE_SIMPLE_LIST is True:
+        if USE_EXTERNAL_SOURCE_SIMPLE_LIST is True:
+            Inputs.append(GetFileStamp(EXTERNAL_FILE_SIMPLE_LIST))
+        else:
+            Contents = GetSheetContents(doc.getObject(SHEETNAME_SIMPLE_LIST))
+            if Contents is None:
+                return None
+            Inputs.append(Contents)
+    if USE_ADVANCED_LIST is True:
+        if USE_EXTERNAL_SOURCE_ADVANCED_LIST is True:
+            Inputs.append(GetFileStamp(EXTERNAL_FILE_ADVANCED_LIST))
+        else:
+            Contents = GetSheetContents(doc.getObject(SHEETNAME_ADVANCED_LIST))
+            if Contents is None:
+                return None
+            Inputs.append(Contents)
+        # The advanced list maps the values per group of pages
+        for Group in doc.findObjects("App::DocumentObjectGroup"):
+            Inputs.append(
+                (Group.Label, tuple(obj.Name for obj in Group.Group if obj in pages))
+            )
+
+    return hashlib.sha1(repr(Inputs).encode("utf-8")).hexdigest()
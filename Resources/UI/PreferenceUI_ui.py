@@ -1605,6 +1605,50 @@ class Ui_Form(object):
         self.EnableRecompute_FillSpreadsheet.setProperty(
             "prefPath", "Mod/TitleBlock Workbench"
         )
+        self.ScopedRecompute = Gui_PrefCheckBox(self.frame_6)
+        self.ScopedRecompute.setObjectName("ScopedRecompute")
+        self.ScopedRecompute.setGeometry(QRect(5, 55, 436, 17))
+        self.ScopedRecompute.setChecked(True)
+        self.ScopedRecompute.setProperty("prefEntry", "ScopedRecompute")
+        self.ScopedRecompute.setProperty("prefPath", "Mod/TitleBlock Workbench")
+        self.label_RecomputeDelay = QLabel(self.frame_6)
+        self.label_RecomputeDelay.setObjectName("label_RecomputeDelay")
+        self.label_RecomputeDelay.setGeometry(QRect(5, 82, 300, 17))
+        self.RecomputeDelay = Gui_PrefSpinBox(self.frame_6)
+        self.RecomputeDelay.setObjectName("RecomputeDelay")
+        self.RecomputeDelay.setGeometry(QRect(310, 80, 131, 22))
+        self.RecomputeDelay.setMaximum(10000)
+        self.RecomputeDelay.setSingleStep(100)
+        self.RecomputeDelay.setValue(500)
+        self.RecomputeDelay.setProperty("prefEntry", "RecomputeDelay")
+        self.RecomputeDelay.setProperty("prefPath", "Mod/TitleBlock Workbench")
+        self.IncrementalFillSpreadsheet = Gui_PrefCheckBox(self.frame_6)
+        self.IncrementalFillSpreadsheet.setObjectName("IncrementalFillSpreadsheet")
+        self.IncrementalFillSpreadsheet.setGeometry(QRect(5, 110, 436, 17))
+        self.IncrementalFillSpreadsheet.setProperty(
+            "prefEntry", "IncrementalFillSpreadsheet"
+        )
+        self.IncrementalFillSpreadsheet.setProperty(
+            "prefPath", "Mod/TitleBlock Workbench"
+        )
+        self.label_ExternalDocumentTimeout = QLabel(self.frame_6)
+        self.label_ExternalDocumentTimeout.setObjectName(
+            "label_ExternalDocumentTimeout"
+        )
+        self.label_ExternalDocumentTimeout.setGeometry(QRect(5, 137, 300, 17))
+        self.ExternalDocumentTimeout = Gui_PrefSpinBox(self.frame_6)
+        self.ExternalDocumentTimeout.setObjectName("ExternalDocumentTimeout")
+        self.ExternalDocumentTimeout.setGeometry(QRect(310, 135, 131, 22))
+        self.ExternalDocumentTimeout.setMaximum(3600)
+        self.ExternalDocumentTimeout.setSingleStep(60)
+        self.ExternalDocumentTimeout.setValue(300)
+        self.ExternalDocumentTimeout.setProperty("prefEntry", "ExternalDocumentTimeout")
+        self.ExternalDocumentTimeout.setProperty("prefPath", "Mod/TitleBlock Workbench")
+        self.DirectExcelReader = Gui_PrefCheckBox(self.frame_6)
+        self.DirectExcelReader.setObjectName("DirectExcelReader")
+        self.DirectExcelReader.setGeometry(QRect(5, 165, 436, 17))
+        self.DirectExcelReader.setProperty("prefEntry", "DirectExcelReader")
+        self.DirectExcelReader.setProperty("prefPath", "Mod/TitleBlock Workbench")
         self.label_46 = QLabel(self.tab_2)
         self.label_46.setObjectName("label_46")
         self.label_46.setGeometry(QRect(10, 5, 491, 141))
@@ -1849,7 +1893,11 @@ class Ui_Form(object):
         )
         self.ExternalFileChooser.setFileName("")
         self.ExternalFileChooser.setFilter(
-            QCoreApplication.translate("Form", "*.xlsx; *.FCStd", None)
+            QCoreApplication.translate(
+                "Form",
+                "*.xlsx; *.xlsm; *.csv; *.jsonl; *.sqlite; *.sqlite3; *.db; *.FCStd",
+                None,
+            )
         )
         self.UseExternalSource.setText(
             QCoreApplication.translate("Form", "Use external source", None)
@@ -2079,7 +2127,11 @@ class Ui_Form(object):
         )
         self.ExternalFileChooser_SimpleList.setFileName("")
         self.ExternalFileChooser_SimpleList.setFilter(
-            QCoreApplication.translate("Form", "*.xlsx; *.FCStd", None)
+            QCoreApplication.translate(
+                "Form",
+                "*.xlsx; *.xlsm; *.csv; *.jsonl; *.sqlite; *.sqlite3; *.db; *.FCStd",
+                None,
+            )
         )
         self.UseExternalSource_SimpleList.setText(
             QCoreApplication.translate("Form", "Use external source", None)
@@ -2156,7 +2208,11 @@ class Ui_Form(object):
         )
         self.ExternalFileChooser_AdvancedList.setFileName("")
         self.ExternalFileChooser_AdvancedList.setFilter(
-            QCoreApplication.translate("Form", "*.xlsx; *.FCStd", None)
+            QCoreApplication.translate(
+                "Form",
+                "*.xlsx; *.xlsm; *.csv; *.jsonl; *.sqlite; *.sqlite3; *.db; *.FCStd",
+                None,
+            )
         )
         self.label_41.setText(
             QCoreApplication.translate(
@@ -2251,6 +2307,29 @@ class Ui_Form(object):
                 "Form", "Populate titleblock with recompute", None
             )
         )
+        self.ScopedRecompute.setText(
+            QCoreApplication.translate(
+                "Form", "Only recompute the changed templates and pages", None
+            )
+        )
+        self.label_RecomputeDelay.setText(
+            QCoreApplication.translate(
+                "Form", "Delay before updating after a recompute (ms)", None
+            )
+        )
+        self.IncrementalFillSpreadsheet.setText(
+            QCoreApplication.translate(
+                "Form", "Only update the changed rows of the spreadsheet", None
+            )
+        )
+        self.label_ExternalDocumentTimeout.setText(
+            QCoreApplication.translate(
+                "Form", "Keep unused external FreeCAD files open for (s)", None
+            )
+        )
+        self.DirectExcelReader.setText(
+            QCoreApplication.translate("Form", "Use the fast Excel reader", None)
+        )
         self.label_46.setText(
             QCoreApplication.translate(
                 "Form",
@@ -44,8 +44,8 @@ def GetStringSetting(settingName: str) -> str:
     return result
 
 
-def GetIntSetting(settingName: str) -> int:
-    result = preferences.GetInt(settingName)
+def GetIntSetting(settingName: str, default: int = 0) -> int:
+    result = preferences.GetInt(settingName, default)
     if result == "":
         result = None
     return result
@@ -58,8 +58,8 @@ def GetFloatSetting(settingName: str) -> int:
     return result
 
 
-def GetBoolSetting(settingName: str) -> bool:
-    result = preferences.GetBool(settingName)
+def GetBoolSetting(settingName: str, default: bool = False) -> bool:
+    result = preferences.GetBool(settingName, default)
     if str(result).lower() == "none":
         result = False
     return result
@@ -200,6 +200,21 @@ USE_PAGE_NAMES_ADVANCED_LIST = GetBoolSetting("UsePageNames_AdvancesList")
 ENABLE_RECOMPUTE_FILL_SPREADSHEET = GetBoolSetting("EnableRecompute_FillSpreadsheet")
 ENABLE_RECOMPUTE_FILL_TITLEBLOCK = GetBoolSetting("EnableRecompute_FillTitleBlock")
 
+# Recompute only the changed templates and pages instead of the whole document
+SCOPED_RECOMPUTE = GetBoolSetting("ScopedRecompute", True)
+
+# The quiet period in milliseconds after a recompute before the titleblocks are updated
+RECOMPUTE_DELAY = GetIntSetting("RecomputeDelay", 500)
+
+# Update the titleblock spreadsheet with only the changes, instead of creating it again
+INCREMENTAL_FILL_SPREADSHEET = GetBoolSetting("IncrementalFillSpreadsheet", False)
+
+# The time in seconds an unused external FreeCAD document is kept open
+EXTERNAL_DOCUMENT_TIMEOUT = GetIntSetting("ExternalDocumentTimeout", 300)
+
+# Read Excel workbooks directly from the xlsx file, instead of with openpyxl
+DIRECT_EXCEL_READER = GetBoolSetting("DirectExcelReader")
+
 # Enable debug mode. This will enable additional report messages
 ENABLE_DEBUG = GetBoolSetting("EnableDebug")
 
@@ -813,12 +828,15 @@ def ExportSettings_FreeCAD(Silent=False):
         # Define the First column range
         FirstColumnRange = str(f"{FirstColumn}{FirstTableRow}:{FirstColumn}{RowNumber}")
 
-        # Format the table
+        # Format the table. The spreadsheet can be an existing one, that is already formatted.
+        # All the values are written again, so widen the columns for all the rows.
         sheet = TableFormat_Functions_TB.FormatTable(
             sheet=sheet,
             HeaderRange=HeaderRange,
             TableRange=TableRange,
             FirstColumnRange=FirstColumnRange,
+            CheckExisting=True,
+            ChangedRows=list(range(FirstTableRow - 1, RowNumber + 1)),
         )
         # endregion
 
@@ -849,6 +867,7 @@ def ExportSettings_FreeCAD(Silent=False):
 
 
 def ImportSettings_FreeCAD():
+    import ExternalSource_TB as ExternalSource
     import os.path
     import errno
 
@@ -864,12 +883,12 @@ def ImportSettings_FreeCAD():
         ]
         FileName = Standard_Functions.GetFileDialog(files=Filter, SaveAs=False)
         if FileName != "":
-            ff = App.openDocument(FileName, True)
+            ff = ExternalSource.GetPooledDocument(FileName)
         if FileName == "":
             return
     if USE_EXTERNAL_SOURCE is True:
         if os.path.exists(EXTERNAL_SOURCE_PATH) is True:
-            ff = App.openDocument(EXTERNAL_SOURCE_PATH, True)
+            ff = ExternalSource.GetPooledDocument(EXTERNAL_SOURCE_PATH)
         if os.path.exists(EXTERNAL_SOURCE_PATH) is False:
             Text = translate(
                 "TitleBlock Workbench",
@@ -1207,12 +1226,6 @@ def ImportSettings_FreeCAD():
             )
             Standard_Functions.Print(Text, "Log")
 
-        # recompute the document
-        ff.recompute(None, True, True)
-        # Save the workbook
-        ff.save()
-        # Close the FreeCAD file
-        App.closeDocument(ff.Name)
         # Activate the document which was active when this command started.
         App.setActiveDocument(LastActiveDoc)
     # If there is an IO Error continue:
@@ -1228,14 +1241,10 @@ def ImportSettings_FreeCAD():
                     f"No permision to open {EXTERNAL_SOURCE_PATH}!\nSee the report view for details",
                 )
 
-            # Close the FreeCAD file
-            App.closeDocument(ff.Name)
             return Standard_Functions.Mbox(
                 text=Text, title="TitleBlock Workbench", style=0
             )
         # For all other IO errors, raise e.
-        # Close the FreeCAD file
-        App.closeDocument(ff.Name)
         raise (e)
     except Exception as e:
         Text = translate(
@@ -1249,11 +1258,7 @@ def ImportSettings_FreeCAD():
             )
         Standard_Functions.Mbox(text=Text, title="TitleBlock Workbench", style=0)
         if ENABLE_DEBUG is True:
-            # Close the FreeCAD file
-            App.closeDocument(ff.Name)
             raise (e)
-        # Close the FreeCAD file
-        App.closeDocument(ff.Name)
         return
 
 
@@ -1905,7 +1910,7 @@ def ExportSettings_XL(Silent=False):
 
 
 def ImportSettings_XL():
-    from openpyxl import load_workbook
+    import ExternalSource_TB as ExternalSource
     import os.path
     import errno
 
@@ -1918,12 +1923,12 @@ def ImportSettings_XL():
             ]
             FileName = Standard_Functions.GetFileDialog(Filter, False)
             if FileName != "":
-                wb = load_workbook(str(FileName), read_only=True)
+                wb = ExternalSource.OpenWorkbook(str(FileName))
             if FileName == "":
                 return
         if USE_EXTERNAL_SOURCE is True:
             if os.path.exists(EXTERNAL_SOURCE_PATH) is True:
-                wb = load_workbook(str(EXTERNAL_SOURCE_PATH), read_only=True)
+                wb = ExternalSource.OpenWorkbook(str(EXTERNAL_SOURCE_PATH))
             if os.path.exists(EXTERNAL_SOURCE_PATH) is False:
                 Text = translate(
                     "TitleBlock Workbench",
@@ -1970,61 +1975,63 @@ def ImportSettings_XL():
                 )
                 Standard_Functions.Print(Text, "Log")
 
-        # Get the columns
-        FirstColumn = int(Standard_Functions.GetNumberFromLetter(StartCell[:1]))
-        SecondColumn = FirstColumn + 1
+        # Get the first column
+        FirstColumn = StartCell[:1]
+
+        # Read the names and values of the settings in one go
+        Rows = ExternalSource.ReadRows(
+            ws, FirstColumn + "1", NoColumns=2, MaxRows=998, StopAtEmpty=False
+        )
 
         # go through the excel until all settings are imported.
         counter = 0
 
-        for i in range(1, 1000):
-            Cell_Name = ws.cell(i, FirstColumn)
-            Cell_Value = ws.cell(i, SecondColumn)
+        for Cell_Name, Cell_Value in Rows:
 
             # region -- Import the external source settings
             #
             # Import USE_EXTERNAL_SOURCE
-            if Cell_Name.value == "UseExternalSource":
-                SetBoolSetting("UseExternalSource", Cell_Value.value)
+            if Cell_Name == "UseExternalSource":
+                SetBoolSetting("UseExternalSource", Cell_Value)
                 counter = counter + 1
 
             # This is desabled because the preference must be leading at all time.
             # The are not allowed to be overridden by importing the settings.
             # -----------------------------------------------------------
             # Import EXTERNAL_SOURCE_PATH
-            # if Cell_Name.value == "ExternalFile":
-            #     SetStringSetting("ExternalFile", str(Cell_Value.value))
+            # if Cell_Name == "ExternalFile":
+            #     SetStringSetting("ExternalFile", str(Cell_Value))
             #     counter = counter + 1
 
             # Import EXTERNAL_SOURCE_SHEET_NAME
-            # if Cell_Name.value == "SheetName":
-            #     SetStringSetting("SheetName", str(Cell_Value.value))
+            # if Cell_Name == "SheetName":
+            #     SetStringSetting("SheetName", str(Cell_Value))
             #     counter = counter + 1
 
             # Import EXTERNAL_SOURCE_STARTCELL
-            # if Cell_Name.value == "StartCell":
-            #     SetStringSetting("StartCell", str(Cell_Value.value))
+            # if Cell_Name == "StartCell":
+            #     SetStringSetting("StartCell", str(Cell_Value))
             #     counter = counter + 1
             # -----------------------------------------------------------
 
             # Import AUTOFILL_TITLEBLOCK
-            if Cell_Name.value == "AutoFillTitleBlock":
-                SetBoolSetting("AutoFillTitleBlock", Cell_Value.value)
+            if Cell_Name == "AutoFillTitleBlock":
+                SetBoolSetting("AutoFillTitleBlock", Cell_Value)
                 counter = counter + 1
 
             # Import IMPORT_SETTINGS_XL
-            if Cell_Name.value == "ImportSettingsXL":
-                SetBoolSetting("ImportSettingsXL", Cell_Value.value)
+            if Cell_Name == "ImportSettingsXL":
+                SetBoolSetting("ImportSettingsXL", Cell_Value)
                 counter = counter + 1
 
             # Import SHEETNAME_SETTINGS_XL
-            if Cell_Name.value == "SheetName_Settings":
-                SetStringSetting("SheetName_Settings", str(Cell_Value.value))
+            if Cell_Name == "SheetName_Settings":
+                SetStringSetting("SheetName_Settings", str(Cell_Value))
                 counter = counter + 1
 
             # Import SHEETNAME_STARTCELL_XL
-            if Cell_Name.value == "StartCell_Settings":
-                SetStringSetting("StartCell_Settings", str(Cell_Value.value))
+            if Cell_Name == "StartCell_Settings":
+                SetStringSetting("StartCell_Settings", str(Cell_Value))
                 counter = counter + 1
 
             # endregion
@@ -2032,13 +2039,13 @@ def ImportSettings_XL():
             # region -- Import the filename settings
             #
             # Import USE_FILENAME_DRAW_NO
-            if Cell_Name.value == "UseFileName":
-                SetBoolSetting("UseFileName", Cell_Value.value)
+            if Cell_Name == "UseFileName":
+                SetBoolSetting("UseFileName", Cell_Value)
                 counter = counter + 1
 
             # Import DRAW_NO_FiELD
-            if Cell_Name.value == "DrwNrFieldName":
-                SetStringSetting("DrwNrFieldName", str(Cell_Value.value))
+            if Cell_Name == "DrwNrFieldName":
+                SetStringSetting("DrwNrFieldName", str(Cell_Value))
                 counter = counter + 1
 
             # endregion
@@ -2046,13 +2053,13 @@ def ImportSettings_XL():
             # region -- Import the pagename settings
             #
             # Import USE_FILENAME_DRAW_NO
-            if Cell_Name.value == "UsePageName":
-                SetBoolSetting("UsePageName", Cell_Value.value)
+            if Cell_Name == "UsePageName":
+                SetBoolSetting("UsePageName", Cell_Value)
                 counter = counter + 1
 
             # Import DRAW_NO_FiELD
-            if Cell_Name.value == "DrwNrFieldName_Page":
-                SetStringSetting("DrwNrFieldName_Page", str(Cell_Value.value))
+            if Cell_Name == "DrwNrFieldName_Page":
+                SetStringSetting("DrwNrFieldName_Page", str(Cell_Value))
                 counter = counter + 1
 
             # endregion
@@ -2060,23 +2067,23 @@ def ImportSettings_XL():
             # region -- Import the mapping settings
             #
             # Import MAP_LENGTH
-            if Cell_Name.value == "MapLength":
-                SetStringSetting("MapLength", str(Cell_Value.value))
+            if Cell_Name == "MapLength":
+                SetStringSetting("MapLength", str(Cell_Value))
                 counter = counter + 1
 
             # Import MAP_ANGLE
-            if Cell_Name.value == "MapAngle":
-                SetStringSetting("MapAngle", str(Cell_Value.value))
+            if Cell_Name == "MapAngle":
+                SetStringSetting("MapAngle", str(Cell_Value))
                 counter = counter + 1
 
             # Import MAP_MASS
-            if Cell_Name.value == "MapMass":
-                SetStringSetting("MapMass", str(Cell_Value.value))
+            if Cell_Name == "MapMass":
+                SetStringSetting("MapMass", str(Cell_Value))
                 counter = counter + 1
 
             # Import MAP_NOSHEETS
-            if Cell_Name.value == "MapNoSheets":
-                SetStringSetting("MapNoSheets", str(Cell_Value.value))
+            if Cell_Name == "MapNoSheets":
+                SetStringSetting("MapNoSheets", str(Cell_Value))
                 counter = counter + 1
 
             # endregion
@@ -2084,48 +2091,48 @@ def ImportSettings_XL():
             # region -- Import the document information settings
             #
             # Import DOCINFO_NAME
-            if Cell_Name.value == "DocInfo_Name":
-                SetStringSetting("DocInfo_Name", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_Name":
+                SetStringSetting("DocInfo_Name", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_CREATEDBY
-            if Cell_Name.value == "DocInfo_CreatedBy":
-                SetStringSetting("DocInfo_CreatedBy", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_CreatedBy":
+                SetStringSetting("DocInfo_CreatedBy", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_CREATEDDATE
-            if Cell_Name.value == "DocInfo_CreatedDate":
-                SetStringSetting("DocInfo_CreatedDate", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_CreatedDate":
+                SetStringSetting("DocInfo_CreatedDate", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_LASTMODIFIEDBY
-            if Cell_Name.value == "DocInfo_LastModifiedBy":
-                SetStringSetting("DocInfo_LastModifiedBy", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_LastModifiedBy":
+                SetStringSetting("DocInfo_LastModifiedBy", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_LASTMODIFIEDDATE
-            if Cell_Name.value == "DocInfo_LastModifiedDate":
-                SetStringSetting("DocInfo_LastModifiedDate", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_LastModifiedDate":
+                SetStringSetting("DocInfo_LastModifiedDate", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_COMPANY
-            if Cell_Name.value == "DocInfo_Company":
-                SetStringSetting("DocInfo_Company", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_Company":
+                SetStringSetting("DocInfo_Company", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_LICENSE
-            if Cell_Name.value == "DocInfo_License":
-                SetStringSetting("DocInfo_License", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_License":
+                SetStringSetting("DocInfo_License", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_LICENSEURL
-            if Cell_Name.value == "DocInfo_LicenseURL":
-                SetStringSetting("DocInfo_LicenseURL", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_LicenseURL":
+                SetStringSetting("DocInfo_LicenseURL", str(Cell_Value))
                 counter = counter + 1
 
             # DOCINFO_COMMENT
-            if Cell_Name.value == "DocInfo_Comment":
-                SetStringSetting("DocInfo_Comment", str(Cell_Value.value))
+            if Cell_Name == "DocInfo_Comment":
+                SetStringSetting("DocInfo_Comment", str(Cell_Value))
                 counter = counter + 1
 
             # endregion
@@ -2133,23 +2140,23 @@ def ImportSettings_XL():
             # region -- Import the Include settings
             #
             # Import INCLUDE_LENGTH
-            if Cell_Name.value == "IncludeLength":
-                SetBoolSetting("IncludeLength", Cell_Value.value)
+            if Cell_Name == "IncludeLength":
+                SetBoolSetting("IncludeLength", Cell_Value)
                 counter = counter + 1
 
             # Import INCLUDE_ANGLE
-            if Cell_Name.value == "IncludeAngle":
-                SetBoolSetting("IncludeAngle", Cell_Value.value)
+            if Cell_Name == "IncludeAngle":
+                SetBoolSetting("IncludeAngle", Cell_Value)
                 counter = counter + 1
 
             # Import INCLUDE_MASS
-            if Cell_Name.value == "IncludeMass":
-                SetBoolSetting("IncludeMass", Cell_Value.value)
+            if Cell_Name == "IncludeMass":
+                SetBoolSetting("IncludeMass", Cell_Value)
                 counter = counter + 1
 
             # Import INCLUDE_NO_SHEETS
-            if Cell_Name.value == "IncludeNoOfSheets":
-                SetBoolSetting("IncludeNoOfSheets", Cell_Value.value)
+            if Cell_Name == "IncludeNoOfSheets":
+                SetBoolSetting("IncludeNoOfSheets", Cell_Value)
                 counter = counter + 1
 
             # endregion
@@ -2158,37 +2165,37 @@ def ImportSettings_XL():
             #
             # Import USE_SIMPLE_LIST
             if Cell_Name == "UseSimpleList":
-                SetBoolSetting("UseSimpleList", Cell_Value.value)
+                SetBoolSetting("UseSimpleList", Cell_Value)
                 counter = counter + 1
 
             # Import USE_EXTERNAL_SOURCE_SIMPLE_LIST
             if Cell_Name == "UseExternalSource_SimpleList":
-                SetBoolSetting("UseExternalSource_SimpleList", Cell_Value.value)
+                SetBoolSetting("UseExternalSource_SimpleList", Cell_Value)
                 counter = counter + 1
 
             # EXTERNAL_FILE_SIMPLE_LIST
             if Cell_Name == "ExternalFile_SimpleList":
-                SetStringSetting("ExternalFile_SimpleList", str(Cell_Value.value))
+                SetStringSetting("ExternalFile_SimpleList", str(Cell_Value))
                 counter = counter + 1
 
             # SHEETNAME_SIMPLE_LIST
             if Cell_Name == "SheetName_SimpleList":
-                SetStringSetting("SheetName_SimpleList", str(Cell_Value.value))
+                SetStringSetting("SheetName_SimpleList", str(Cell_Value))
                 counter = counter + 1
 
             # STARTCELL_SIMPLE_LIST
             if Cell_Name == "StartCell_SimpleList":
-                SetStringSetting("StartCell_SimpleList", str(Cell_Value.value))
+                SetStringSetting("StartCell_SimpleList", str(Cell_Value))
                 counter = counter + 1
 
             # PROPERTY_NAME_SIMPLE_LIST
             if Cell_Name == "PropertyName_SimpleList":
-                SetStringSetting("PropertyName_SimpleList", str(Cell_Value.value))
+                SetStringSetting("PropertyName_SimpleList", str(Cell_Value))
                 counter = counter + 1
 
             # Import USE_PAGE_NAMES_SIMPLE_LIST
             if Cell_Name == "UsePageNames_SimpleList":
-                SetBoolSetting("UsePageNames_SimpleList", Cell_Value.value)
+                SetBoolSetting("UsePageNames_SimpleList", Cell_Value)
                 counter = counter + 1
             # endregion
 
@@ -2196,42 +2203,42 @@ def ImportSettings_XL():
             #
             # Import USE_ADVANCED_LIST
             if Cell_Name == "UseAdvancedList":
-                SetBoolSetting("UseAdvancedList", Cell_Value.value)
+                SetBoolSetting("UseAdvancedList", Cell_Value)
                 counter = counter + 1
 
             # Import USE_EXTERNAL_SOURCE_ADVANCED_LIST
             if Cell_Name == "UseExternalSource_AdvancedList":
-                SetBoolSetting("UseExternalSource_AdvancedList", Cell_Value.value)
+                SetBoolSetting("UseExternalSource_AdvancedList", Cell_Value)
                 counter = counter + 1
 
             # EXTERNAL_FILE_ADVANCED_LIST
             if Cell_Name == "ExternalFile_AdvancedList":
-                SetStringSetting("ExternalFile_AdvancedList", str(Cell_Value.value))
+                SetStringSetting("ExternalFile_AdvancedList", str(Cell_Value))
                 counter = counter + 1
 
             # SHEETNAME_ADVANCED_LIST
             if Cell_Name == "SheetName_AdvancedList":
-                SetStringSetting("SheetName_AdvancedList", str(Cell_Value.value))
+                SetStringSetting("SheetName_AdvancedList", str(Cell_Value))
                 counter = counter + 1
 
             # STARTCELL_ADVANCED_LIST
             if Cell_Name == "StartCell_AdvancedList":
-                SetStringSetting("StartCell_AdvancedList", str(Cell_Value.value))
+                SetStringSetting("StartCell_AdvancedList", str(Cell_Value))
                 counter = counter + 1
 
             # PROPERTY_NAME_ADVANCED_LIST
             if Cell_Name == "PropertyName_AdvancedList":
-                SetStringSetting("PropertyName_AdvancedList", str(Cell_Value.value))
+                SetStringSetting("PropertyName_AdvancedList", str(Cell_Value))
                 counter = counter + 1
 
             # SORTING_PREFIX_ADVANCED_LIST
             if Cell_Name == "SortingPrefix_AdvancedList":
-                SetStringSetting("SortingPrefix_AdvancedList", str(Cell_Value.value))
+                SetStringSetting("SortingPrefix_AdvancedList", str(Cell_Value))
                 counter = counter + 1
 
             # Import USE_PAGE_NAMES_ADVANCED_LIST
             if Cell_Name == "UsePageNames_AdvancedList":
-                SetBoolSetting("UsePageNames_AdvancedList", Cell_Value.value)
+                SetBoolSetting("UsePageNames_AdvancedList", Cell_Value)
                 counter = counter + 1
             # endregion
 
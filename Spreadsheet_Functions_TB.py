@@ -0,0 +1,313 @@
+# ***************************************************************************
+# *   Copyright (c) 2023 Paul Ebbers paul.ebbers@gmail.com                  *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+
+# Functions to read the titleblock spreadsheet in one pass.
+# Every call to sheet.getContents() goes through the C++ Spreadsheet API.
+# Functions that need the same cells for every page, read them here once and work with the result.
+
+import os
+import tempfile
+from typing import NamedTuple
+
+
+# A single row of the titleblock spreadsheet.
+# The values are the raw contents of the cells, like sheet.getContents() returns them.
+class TitleBlockRow(NamedTuple):
+    Row: int
+    Name: str
+    Value: str
+    Increase: str
+    Factor: str
+    Remarks: str
+
+
+def GetTitleBlockSnapshot(sheet, MaxRows: int = 1000) -> tuple:
+    """Read the columns A-E of the titleblock spreadsheet once.
+
+    Args:
+        sheet (object): FreeCAD spreadsheet object.\n
+        MaxRows (int, optional): Maximum number of rows to read. Defaults to 1000.\n
+
+    Returns:
+        tuple: an immutable table with a TitleBlockRow for every property.
+        The header row is skipped. Reading stops at the first empty cell in column A.
+    """
+    result = []
+    for RowNum in range(2, MaxRows + 2):
+        # Get the name of the property. If it is empty, this is the end of the table.
+        Name = str(sheet.getContents(f"A{RowNum}"))
+        if Name == "":
+            break
+
+        result.append(
+            TitleBlockRow(
+                Row=RowNum,
+                Name=Name,
+                Value=str(sheet.getContents(f"B{RowNum}")),
+                Increase=str(sheet.getContents(f"C{RowNum}")),
+                Factor=str(sheet.getContents(f"D{RowNum}")),
+                Remarks=str(sheet.getContents(f"E{RowNum}")),
+            )
+        )
+    return tuple(result)
+
+
+# The cached property row indexes. The key is (document name, sheet name).
+# The value is (index, last row, name in the last row).
+_PropertyRowIndexCache = {}
+
+
+def GetPropertyRowIndex(sheet, MaxRows: int = 1000) -> dict:
+    """Read column A of the titleblock spreadsheet once and create an index.
+    The index is cached until InvalidatePropertyRowIndex is called for the sheet.
+    Don't change the returned dict, it is shared by all callers.
+
+    Args:
+        sheet (object): FreeCAD spreadsheet object.\n
+        MaxRows (int, optional): Maximum number of rows to read. Defaults to 1000.\n
+
+    Returns:
+        dict: property name -> list of row numbers. A leading ' is removed from the property name.
+        Reading stops at the first empty cell in column A.
+    """
+    Key = _GetSheetKey(sheet)
+    Cached = _PropertyRowIndexCache.get(Key)
+    if Cached is not None:
+        result, LastRow, LastName = Cached
+        # A quick check for changes that are not invalidated: the end of the table must be the same.
+        if (
+            str(sheet.getContents(f"A{LastRow}")) == LastName
+            and str(sheet.getContents(f"A{LastRow + 1}")) == ""
+        ):
+            return result
+
+    result, LastRow = BuildPropertyRowIndex(sheet, MaxRows)
+    _PropertyRowIndexCache[Key] = (
+        result,
+        LastRow,
+        str(sheet.getContents(f"A{LastRow}")),
+    )
+    return result
+
+
+def BuildPropertyRowIndex(sheet, MaxRows: int = 1000) -> tuple:
+    """Read column A of the titleblock spreadsheet and create an index, without the cache.
+    The sheet can also be a CellWriter, to include the cells that are not written yet.
+
+    Args:
+        sheet (object): FreeCAD spreadsheet object or CellWriter.\n
+        MaxRows (int, optional): Maximum number of rows to read. Defaults to 1000.\n
+
+    Returns:
+        tuple: the index (property name -> list of row numbers) and the last row of the table.
+    """
+    result = {}
+    LastRow = 1
+    for RowNum in range(2, MaxRows + 2):
+        # Get the name of the property. If it is empty, this is the end of the table.
+        Name = str(sheet.getContents(f"A{RowNum}"))
+        if Name == "":
+            break
+        LastRow = RowNum
+        if Name.startswith("'"):
+            Name = Name[1:]
+        result.setdefault(Name, []).append(RowNum)
+    return result, LastRow
+
+
+def InvalidatePropertyRowIndex(sheet=None):
+    """Clear the cached property row index of the sheet. If sheet is None, clear all the cached indexes"""
+    if sheet is None:
+        _PropertyRowIndexCache.clear()
+        return
+    _PropertyRowIndexCache.pop(_GetSheetKey(sheet), None)
+    return
+
+
+def _GetSheetKey(sheet) -> tuple:
+    try:
+        return (sheet.Document.Name, sheet.Name)
+    except Exception:
+        return (None, id(sheet))
+
+
+class CellWriter:
+    """Collects the cells to write to a spreadsheet and writes them all at once.
+    Use it like a spreadsheet: Writer.set("A1", "Property Name"), followed by Writer.Flush().
+    Writer.getContents() returns the contents including the cells that are not written yet.
+    Writer.Update() only writes a cell if its content differs from the spreadsheet.
+    With Cleared=True, the spreadsheet is treated as empty while the cells are collected.
+    Use this to create the contents again, followed by Writer.Rewrite() or by sheet.clearAll() and Writer.Flush().
+    """
+
+    def __init__(self, sheet, Cleared: bool = False):
+        self.sheet = sheet
+        self.Cleared = Cleared
+        # The cells to write: address -> content
+        self.Cells = {}
+
+    def set(self, Address: str, Content: str):
+        self.Cells[Address] = str(Content)
+
+    def Update(self, Address: str, Content: str):
+        # Only write the cell if the content differs from the spreadsheet.
+        # A change that is already collected for this cell, is dropped when the cell keeps its content.
+        Content = str(Content)
+        if self._GetSheetContents(Address) == Content:
+            self.Cells.pop(Address, None)
+        else:
+            self.Cells[Address] = Content
+
+    def getContents(self, Address: str) -> str:
+        # The contents that will be written, or else the current contents of the spreadsheet
+        if Address in self.Cells:
+            return self.Cells[Address]
+        return self._GetSheetContents(Address)
+
+    def _GetSheetContents(self, Address: str) -> str:
+        if self.Cleared is True:
+            return ""
+        return self.sheet.getContents(Address)
+
+    def Flush(self, Replace: bool = False) -> int:
+        """Write the collected cells to the spreadsheet.
+
+        Args:
+            Replace (bool, optional): Replace all the contents of the spreadsheet.
+            The cells are imported at once from a temporary file.
+            If False, the cells are set one by one in a single undo transaction,
+            or in the transaction that is already open. Defaults to False.\n
+
+        Returns:
+            int: The number of cells written.
+        """
+        Count = len(self.Cells)
+        if Count == 0:
+            return 0
+
+        IsImported = False
+        if Replace is True:
+            try:
+                IsImported = self._Import()
+            except Exception:
+                IsImported = False
+
+        if IsImported is False:
+            self._SetCells(self.Cells)
+
+        self.Cells = {}
+        # Column A can be changed, so the property row index is outdated
+        InvalidatePropertyRowIndex(self.sheet)
+        return Count
+
+    def Rewrite(self) -> list:
+        """Replace all the contents of the spreadsheet with the collected cells, without clearing the sheet.
+        Only the cells that change are written and the cells that are not collected are cleared.
+        The other cells keep their contents and their styles.
+
+        Returns:
+            list: The addresses of the changed cells.
+            None if the cells of the spreadsheet cannot be read by this version of FreeCAD.
+            In that case nothing is written.
+        """
+        if hasattr(self.sheet, "getNonEmptyCells") is False:
+            return None
+
+        Changes = {}
+        for Address in self.sheet.getNonEmptyCells():
+            if Address not in self.Cells:
+                Changes[Address] = ""
+        for Address, Content in self.Cells.items():
+            if self.sheet.getContents(Address) != Content:
+                Changes[Address] = Content
+
+        if len(Changes) > 0:
+            self._SetCells(Changes)
+            InvalidatePropertyRowIndex(self.sheet)
+        self.Cells = {}
+        return list(Changes)
+
+    def _SetCells(self, Cells: dict):
+        doc = self.sheet.Document
+        # If the caller already has a transaction open, write the cells in it.
+        # Committing it here would split the undo step of the caller.
+        OwnTransaction = doc.HasPendingTransaction is False
+        if OwnTransaction is True:
+            doc.openTransaction("Write cells")
+        try:
+            for Address, Content in Cells.items():
+                self.sheet.set(Address, Content)
+        finally:
+            if OwnTransaction is True:
+                doc.commitTransaction()
+        return
+
+    def _Import(self) -> bool:
+        # Create a grid of all the cells, starting at A1
+        Grid = {}
+        NoColumns = 0
+        for Address, Content in self.Cells.items():
+            Column, Row = SplitCellAddress(Address)
+            Grid.setdefault(Row, {})[Column] = Content
+            NoColumns = max(NoColumns, Column)
+
+        # Write the grid as a tab separated file.
+        # Escape the escape character, quotes and new lines. Fields with a tab are quoted.
+        Lines = []
+        for Row in range(1, max(Grid.keys()) + 1):
+            Fields = []
+            for Column in range(1, NoColumns + 1):
+                Content = Grid.get(Row, {}).get(Column, "")
+                Content = (
+                    Content.replace("\\", "\\\\")
+                    .replace('"', '\\"')
+                    .replace("\n", "\\n")
+                )
+                if "\t" in Content:
+                    Content = f'"{Content}"'
+                Fields.append(Content)
+            Lines.append("\t".join(Fields))
+
+        File = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", encoding="utf-8", newline="\n", delete=False
+        )
+        try:
+            File.write("\n".join(Lines) + "\n")
+            File.close()
+            self.sheet.importFile(File.name, "\t", '"', "\\")
+        finally:
+            File.close()
+            os.remove(File.name)
+        return True
+
+
+def SplitCellAddress(Address: str) -> tuple:
+    """Split a cell address like "AB12" into a column number and a row number, like (28, 12)"""
+    Column = 0
+    Index = 0
+    for Index, Character in enumerate(Address):
+        if Character.isalpha() is False:
+            break
+        Column = Column * 26 + (ord(Character.upper()) - ord("A") + 1)
+    return Column, int(Address[Index:])
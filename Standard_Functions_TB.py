@@ -381,6 +381,44 @@ def SetColumnWidth_SpreadSheet(
     return True
 
 
+def AutofitColumns_SpreadSheet(
+    sheet, columns: list, rows: list, factor: int = 10
+) -> bool:
+    """Set the width of the columns to fit the longest text, in a single pass.
+    Gives the same widths as calling SetColumnWidth_SpreadSheet for every cell,
+    but each column width is set only once and the sheet is recomputed only once.
+
+    Args:
+        sheet (_type_): FreeCAD spreadsheet object.\n
+        columns (list): The columns to fit. must be like ["A", "B"], etc.\n
+        rows (list): The row numbers of the cells to calculate the width from.\n
+        factor (int, optional): to increase the stringlength with a factor. Defaults to 10.\n
+
+    Returns:
+        bool: returns True or False
+    """
+    try:
+        for column in columns:
+            # Get the longest text in the column
+            maxLength = 0
+            for row in rows:
+                maxLength = max(maxLength, len(sheet.getContents(f"{column}{row}")))
+
+            # Calculate the text length needed.
+            length = int(maxLength * factor)
+
+            # Set the column width
+            if sheet.getColumnWidth(column) < length:
+                sheet.setColumnWidth(column, length)
+
+        # Recompute the sheet
+        sheet.recompute()
+    except Exception:
+        return False
+
+    return True
+
+
 def Print(Input: str, Type: str = ""):
     """_summary_
 
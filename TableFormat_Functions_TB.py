@@ -43,11 +43,106 @@ def FontStyle(Bold: bool, Italic: bool, UnderLine: bool) -> str:
     return result
 
 
+# The name of the hidden property of the spreadsheet with the style fingerprint of the table
+STYLE_FINGERPRINT_PROPERTY = "TableStyleFingerprint"
+
+
+def GetStyleFingerprint(sheet, HeaderRange, TableRange, FirstColumnRange) -> str:
+    """Create a fingerprint of everything that determines the formatting of a table:
+    the ranges, the style settings and the number of rows in the table.
+    The values in the table are not part of it. Use FormatTableRows for rows that are changed.
+
+    Args:
+        sheet (object): FreeCAD sheet object, or a CellWriter for a table that is not written yet.\n
+        HeaderRange (string): Range for the header.\n
+        TableRange (string): Range for the table\n
+        FirstColumnRange (string): Range for the first column\n
+
+    Returns:
+        str: The fingerprint.
+    """
+    import hashlib
+    import Standard_Functions_TB as Standard_Functions
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_UNDERLINE
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_ITALIC
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_BOLD
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_UNDERLINE
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_ITALIC
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_BOLD
+    from Settings_TB import SPREADSHEET_TABLEFOREGROUND
+    from Settings_TB import SPREADSHEET_TABLEBACKGROUND_2
+    from Settings_TB import SPREADSHEET_TABLEBACKGROUND_1
+    from Settings_TB import SPREADSHEET_HEADERFONTSTYLE_UNDERLINE
+    from Settings_TB import SPREADSHEET_HEADERFONTSTYLE_ITALIC
+    from Settings_TB import SPREADSHEET_HEADERFONTSTYLE_BOLD
+    from Settings_TB import SPREADSHEET_HEADERFOREGROUND
+    from Settings_TB import SPREADSHEET_HEADERBACKGROUND
+    from Settings_TB import AUTOFIT_FACTOR
+
+    Inputs = [
+        HeaderRange,
+        TableRange,
+        FirstColumnRange,
+        SPREADSHEET_COLUMNFONTSTYLE_UNDERLINE,
+        SPREADSHEET_COLUMNFONTSTYLE_ITALIC,
+        SPREADSHEET_COLUMNFONTSTYLE_BOLD,
+        SPREADSHEET_TABLEFONTSTYLE_UNDERLINE,
+        SPREADSHEET_TABLEFONTSTYLE_ITALIC,
+        SPREADSHEET_TABLEFONTSTYLE_BOLD,
+        SPREADSHEET_TABLEFOREGROUND,
+        SPREADSHEET_TABLEBACKGROUND_2,
+        SPREADSHEET_TABLEBACKGROUND_1,
+        SPREADSHEET_HEADERFONTSTYLE_UNDERLINE,
+        SPREADSHEET_HEADERFONTSTYLE_ITALIC,
+        SPREADSHEET_HEADERFONTSTYLE_BOLD,
+        SPREADSHEET_HEADERFOREGROUND,
+        SPREADSHEET_HEADERBACKGROUND,
+        AUTOFIT_FACTOR,
+    ]
+
+    # The number of rows: the last row of the table with a value in the first column.
+    # Search from the end of the table, so normally only one cell is read.
+    Column = Standard_Functions.RemoveNumbersFromString(TableRange.split(":")[0])
+    RowStart = int(Standard_Functions.RemoveLettersFromString(TableRange.split(":")[0]))
+    RowEnd = int(Standard_Functions.RemoveLettersFromString(TableRange.split(":")[1]))
+    LastRow = RowStart - 1
+    for Row in range(RowEnd, RowStart - 1, -1):
+        if sheet.getContents(f"{Column}{Row}") != "":
+            LastRow = Row
+            break
+    Inputs.append(LastRow)
+
+    return hashlib.sha1(repr(Inputs).encode("utf-8")).hexdigest()
+
+
+def SetStyleFingerprint(sheet, Fingerprint: str):
+    """Store the style fingerprint in a hidden property of the spreadsheet.
+
+    Args:
+        sheet (object): FreeCAD sheet object\n
+        Fingerprint (str): The fingerprint from GetStyleFingerprint.\n
+    """
+    if hasattr(sheet, STYLE_FINGERPRINT_PROPERTY) is False:
+        sheet.addProperty(
+            "App::PropertyString",
+            STYLE_FINGERPRINT_PROPERTY,
+            "TitleBlock",
+            "The style fingerprint of the table. Used to skip formatting an unchanged table.",
+        )
+        # Hide the property in the property editor
+        sheet.setEditorMode(STYLE_FINGERPRINT_PROPERTY, 2)
+    if getattr(sheet, STYLE_FINGERPRINT_PROPERTY) != Fingerprint:
+        setattr(sheet, STYLE_FINGERPRINT_PROPERTY, Fingerprint)
+    return
+
+
 def FormatTable(
     sheet,
     HeaderRange,
     TableRange,
     FirstColumnRange,
+    CheckExisting: bool = False,
+    ChangedRows: list = None,
 ):
     """_summary_
 
@@ -56,6 +151,10 @@ def FormatTable(
         HeaderRange (string): Range for the header.
         TableRange (string): Range for the table
         FirstColumnRange (string): Range for the first column
+        CheckExisting (bool, optional): Skip the formatting that is already done.
+        Only use this for an existing table that is likely formatted already. Defaults to False.
+        ChangedRows (list, optional): The rows that are new or changed. When the table is already formatted,
+        only these rows are used to widen the columns. Defaults to None.
     """
     import Standard_Functions_TB as Standard_Functions
     from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_UNDERLINE
@@ -73,6 +172,42 @@ def FormatTable(
     from Settings_TB import SPREADSHEET_HEADERFOREGROUND
     from Settings_TB import SPREADSHEET_HEADERBACKGROUND
     from Settings_TB import AUTOFIT_FACTOR
+    from Settings_TB import ENABLE_DEBUG
+
+    # Get the columns of the table
+    Columns = [
+        Standard_Functions.GetLetterFromNumber(j)
+        for j in range(
+            Standard_Functions.GetNumberFromLetter(
+                Standard_Functions.RemoveNumbersFromString(TableRange.split(":")[0])
+            ),
+            Standard_Functions.GetNumberFromLetter(
+                Standard_Functions.RemoveNumbersFromString(TableRange.split(":")[1])
+            )
+            + 1,
+        )
+    ]
+
+    # If the ranges, the style settings and the number of rows are the same as the last time,
+    # the table is already formatted. Only widen the columns for the rows that are new or changed.
+    # A new or cleared spreadsheet has no formatting, so it is always formatted.
+    Fingerprint = GetStyleFingerprint(sheet, HeaderRange, TableRange, FirstColumnRange)
+    if (
+        CheckExisting is True
+        and getattr(sheet, STYLE_FINGERPRINT_PROPERTY, None) == Fingerprint
+    ):
+        if ChangedRows is not None and len(ChangedRows) > 0:
+            Standard_Functions.AutofitColumns_SpreadSheet(
+                sheet=sheet,
+                columns=Columns,
+                rows=ChangedRows,
+                factor=AUTOFIT_FACTOR,
+            )
+        if ENABLE_DEBUG is True:
+            Standard_Functions.Print(
+                f"The table in {sheet.Label} is unchanged. Formatting skipped.", "Log"
+            )
+        return sheet
 
     # Format the header ------------------------------------------------------------------------------------------------
     # Set the font style for the header
@@ -114,32 +249,24 @@ def FormatTable(
         + 1
     )
 
-    # Calculate the delta between the start and end of the table in vertical direction (Rows).
-    DeltaRange = TableRangeRowEnd - TableRangeRowStart + 1
-    # Go through the range
-    for i in range(1, DeltaRange + 2, 2):
-        # Correct the position
-        j = i - 1
-        # Define the first row
-        FirstRow = f"{TableRangeColumnStart}{str(j+TableRangeRowStart)}:{TableRangeColumnEnd}{str(j+TableRangeRowStart)}"
-        # define the first cell in the first column
-        Firstcell = f"{TableRangeColumnStart}{j+TableRangeRowStart}"
-
-        # Define the second row
-        SecondRow = f"{TableRangeColumnStart}{str(j+TableRangeRowStart+1)}:{TableRangeColumnEnd}{str(j+TableRangeRowStart+1)}"
-
-        # define the second cell in the first column
-        Secondcell = f"{TableRangeColumnStart}{j+1+TableRangeRowStart}"
-
-        # if the first and second rows are within the range, set the colors
-        if j <= DeltaRange:
-            if sheet.getContents(Firstcell) != "":
-                sheet.setBackground(FirstRow, SPREADSHEET_TABLEBACKGROUND_1)
-                sheet.setForeground(FirstRow, SPREADSHEET_TABLEFOREGROUND)
-        if j + 1 <= DeltaRange:
-            if sheet.getContents(Secondcell) != "":
-                sheet.setBackground(SecondRow, SPREADSHEET_TABLEBACKGROUND_2)
-                sheet.setForeground(SecondRow, SPREADSHEET_TABLEFOREGROUND)
+    # Compute the colors of the rows in memory. Rows with an empty first cell are not colored.
+    # The colors are set with as few range calls as possible by SetRowColors.
+    Colors = {}
+    for Row in range(TableRangeRowStart, TableRangeRowEnd + 1):
+        if sheet.getContents(f"{TableRangeColumnStart}{Row}") != "":
+            if (Row - TableRangeRowStart) % 2 == 0:
+                Colors[Row] = (
+                    SPREADSHEET_TABLEBACKGROUND_1,
+                    SPREADSHEET_TABLEFOREGROUND,
+                )
+            else:
+                Colors[Row] = (
+                    SPREADSHEET_TABLEBACKGROUND_2,
+                    SPREADSHEET_TABLEFOREGROUND,
+                )
+    SetRowColors(
+        sheet, Colors, TableRangeColumnStart, TableRangeColumnEnd, CheckExisting
+    )
 
     # Set the font style for the table
     sheet.setStyle(
@@ -174,18 +301,257 @@ def FormatTable(
     )
 
     # Set the column width
-    for i in range(TableRangeRowStart - 1, TableRangeRowEnd + 1):
-        for j in range(
-            Standard_Functions.GetNumberFromLetter(TableRangeColumnStart),
-            Standard_Functions.GetNumberFromLetter(TableRangeColumnEnd) + 1,
-        ):
-            Standard_Functions.SetColumnWidth_SpreadSheet(
-                sheet=sheet,
-                column=Standard_Functions.GetLetterFromNumber(j),
-                cellValue=sheet.getContents(
-                    f"{Standard_Functions.GetLetterFromNumber(j)}{i}"
-                ),
-                factor=AUTOFIT_FACTOR,
-            )
+    Standard_Functions.AutofitColumns_SpreadSheet(
+        sheet=sheet,
+        columns=Columns,
+        rows=range(TableRangeRowStart - 1, TableRangeRowEnd + 1),
+        factor=AUTOFIT_FACTOR,
+    )
     # ------------------------------------------------------------------------------------------------------------------
+
+    # Store the fingerprint, so the next time the formatting can be skipped if nothing has changed
+    SetStyleFingerprint(sheet, Fingerprint)
+    return sheet
+
+
+def WriteTable(Writer, HeaderRange, TableRange, FirstColumnRange) -> int:
+    """Write a table that is created again to its spreadsheet and format it.
+    If the table has the same layout as the last time it was formatted, the formatting is kept.
+    Then only the cells that are changed are written, and only the changed rows are formatted again.
+    Otherwise the spreadsheet is cleared, all the cells are written and the whole table is formatted.
+
+    Args:
+        Writer (object): A CellWriter with Cleared=True, with all the cells of the table.\n
+        HeaderRange (string): Range for the header.\n
+        TableRange (string): Range for the table\n
+        FirstColumnRange (string): Range for the first column\n
+
+    Returns:
+        int: The number of cells written.
+    """
+    import Standard_Functions_TB as Standard_Functions
+    import Spreadsheet_Functions_TB as Spreadsheet_Functions
+    from Settings_TB import ENABLE_DEBUG
+
+    sheet = Writer.sheet
+
+    # The fingerprint of the new table, from the collected cells
+    Fingerprint = GetStyleFingerprint(Writer, HeaderRange, TableRange, FirstColumnRange)
+    if getattr(sheet, STYLE_FINGERPRINT_PROPERTY, None) == Fingerprint:
+        ChangedCells = Writer.Rewrite()
+        if ChangedCells is not None:
+            if ENABLE_DEBUG is True:
+                Standard_Functions.Print(
+                    f"The layout of the table in {sheet.Label} is unchanged. "
+                    + f"{len(ChangedCells)} cells are written.",
+                    "Log",
+                )
+
+            # A cell that is cleared loses its style. Format the changed rows again.
+            # This also widens the columns for the changed values.
+            RowStart = int(
+                Standard_Functions.RemoveLettersFromString(TableRange.split(":")[0])
+            )
+            RowEnd = int(
+                Standard_Functions.RemoveLettersFromString(TableRange.split(":")[1])
+            )
+            ChangedRows = sorted(
+                set(
+                    Spreadsheet_Functions.SplitCellAddress(Address)[1]
+                    for Address in ChangedCells
+                )
+            )
+            if len(ChangedRows) > 0 and ChangedRows[0] < RowStart:
+                # The header is changed. Format the whole table.
+                FormatTable(sheet, HeaderRange, TableRange, FirstColumnRange)
+            else:
+                Rows = [Row for Row in ChangedRows if Row <= RowEnd]
+                if len(Rows) > 0:
+                    FormatTableRows(sheet=sheet, Rows=Rows, TableRange=TableRange)
+            return len(ChangedCells)
+
+    # A new layout. Create the table again.
+    sheet.clearAll()
+    NoCells = Writer.Flush(Replace=True)
+    FormatTable(sheet, HeaderRange, TableRange, FirstColumnRange)
+    return NoCells
+
+
+def FormatTableRows(sheet, Rows: list, TableRange: str):
+    """Format only the given rows of a table. Use this when rows are added to an existing table.
+
+    Args:
+        sheet (object): FreeCAD sheet object
+        Rows (list): The row numbers to format
+        TableRange (string): Range for the whole table, without the header
+    """
+    import Standard_Functions_TB as Standard_Functions
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_UNDERLINE
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_ITALIC
+    from Settings_TB import SPREADSHEET_COLUMNFONTSTYLE_BOLD
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_UNDERLINE
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_ITALIC
+    from Settings_TB import SPREADSHEET_TABLEFONTSTYLE_BOLD
+    from Settings_TB import SPREADSHEET_TABLEFOREGROUND
+    from Settings_TB import SPREADSHEET_TABLEBACKGROUND_2
+    from Settings_TB import SPREADSHEET_TABLEBACKGROUND_1
+    from Settings_TB import AUTOFIT_FACTOR
+
+    # Get the first and last column and the first row of the table
+    TableRangeColumnStart = Standard_Functions.RemoveNumbersFromString(
+        TableRange.split(":")[0]
+    )
+    TableRangeRowStart = int(
+        Standard_Functions.RemoveLettersFromString(TableRange.split(":")[0])
+    )
+    TableRangeColumnEnd = Standard_Functions.RemoveNumbersFromString(
+        TableRange.split(":")[1]
+    )
+
+    # Use the same alternating colors as FormatTable
+    Colors = {}
+    for Row in Rows:
+        if (Row - TableRangeRowStart) % 2 == 0:
+            Colors[Row] = (SPREADSHEET_TABLEBACKGROUND_1, SPREADSHEET_TABLEFOREGROUND)
+        else:
+            Colors[Row] = (SPREADSHEET_TABLEBACKGROUND_2, SPREADSHEET_TABLEFOREGROUND)
+    # The rows are new, so they have no colors yet
+    SetRowColors(
+        sheet, Colors, TableRangeColumnStart, TableRangeColumnEnd, CheckExisting=False
+    )
+
+    # Get the second column
+    TableRangeSecondColumn = Standard_Functions.GetLetterFromNumber(
+        Standard_Functions.GetNumberFromLetter(TableRangeColumnStart) + 1
+    )
+
+    # Set the font style and the alignment once for each block of consecutive rows
+    for FirstRow, LastRow in GetRowRuns(Rows):
+        # Set the font style for the rows and the first column
+        sheet.setStyle(
+            f"{TableRangeColumnStart}{FirstRow}:{TableRangeColumnEnd}{LastRow}",
+            FontStyle(
+                SPREADSHEET_TABLEFONTSTYLE_BOLD,
+                SPREADSHEET_TABLEFONTSTYLE_ITALIC,
+                SPREADSHEET_TABLEFONTSTYLE_UNDERLINE,
+            ),
+        )
+        sheet.setStyle(
+            f"{TableRangeColumnStart}{FirstRow}:{TableRangeColumnStart}{LastRow}",
+            FontStyle(
+                SPREADSHEET_COLUMNFONTSTYLE_BOLD,
+                SPREADSHEET_COLUMNFONTSTYLE_ITALIC,
+                SPREADSHEET_COLUMNFONTSTYLE_UNDERLINE,
+            ),
+        )
+
+        # Align the rows
+        sheet.setAlignment(
+            f"{TableRangeColumnStart}{FirstRow}:{TableRangeColumnStart}{LastRow}",
+            "left|vcenter",
+        )
+        sheet.setAlignment(
+            f"{TableRangeSecondColumn}{FirstRow}:{TableRangeColumnEnd}{LastRow}",
+            "center|vcenter",
+        )
+
+    # Set the column width
+    Standard_Functions.AutofitColumns_SpreadSheet(
+        sheet=sheet,
+        columns=[
+            Standard_Functions.GetLetterFromNumber(j)
+            for j in range(
+                Standard_Functions.GetNumberFromLetter(TableRangeColumnStart),
+                Standard_Functions.GetNumberFromLetter(TableRangeColumnEnd) + 1,
+            )
+        ],
+        rows=Rows,
+        factor=AUTOFIT_FACTOR,
+    )
     return sheet
+
+
+def GetRowRuns(Rows: list) -> list:
+    """Group row numbers into blocks of consecutive rows.
+
+    Args:
+        Rows (list): The row numbers, like [2, 3, 4, 7].\n
+
+    Returns:
+        list: The first and last row of each block, like [(2, 4), (7, 7)].
+    """
+    Runs = []
+    for Row in sorted(set(Rows)):
+        if len(Runs) > 0 and Runs[-1][1] == Row - 1:
+            Runs[-1][1] = Row
+        else:
+            Runs.append([Row, Row])
+    return [tuple(Run) for Run in Runs]
+
+
+def _SameColor(Color, Target) -> bool:
+    # The colors in the spreadsheet are stored as floats. Compare them with a small tolerance.
+    if Color is None or len(Color) != len(Target):
+        return False
+    for Value, TargetValue in zip(Color, Target):
+        if abs(Value - TargetValue) > 0.001:
+            return False
+    return True
+
+
+def _HasColor(sheet, Getter: str, Cells: list, Color) -> bool:
+    # Check if the cells already have the color. If the color can't be read, assume it is different.
+    try:
+        for Cell in Cells:
+            if _SameColor(getattr(sheet, Getter)(Cell), Color) is False:
+                return False
+    except Exception:
+        return False
+    return True
+
+
+def SetRowColors(
+    sheet,
+    Colors: dict,
+    ColumnStart: str,
+    ColumnEnd: str,
+    CheckExisting: bool = False,
+):
+    """Set the background and foreground colors of table rows, with as few calls as possible.
+    If CheckExisting is True, rows that already have the correct colors are skipped.
+    The other rows are grouped into blocks of consecutive rows with the same color,
+    and each block is colored with a single range.
+
+    Args:
+        sheet (object): FreeCAD sheet object\n
+        Colors (dict): The colors for each row number, as (background, foreground).\n
+        ColumnStart (str): The first column of the table, like "A".\n
+        ColumnEnd (str): The last column of the table, like "D".\n
+        CheckExisting (bool, optional): Check the current colors of the rows first.
+        Reading the colors costs more than setting them, so only use this when restyling
+        an existing table that likely has the correct colors. Defaults to False.\n
+    """
+    for Index, Setter, Getter in (
+        (0, "setBackground", "getBackground"),
+        (1, "setForeground", "getForeground"),
+    ):
+        # Get the rows that need a new color. Check the first and last cell of each row.
+        Changes = {}
+        for Row, RowColors in Colors.items():
+            Cells = [f"{ColumnStart}{Row}", f"{ColumnEnd}{Row}"]
+            if (
+                CheckExisting is False
+                or _HasColor(sheet, Getter, Cells, RowColors[Index]) is False
+            ):
+                Changes[Row] = RowColors[Index]
+
+        # Set the color once for each block of consecutive rows with the same color
+        for FirstRow, LastRow in GetRowRuns(Changes):
+            Start = FirstRow
+            for Row in range(FirstRow, LastRow + 1):
+                if Row == LastRow or Changes[Row + 1] != Changes[Row]:
+                    getattr(sheet, Setter)(
+                        f"{ColumnStart}{Start}:{ColumnEnd}{Row}", Changes[Row]
+                    )
+                    Start = Row + 1
+    return
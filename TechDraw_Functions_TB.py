@@ -95,3 +95,96 @@ def SetDefaultTemplate():
 
         # Set the template directory
         Template.SetString("TemplateFile", ChosenTemplate)
+
+
+def WriteEditableTexts(page, texts: dict) -> int:
+    """Write the editable texts to the template of the page, but only if something has changed.
+    Writing the editable texts marks the template as touched and regenerates the svg,
+    so pages without changes are skipped.
+
+    Args:
+        page (object): TechDraw page.\n
+        texts (dict): The new editable texts.\n
+
+    Returns:
+        int: The number of changed fields.
+    """
+    import FillTransaction_TB as FillTransaction
+    from Settings_TB import ENABLE_DEBUG
+
+    # Get the current editable texts and count the fields with a different value
+    CurrentTexts = page.Template.EditableTexts
+    Changed = 0
+    for key, value in texts.items():
+        if CurrentTexts.get(key) != value:
+            Changed = Changed + 1
+
+    # Write the texts only when there are changes and mark the page for recompute
+    if Changed > 0:
+        page.Template.EditableTexts = texts
+        FillTransaction.MarkDirty(page)
+
+    if ENABLE_DEBUG is True:
+        Text = translate(
+            "TitleBlock Workbench",
+            f"{page.Label}: {Changed} editable text(s) changed",
+        )
+        Standard_Functions.Print(Text, "Log")
+    return Changed
+
+
+# The cached page index per document name
+_PageIndexCache = {}
+
+
+def GetPageIndex(doc) -> dict:
+    """Returns the index of all the pages in the document as a dict with page name -> ordinal.
+    The first page has ordinal 0. The index is cached until InvalidatePageIndex is called.
+
+    Args:
+        doc (object): FreeCAD document.\n
+
+    Returns:
+        dict: page name -> ordinal
+    """
+    PageIndex = _PageIndexCache.get(doc.Name)
+    if PageIndex is None:
+        PageIndex = {}
+        for page in doc.findObjects("TechDraw::DrawPage"):
+            PageIndex[page.Name] = len(PageIndex)
+        _PageIndexCache[doc.Name] = PageIndex
+    return PageIndex
+
+
+def InvalidatePageIndex(doc=None):
+    """Clear the cached page index of the document. If doc is None, clear all the cached indexes"""
+    if doc is None:
+        _PageIndexCache.clear()
+        return
+    _PageIndexCache.pop(doc.Name, None)
+    return
+
+
+def GetSelectedPages(doc=None) -> list:
+    """Returns the pages that are selected in the tree.
+    If a template or a view is selected, its page is returned."""
+    import FreeCADGui as Gui
+
+    if doc is None:
+        doc = App.ActiveDocument
+
+    pages = []
+    for obj in Gui.Selection.getSelection(doc.Name):
+        # Get the page of the selected object
+        page = None
+        if obj.TypeId == "TechDraw::DrawPage":
+            page = obj
+        else:
+            for parent in obj.InList:
+                if parent.TypeId == "TechDraw::DrawPage":
+                    page = parent
+                    break
+        # Add each page only once
+        if page is not None and page not in pages:
+            pages.append(page)
+    return pages
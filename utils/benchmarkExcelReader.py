@@ -0,0 +1,167 @@
+#!/usr/bin/python3.8
+
+# ***************************************************************************
+# *   Copyright (c) 2023 Paul Ebbers paul.ebbers@gmail.com                  *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Lesser General Public License for more details.                   *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+"""
+This script compares the speed of the two readers for Excel files:
+openpyxl in read-only mode and the direct reader in ExternalSource_TB.
+It creates a test workbook, reads it with both readers and checks that the results are equal.
+It also checks that both readers return the same dates and times, for both date systems of Excel.
+
+USAGE:
+
+benchmarkExcelReader [number of rows]
+
+The default number of rows is 10000. openpyxl must be installed.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+# Import ExternalSource_TB from the workbench folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ExternalSource_TB as ExternalSource
+
+
+def CreateWorkbook(FileName, NoRows):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Drawings"
+    ws.append(["Number", "Title", "Revision", "Weight", "Remarks", "Date"])
+    Start = datetime.datetime(2020, 1, 1)
+    for i in range(NoRows):
+        ws.append(
+            [
+                f"DWG-{i:05d}",
+                f"Title of drawing {i}",
+                i % 7,
+                i * 0.25,
+                None if i % 3 else "Check",
+                Start + datetime.timedelta(days=i % 1000),
+            ]
+        )
+    wb.save(FileName)
+    return
+
+
+def CreateDateWorkbook(FileName, Epoch):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.epoch = Epoch
+    ws = wb.active
+    ws.title = "Drawings"
+    Values = [
+        (datetime.date(2024, 2, 29), "yyyy-mm-dd"),
+        (datetime.datetime(2024, 2, 29, 13, 45, 30), "dd/mm/yyyy hh:mm:ss"),
+        (datetime.datetime(1900, 1, 15), "d-mmm-yy"),
+        (datetime.time(8, 30), "h:mm AM/PM"),
+        (datetime.timedelta(hours=30, minutes=15), "[h]:mm"),
+        (45000, "General"),
+        (45000.5, "0.00"),
+        ("2024-02-29", "@"),
+    ]
+    for Value, Format in Values:
+        ws.append([Value, Format])
+        ws.cell(ws.max_row, 1).number_format = Format
+    wb.save(FileName)
+    return
+
+
+def ReadOpenpyxl(FileName):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(FileName, read_only=True, data_only=True)
+    Rows = [
+        tuple(None if Value is None else str(Value) for Value in Row)
+        for Row in wb["Drawings"].iter_rows(values_only=True)
+    ]
+    wb.close()
+    return Rows
+
+
+def ReadDirect(FileName):
+    return list(ExternalSource.IterXlsxRows(FileName, "Drawings"))
+
+
+def CheckDates(Directory):
+    from openpyxl.utils.datetime import WINDOWS_EPOCH, MAC_EPOCH
+
+    for Epoch in (WINDOWS_EPOCH, MAC_EPOCH):
+        FileName = os.path.join(Directory, f"Dates{Epoch.year}.xlsx")
+        CreateDateWorkbook(FileName, Epoch)
+        if Strip(ReadOpenpyxl(FileName)) != Strip(ReadDirect(FileName)):
+            print(
+                f"The dates of the readers are different for the {Epoch.year} date system!"
+            )
+            for Row in zip(ReadOpenpyxl(FileName), ReadDirect(FileName)):
+                print(Row)
+            sys.exit(1)
+    print("Dates: equal for both date systems")
+    return
+
+
+def Strip(Rows):
+    # openpyxl pads the rows to the width of the sheet. Remove the empty cells at the end.
+    Result = []
+    for Row in Rows:
+        Row = list(Row)
+        while len(Row) > 0 and Row[-1] is None:
+            Row.pop()
+        Result.append(tuple(Row))
+    return Result
+
+
+def Main():
+    NoRows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    with tempfile.TemporaryDirectory() as Directory:
+        FileName = os.path.join(Directory, "Benchmark.xlsx")
+        CreateWorkbook(FileName, NoRows)
+
+        Results = {}
+        for Name, Reader in (("openpyxl", ReadOpenpyxl), ("direct", ReadDirect)):
+            Start = time.perf_counter()
+            Results[Name] = Reader(FileName)
+            Results[Name + " time"] = time.perf_counter() - Start
+            print(f"{Name:10s}{Results[Name + ' time']:8.3f} s")
+
+        CheckDates(Directory)
+
+    if Strip(Results["openpyxl"]) != Strip(Results["direct"]):
+        print("The results of the readers are different!")
+        sys.exit(1)
+    print(
+        f"Speed-up: {Results['openpyxl time'] / Results['direct time']:.1f}x for {NoRows} rows"
+    )
+    return
+
+
+if __name__ == "__main__":
+    Main()